@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Incremental parsing of CornerPro alerts that are later edited with the goal outcome.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from analysis.scenario_classifier import (
+    AlertData,
+    ScenarioResult,
+    extract_goal_outcome,
+    parse_and_classify,
+)
+
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedAlert:
+    alert: AlertData
+    scenario_result: ScenarioResult
+    goal_outcome: Optional[bool]
+    outcome_changed: bool
+    from_cache: bool
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    prefix_length: int
+    prefix_hash: int
+    alert: AlertData
+    scenario_result: ScenarioResult
+    prefix_outcome: Optional[bool]
+    goal_outcome: Optional[bool]
+
+
+class IncrementalAlertParser:
+    """LRU of parsed alerts keyed by (chat_id, message_id).
+
+    The cached prefix is the alert body up to the end of the match URL line.
+    When an edit keeps that prefix byte-for-byte (same length and hash), the
+    cached ``AlertData``/``ScenarioResult`` are reused and only the appended
+    suffix is scanned for the goal outcome. Any other edit is parsed from
+    scratch.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, chat_id: int, message_id: int, message_text: str) -> Optional[ParsedAlert]:
+        key = (chat_id, message_id)
+        entry = self._entries.get(key)
+
+        if entry is not None and self._prefix_matches(entry, message_text):
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._update_outcome(entry, message_text, from_cache=True)
+
+        self.misses += 1
+        parsed = parse_and_classify(message_text)
+        if not parsed:
+            self._entries.pop(key, None)
+            return None
+
+        alert, scenario_result = parsed
+        prefix_length = _alert_body_length(message_text, alert)
+        prefix = message_text[:prefix_length]
+        previous_outcome = entry.goal_outcome if entry is not None else None
+        entry = _CacheEntry(
+            prefix_length=prefix_length,
+            prefix_hash=hash(prefix),
+            alert=alert,
+            scenario_result=scenario_result,
+            prefix_outcome=extract_goal_outcome(prefix),
+            goal_outcome=previous_outcome,
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return self._update_outcome(entry, message_text, from_cache=False)
+
+    def forget(self, chat_id: int, message_id: int) -> None:
+        self._entries.pop((chat_id, message_id), None)
+
+    @staticmethod
+    def _prefix_matches(entry: _CacheEntry, message_text: str) -> bool:
+        return (
+            len(message_text) >= entry.prefix_length
+            and hash(message_text[:entry.prefix_length]) == entry.prefix_hash
+        )
+
+    @staticmethod
+    def _update_outcome(entry: _CacheEntry, message_text: str, from_cache: bool) -> ParsedAlert:
+        # The last goal line wins, so the suffix outcome overrides the body's.
+        suffix_outcome = extract_goal_outcome(message_text[entry.prefix_length:])
+        goal_outcome = entry.prefix_outcome if suffix_outcome is None else suffix_outcome
+        outcome_changed = goal_outcome != entry.goal_outcome
+        entry.goal_outcome = goal_outcome
+
+        return ParsedAlert(
+            alert=entry.alert,
+            scenario_result=entry.scenario_result,
+            goal_outcome=goal_outcome,
+            outcome_changed=outcome_changed,
+            from_cache=from_cache,
+        )
+
+
+def _alert_body_length(message_text: str, alert: AlertData) -> int:
+    url_index = message_text.find(alert.match_url)
+    line_end = message_text.find("\n", url_index + len(alert.match_url))
+    return len(message_text) if line_end == -1 else line_end
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Sweep the favourite/even-match odds cutoff over historical alerts.
+
+For every candidate threshold, reports per-scenario green/red counts as if
+``classify_alert`` had used that cutoff instead of ``odd_difference > 0.2``.
+All thresholds are evaluated in one vectorized pass.
+"""
+
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import re
+import sys
+from typing import Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import SCENARIO_NAMES, classify_batch
+
+
+INPUT_XLSX = "mapa_de_calor_por_cenario2.xlsx"
+OUTPUT_XLSX = "varredura_limiar_odds.xlsx"
+THRESHOLD_START = 0.0
+THRESHOLD_STOP = 1.5
+THRESHOLD_STEP = 0.05
+# "absolute": |odd casa - odd fora| > limiar (regra atual)
+# "relative": |odd casa - odd fora| / menor odd > limiar
+RULE = "absolute"
+HEADER_ROW = 2
+DATA_START_ROW = 3
+SCORE_HEADER = "Placar"
+ODDS_HEADER = "Odds 1x2 Pre-live"
+OUTCOME_HEADER = "Saiu gol"
+RULES = ("absolute", "relative")
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AlertColumns:
+    home_odds: np.ndarray
+    away_odds: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    goal_scored: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.goal_scored)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    thresholds: np.ndarray
+    rule: str
+    greens: np.ndarray
+    reds: np.ndarray
+
+    def rows(self):
+        """Yield (threshold, scenario, greens, reds) for every threshold/scenario pair."""
+        for threshold_index, threshold in enumerate(self.thresholds.tolist()):
+            for scenario_id, scenario in enumerate(SCENARIO_NAMES):
+                yield (
+                    threshold,
+                    scenario,
+                    int(self.greens[threshold_index, scenario_id]),
+                    int(self.reds[threshold_index, scenario_id]),
+                )
+
+
+def build_thresholds(
+    start: float = THRESHOLD_START,
+    stop: float = THRESHOLD_STOP,
+    step: float = THRESHOLD_STEP,
+) -> np.ndarray:
+    # Rounded so that e.g. 0.2 is exactly the literal used by classify_alert.
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def sweep_thresholds(
+    columns: AlertColumns,
+    thresholds: Sequence[float],
+    rule: str = RULE,
+) -> SweepResult:
+    if rule not in RULES:
+        raise ValueError(f"Regra desconhecida '{rule}'. Use uma de: {', '.join(RULES)}")
+
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    home_odds = columns.home_odds[:, np.newaxis]
+    away_odds = columns.away_odds[:, np.newaxis]
+
+    odd_difference = np.abs(home_odds - away_odds)
+    if rule == "relative":
+        odd_difference = odd_difference / np.minimum(home_odds, away_odds)
+
+    classification = classify_batch(
+        home_odds,
+        away_odds,
+        columns.home_goals[:, np.newaxis],
+        columns.away_goals[:, np.newaxis],
+        favorite=odd_difference > thresholds[np.newaxis, :],
+    )
+
+    scenario_count = len(SCENARIO_NAMES)
+    bins = np.arange(len(thresholds)) * scenario_count + classification.scenario_ids
+    greens_weights = np.broadcast_to(columns.goal_scored[:, np.newaxis], bins.shape)
+    size = len(thresholds) * scenario_count
+    totals = np.bincount(bins.ravel(), minlength=size)
+    greens = np.bincount(bins.ravel(), weights=greens_weights.ravel(), minlength=size).astype(np.int64)
+
+    return SweepResult(
+        thresholds=thresholds,
+        rule=rule,
+        greens=greens.reshape(len(thresholds), scenario_count),
+        reds=(totals - greens).reshape(len(thresholds), scenario_count),
+    )
+
+
+def load_alert_columns_from_xlsx(input_xlsx: str = INPUT_XLSX) -> AlertColumns:
+    """Read every alert row of a scenario XLSX produced by export_scenario_xlsx."""
+    workbook_path = Path(input_xlsx)
+    if not workbook_path.exists():
+        raise FileNotFoundError(f"Arquivo nao encontrado: {input_xlsx}")
+
+    workbook = load_workbook(workbook_path, read_only=True, data_only=True)
+    records = []
+    skipped_rows = 0
+
+    for sheet in workbook.worksheets:
+        header_indexes = _get_header_indexes(sheet)
+        if not all(header in header_indexes for header in (SCORE_HEADER, ODDS_HEADER, OUTCOME_HEADER)):
+            logger.warning("Aba ignorada por cabecalho incompleto: %s", sheet.title)
+            continue
+
+        score_index = header_indexes[SCORE_HEADER] - 1
+        odds_index = header_indexes[ODDS_HEADER] - 1
+        outcome_index = header_indexes[OUTCOME_HEADER] - 1
+
+        for row in sheet.iter_rows(min_row=DATA_START_ROW, values_only=True):
+            if _normalize_text(row[0]).upper() == "TOTAL":
+                break
+
+            record = _parse_xlsx_row(row, score_index, odds_index, outcome_index)
+            if record is None:
+                skipped_rows += 1
+                continue
+            records.append(record)
+
+    logger.info("Alertas carregados do XLSX: %s", len(records))
+    logger.info("Linhas ignoradas sem placar, odds ou resultado validos: %s", skipped_rows)
+    return _records_to_columns(records)
+
+
+def alert_columns_from_export_rows(rows: Union[Dict[int, list], Iterable]) -> AlertColumns:
+    """Build columns from ``collect_rows`` output (a dict by scenario id or a flat list)."""
+    if isinstance(rows, dict):
+        rows = [row for scenario_rows in rows.values() for row in scenario_rows]
+
+    return _records_to_columns([
+        (
+            row.alert.home_odd,
+            row.alert.away_odd,
+            row.alert.home_goals,
+            row.alert.away_goals,
+            row.goal_scored,
+        )
+        for row in rows
+    ])
+
+
+def build_workbook(result: SweepResult) -> Workbook:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Varredura de limiar"
+
+    headers = ["Limiar", "Regra", "Cenario", "Greens", "Reds", "Total", "Taxa de acerto"]
+    sheet.append(headers)
+    for cell in sheet[1]:
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill("solid", fgColor="D9EAF7")
+        cell.alignment = Alignment(horizontal="center")
+
+    for threshold, scenario, greens, reds in result.rows():
+        total = greens + reds
+        sheet.append([
+            threshold,
+            result.rule,
+            scenario,
+            greens,
+            reds,
+            total,
+            greens / total if total else 0,
+        ])
+        sheet.cell(sheet.max_row, 7).number_format = "0.00%"
+
+    sheet.freeze_panes = "A2"
+    sheet.auto_filter.ref = sheet.dimensions
+    _fit_columns(sheet)
+    return workbook
+
+
+def run_sweep(
+    input_xlsx: str = INPUT_XLSX,
+    output_xlsx: str = OUTPUT_XLSX,
+    rule: str = RULE,
+) -> SweepResult:
+    columns = load_alert_columns_from_xlsx(input_xlsx)
+    thresholds = build_thresholds()
+    result = sweep_thresholds(columns, thresholds, rule)
+    build_workbook(result).save(output_xlsx)
+    logger.info(
+        "Varredura de %s limiar(es) sobre %s alerta(s) gerada: %s",
+        len(thresholds),
+        len(columns),
+        output_xlsx,
+    )
+    return result
+
+
+def _parse_xlsx_row(row, score_index: int, odds_index: int, outcome_index: int):
+    score = _normalize_text(row[score_index] if score_index < len(row) else None)
+    odds = _normalize_text(row[odds_index] if odds_index < len(row) else None)
+    outcome = _normalize_text(row[outcome_index] if outcome_index < len(row) else None).lower()
+
+    score_match = re.fullmatch(r"(\d+)\s*x\s*(\d+)", score)
+    odds_parts = [part.strip().replace(",", ".") for part in odds.split("/")]
+    if not score_match or len(odds_parts) != 3 or outcome not in {"sim", "nao"}:
+        return None
+
+    try:
+        home_odd, _draw_odd, away_odd = (float(part) for part in odds_parts)
+    except ValueError:
+        return None
+
+    return (
+        home_odd,
+        away_odd,
+        int(score_match.group(1)),
+        int(score_match.group(2)),
+        outcome == "sim",
+    )
+
+
+def _records_to_columns(records: List[tuple]) -> AlertColumns:
+    if not records:
+        return AlertColumns(
+            home_odds=np.empty(0, dtype=np.float64),
+            away_odds=np.empty(0, dtype=np.float64),
+            home_goals=np.empty(0, dtype=np.int64),
+            away_goals=np.empty(0, dtype=np.int64),
+            goal_scored=np.empty(0, dtype=bool),
+        )
+
+    home_odds, away_odds, home_goals, away_goals, goal_scored = zip(*records)
+    return AlertColumns(
+        home_odds=np.asarray(home_odds, dtype=np.float64),
+        away_odds=np.asarray(away_odds, dtype=np.float64),
+        home_goals=np.asarray(home_goals, dtype=np.int64),
+        away_goals=np.asarray(away_goals, dtype=np.int64),
+        goal_scored=np.asarray(goal_scored, dtype=bool),
+    )
+
+
+def _get_header_indexes(sheet) -> Dict[str, int]:
+    return {
+        str(cell.value).strip(): cell.column
+        for cell in sheet[HEADER_ROW]
+        if cell.value is not None
+    }
+
+
+def _normalize_text(value) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _fit_columns(sheet) -> None:
+    for column_cells in sheet.columns:
+        column_letter = get_column_letter(column_cells[0].column)
+        max_length = 0
+        for cell in column_cells:
+            value = "" if cell.value is None else str(cell.value)
+            max_length = max(max_length, len(value))
+        sheet.column_dimensions[column_letter].width = min(max(max_length + 2, 10), 60)
+
+
+def main() -> None:
+    run_sweep()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@
 Parsing and classification helpers for scenario-based Telegram alerts.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 import re
-from typing import Optional, Tuple
+import sys
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple, Union
 
 
 SCENARIO_NAMES = [
@@ -43,8 +45,12 @@ GENERAL_SCENARIOS = [
     "parelho empatando",
 ]
 
+# Integer ids are the positions in SCENARIO_NAMES / GENERAL_SCENARIOS.
+SCENARIO_IDS = {scenario: scenario_id for scenario_id, scenario in enumerate(SCENARIO_NAMES)}
+GENERAL_SCENARIO_IDS = {scenario: scenario_id for scenario_id, scenario in enumerate(GENERAL_SCENARIOS)}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AlertData:
     strategy: str
     home_team: str
@@ -62,9 +68,28 @@ class AlertData:
     away_odd: float
     match_url: str
 
+    def as_tuple(self) -> tuple:
+        """Compact row form, in ``ALERT_FIELDS`` order."""
+        return tuple(getattr(self, name) for name in ALERT_FIELDS)
+
+    @classmethod
+    def from_tuple(cls, row: Sequence) -> "AlertData":
+        return cls(*row)
+
+
+class BatchClassification(NamedTuple):
+    scenario_ids: "numpy.ndarray"
+    general_scenario_ids: "numpy.ndarray"
+    goal_differences: "numpy.ndarray"
 
-@dataclass(frozen=True)
+
+ALERT_FIELDS = tuple(field.name for field in fields(AlertData))
+
+
+@dataclass(frozen=True, slots=True)
 class ScenarioResult:
+    scenario_id: int
+    general_scenario_id: int
     scenario: str
     general_scenario: str
     favorite_side: Optional[str]
@@ -72,8 +97,148 @@ class ScenarioResult:
     goal_difference: int
 
 
+_STRATEGY_PATTERN = re.compile(
+    r"📣\s*Alerta\s+Estratégia:\s*(?P<strategy>.*?)\s*📣\s*$",
+    flags=re.IGNORECASE,
+)
+_GAME_PATTERN = re.compile(
+    r"🏟\s*Jogo:\s*(?P<home>.+?)\s*\((?P<home_pos>\d+)º\)\s*x\s*"
+    r"\((?P<away_pos>\d+)º\)\s*(?P<away>.+?)\s*$",
+    flags=re.IGNORECASE,
+)
+_LEAGUE_PATTERN = re.compile(
+    r"🏆\s*Competição:\s*(?P<league>.+?)\s*$",
+    flags=re.IGNORECASE,
+)
+_TIME_PATTERN = re.compile(
+    r"🕛\s*Tempo:\s*(?P<time>.+?)\s*'\s*$",
+    flags=re.IGNORECASE,
+)
+_RESULT_PATTERN = re.compile(
+    r"⚽\s*Resultado:\s*(?P<home_goals>\d+)\s*x\s*(?P<away_goals>\d+)\s*"
+    r"\((?P<ht_home>\d+)\s*x\s*(?P<ht_away>\d+)\s*Intervalo\)\s*$",
+    flags=re.IGNORECASE,
+)
+_ODDS_PATTERN = re.compile(
+    r"📈\s*Odds\s+1x2\s+Pre-live:\s*(?P<home_odd>[\d.,]+)\s*/\s*"
+    r"(?P<draw_odd>[\d.,]+)\s*/\s*(?P<away_odd>[\d.,]+)\s*$",
+    flags=re.IGNORECASE,
+)
+_URL_PATTERN = re.compile(r"https?://\S+")
+_RESULT_LABEL_PATTERN = re.compile(r"\bresultado\s*:", flags=re.IGNORECASE)
+_ALERT_PREFIX_PATTERN = re.compile(r"\s*📣\s*Alerta\s+Estratégia:", flags=re.IGNORECASE)
+
+# Leading emoji of each alert line -> (slot in the parser's match list, pattern).
+_FIELD_PATTERNS = {
+    "📣": (0, _STRATEGY_PATTERN),
+    "🏟": (1, _GAME_PATTERN),
+    "🏆": (2, _LEAGUE_PATTERN),
+    "🕛": (3, _TIME_PATTERN),
+    "⚽": (4, _RESULT_PATTERN),
+    "📈": (5, _ODDS_PATTERN),
+}
+_URL_SLOT = 6
+_FIELD_COUNT = 7
+
+
+def is_cornerpro_alert(message_text: Optional[str]) -> bool:
+    """Cheap prefilter: does the first non-blank line open a CornerPro strategy alert?
+
+    Only the leading whitespace and the alert header are inspected, so chatter,
+    result edits and other bots' messages are rejected before any parsing.
+    """
+    if not message_text:
+        return False
+    return _ALERT_PREFIX_PATTERN.match(message_text) is not None
+
+
 def parse_alert_message(message_text: str) -> Optional[AlertData]:
-    """Extract all structured fields from a CornerPro strategy alert."""
+    """Extract all structured fields from a CornerPro strategy alert.
+
+    Walks the message once, line by line, and only runs the pattern of the
+    field announced by each line's leading emoji. Like the reference parser,
+    the first line matching each field wins and the URL is the first one
+    found anywhere in the text. Strategy, team, league and time strings are
+    interned, so alerts kept in memory share them.
+
+    The reference patterns let whitespace run across line breaks, so a field
+    split over two lines (odds wrapped after the first price, a header
+    broken after the emoji) still matches there. When a field's line does
+    not match on its own, or only matches with a blank value, before the
+    field was found, the message is handed to
+    ``parse_alert_message_reference`` so both parsers agree.
+    """
+    if not message_text:
+        return None
+
+    matches = [None] * _FIELD_COUNT
+    missing = _FIELD_COUNT
+    # Fields whose line did not match on its own; the value may continue on the next line.
+    split_fields = set()
+
+    for line in message_text.split("\n"):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+
+        field = _FIELD_PATTERNS.get(stripped[0])
+        if field is not None and matches[field[0]] is None:
+            match = field[1].match(stripped)
+            # A value can only continue on the next line if this one ends in whitespace.
+            if match and (not stripped[-1].isspace() or all(group.strip() for group in match.groups())):
+                matches[field[0]] = match
+                missing -= 1
+            else:
+                split_fields.add(field[0])
+
+        if matches[_URL_SLOT] is None and "http" in stripped:
+            match = _URL_PATTERN.search(stripped)
+            if match:
+                matches[_URL_SLOT] = match
+                missing -= 1
+
+        if not missing:
+            break
+
+    if split_fields:
+        # The reference can only succeed if every other field and the URL were found.
+        if matches[_URL_SLOT] is None or any(
+            matches[slot] is None and slot not in split_fields for slot in range(_URL_SLOT)
+        ):
+            return None
+        return parse_alert_message_reference(message_text)
+    if missing:
+        return None
+
+    strategy_match, game_match, league_match, time_match, result_match, odds_match, url_match = matches
+    home_team, home_position, away_position, away_team = game_match.groups()
+    home_goals, away_goals, halftime_home_goals, halftime_away_goals = result_match.groups()
+    home_odd, draw_odd, away_odd = odds_match.groups()
+
+    try:
+        return AlertData(
+            strategy=sys.intern(strategy_match.group(1).strip()),
+            home_team=sys.intern(home_team.strip()),
+            home_position=int(home_position),
+            away_team=sys.intern(away_team.strip()),
+            away_position=int(away_position),
+            league=sys.intern(league_match.group(1).strip()),
+            game_time=sys.intern(time_match.group(1).strip()),
+            home_goals=int(home_goals),
+            away_goals=int(away_goals),
+            halftime_home_goals=int(halftime_home_goals),
+            halftime_away_goals=int(halftime_away_goals),
+            home_odd=_parse_odd(home_odd),
+            draw_odd=_parse_odd(draw_odd),
+            away_odd=_parse_odd(away_odd),
+            match_url=url_match.group(0).strip(),
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_alert_message_reference(message_text: str) -> Optional[AlertData]:
+    """Multi-scan regex parser kept as the reference for ``parse_alert_message``."""
     if not message_text:
         return None
 
@@ -145,54 +310,89 @@ def parse_alert_message(message_text: str) -> Optional[AlertData]:
         return None
 
 
+def extract_goal_outcome(message_text: str) -> Optional[bool]:
+    """Green/red outcome from the last ``⚽`` line that is not the score line."""
+    goal_lines = []
+    for raw_line in message_text.splitlines():
+        line = raw_line.strip()
+        if not line or "⚽" not in line:
+            continue
+        if _RESULT_LABEL_PATTERN.search(line):
+            continue
+        goal_lines.append(line)
+
+    if not goal_lines:
+        return None
+
+    last_goal_line = goal_lines[-1]
+    if "❌" in last_goal_line:
+        return False
+    return True
+
+
 def classify_alert(alert: AlertData) -> ScenarioResult:
-    """Classify an alert into one detailed scenario and one general scenario."""
-    odd_difference = abs(alert.home_odd - alert.away_odd)
+    """Classify an alert into one detailed scenario and one general scenario.
+
+    Returns one of the precomputed ``ScenarioResult`` singletons, so no
+    strings or result objects are allocated per alert.
+    """
     score_difference = alert.home_goals - alert.away_goals
-    goal_difference = abs(score_difference)
-
-    if odd_difference > 0.2:
-        favorite_side = "casa" if alert.home_odd < alert.away_odd else "fora"
-
-        if score_difference == 0:
-            goals_label = "com gols" if alert.home_goals > 0 else "sem gols"
-            return ScenarioResult(
-                scenario=f"{favorite_side} favorito empatando {goals_label}",
-                general_scenario="favorito empatando",
-                favorite_side=favorite_side,
-                is_even_match=False,
-                goal_difference=0,
-            )
-
-        favorite_score_difference = score_difference if favorite_side == "casa" else -score_difference
-        status = "ganhando" if favorite_score_difference > 0 else "perdendo"
-        scenario = f"{favorite_side} favorito {status} {_goal_difference_label(abs(favorite_score_difference))}"
-
-        return ScenarioResult(
-            scenario=scenario,
-            general_scenario=f"favorito {status}",
-            favorite_side=favorite_side,
-            is_even_match=False,
-            goal_difference=goal_difference,
-        )
 
-    if score_difference == 0:
-        goals_label = "com gols" if alert.home_goals > 0 else "sem gols"
-        return ScenarioResult(
-            scenario=f"parelho empatando {goals_label}",
-            general_scenario="parelho empatando",
-            favorite_side=None,
-            is_even_match=True,
-            goal_difference=0,
-        )
+    if abs(alert.home_odd - alert.away_odd) > 0.2:
+        if alert.home_odd < alert.away_odd:
+            group = _HOME_FAVORITE
+            relative_difference = score_difference
+        else:
+            group = _AWAY_FAVORITE
+            relative_difference = -score_difference
+    else:
+        group = _EVEN_MATCH
+        relative_difference = score_difference
+
+    if relative_difference == 0:
+        slot = _SLOT_TIED_WITH_GOALS if alert.home_goals > 0 else _SLOT_TIED_WITHOUT_GOALS
+        return _SCENARIO_RESULTS[group * _SLOTS_PER_GROUP + slot]
+
+    goal_difference = abs(relative_difference)
+    slot = _SLOT_LOSING if relative_difference < 0 else _SLOT_WINNING
+    result = _SCENARIO_RESULTS[group * _SLOTS_PER_GROUP + slot + min(goal_difference, 3) - 1]
+    if goal_difference > 3:
+        return _result_with_goal_difference(result, goal_difference)
+    return result
+
+
+def classify_batch(home_odds, away_odds, home_goals, away_goals, favorite=None) -> BatchClassification:
+    """Vectorized ``classify_alert`` over NumPy arrays of odds and goals.
+
+    Element ``i`` of each returned array equals the ``scenario_id``,
+    ``general_scenario_id`` and ``goal_difference`` that ``classify_alert``
+    gives for the alert in row ``i``. ``favorite`` optionally replaces the
+    ``odd_difference > 0.2`` mask (it broadcasts against the other arrays),
+    which is how alternative cutoffs are evaluated.
+    """
+    import numpy as np
+
+    home_odds = np.asarray(home_odds, dtype=np.float64)
+    away_odds = np.asarray(away_odds, dtype=np.float64)
+    if favorite is None:
+        favorite = np.abs(home_odds - away_odds) > 0.2
+    return _classify_arrays(
+        favorite,
+        home_odds < away_odds,
+        np.asarray(home_goals, dtype=np.int64),
+        np.asarray(away_goals, dtype=np.int64),
+    )
 
-    losing_side = "casa" if score_difference < 0 else "fora"
-    return ScenarioResult(
-        scenario=f"{losing_side} parelho perdendo {_goal_difference_label(goal_difference)}",
-        general_scenario="parelho perdendo",
-        favorite_side=None,
-        is_even_match=True,
-        goal_difference=goal_difference,
+
+def alerts_to_arrays(alerts: Sequence[AlertData]):
+    """Columns (home_odds, away_odds, home_goals, away_goals) for ``classify_batch``."""
+    import numpy as np
+
+    return (
+        np.fromiter((alert.home_odd for alert in alerts), dtype=np.float64, count=len(alerts)),
+        np.fromiter((alert.away_odd for alert in alerts), dtype=np.float64, count=len(alerts)),
+        np.fromiter((alert.home_goals for alert in alerts), dtype=np.int64, count=len(alerts)),
+        np.fromiter((alert.away_goals for alert in alerts), dtype=np.int64, count=len(alerts)),
     )
 
 
@@ -203,24 +403,82 @@ def parse_and_classify(message_text: str) -> Optional[Tuple[AlertData, ScenarioR
     return alert, classify_alert(alert)
 
 
-def should_forward_strategy(alert_strategy: str, strategy_config: dict) -> bool:
-    """Apply whitelist/blacklist strategy filters to the extracted strategy."""
-    if not strategy_config or not strategy_config.get("enabled", False):
-        return True
+class StrategyMatcher:
+    """Finds any configured strategy inside a text with one precompiled pattern.
+
+    The configured names are lowercased once and joined into a single
+    alternation (longest first), so a lookup is one regex scan of the text
+    instead of one substring test per configured strategy. Texts passed to
+    ``find`` must already be lowercased. With ``strip`` the names are also
+    stripped and empty entries ignored, as the scenario filters always did.
+    """
+
+    def __init__(self, strategies: Iterable[str], strip: bool = True):
+        self._strategies_by_pattern = {}
+        self._always_matches = None
+
+        for configured in strategies or []:
+            if strip and not configured:
+                continue
+            pattern = configured.lower().strip() if strip else configured.lower()
+            if not pattern:
+                # An empty name is a substring of every text.
+                if self._always_matches is None:
+                    self._always_matches = configured
+                continue
+            self._strategies_by_pattern.setdefault(pattern, configured)
+
+        patterns = sorted(self._strategies_by_pattern, key=len, reverse=True)
+        self._regex = re.compile("|".join(map(re.escape, patterns))) if patterns else None
+
+    def find(self, text: str) -> Optional[str]:
+        """Return the configured strategy found in ``text``, or ``None``."""
+        if self._always_matches is not None:
+            return self._always_matches
+        if self._regex is None:
+            return None
+        match = self._regex.search(text)
+        if not match:
+            return None
+        return self._strategies_by_pattern[match.group(0)]
+
+
+@dataclass(frozen=True, slots=True)
+class StrategyFilter:
+    enabled: bool
+    mode: str
+    matcher: StrategyMatcher
+
+    def allows(self, alert_strategy: str) -> bool:
+        if not self.enabled:
+            return True
+
+        strategy_found = self.matcher.find(alert_strategy.lower().strip()) is not None
+        if self.mode == "blacklist":
+            return not strategy_found
+        return strategy_found
+
+
+def compile_strategy_filter(strategy_config: Optional[dict]) -> StrategyFilter:
+    """Compile a ``strategy_filters`` config block; identical blocks share one compiled filter."""
+    strategy_config = strategy_config or {}
+    return _compile_strategy_filter(
+        bool(strategy_config.get("enabled", False)),
+        strategy_config.get("mode", "whitelist"),
+        tuple(strategy_config.get("strategies") or ()),
+    )
 
-    strategies = strategy_config.get("strategies", [])
-    mode = strategy_config.get("mode", "whitelist")
-    normalized_strategy = alert_strategy.lower().strip()
 
-    strategy_found = any(
-        configured.lower().strip() in normalized_strategy
-        for configured in strategies
-        if configured
-    )
+@lru_cache(maxsize=256)
+def _compile_strategy_filter(enabled: bool, mode: str, strategies: Tuple[str, ...]) -> StrategyFilter:
+    return StrategyFilter(enabled=enabled, mode=mode, matcher=StrategyMatcher(strategies))
 
-    if mode == "blacklist":
-        return not strategy_found
-    return strategy_found
+
+def should_forward_strategy(alert_strategy: str, strategy_config: Union[dict, StrategyFilter]) -> bool:
+    """Apply whitelist/blacklist strategy filters to the extracted strategy."""
+    if not isinstance(strategy_config, StrategyFilter):
+        strategy_config = compile_strategy_filter(strategy_config)
+    return strategy_config.allows(alert_strategy)
 
 
 def _parse_odd(raw_odd: str) -> float:
@@ -233,3 +491,95 @@ def _goal_difference_label(goal_difference: int) -> str:
     if goal_difference == 2:
         return "com dois gols de diferença"
     return "com mais de dois gols de diferença"
+
+
+# Scenario keys: group * _SLOTS_PER_GROUP + slot. Groups are the odds picture
+# (home favorite, away favorite, even match); slots are the score picture seen
+# from the favorite (or from the home side in even matches).
+_HOME_FAVORITE = 0
+_AWAY_FAVORITE = 1
+_EVEN_MATCH = 2
+_SLOT_TIED_WITH_GOALS = 0
+_SLOT_TIED_WITHOUT_GOALS = 1
+_SLOT_LOSING = 2
+_SLOT_WINNING = 5
+_SLOTS_PER_GROUP = 8
+
+
+def _build_scenario_result(key: int) -> ScenarioResult:
+    group, slot = divmod(key, _SLOTS_PER_GROUP)
+    if slot < _SLOT_LOSING:
+        goal_difference = 0
+        status = "empatando"
+        detail = "com gols" if slot == _SLOT_TIED_WITH_GOALS else "sem gols"
+    else:
+        goal_difference = (slot - _SLOT_LOSING) % 3 + 1
+        status = "perdendo" if slot < _SLOT_WINNING else "ganhando"
+        detail = _goal_difference_label(goal_difference)
+
+    if group == _EVEN_MATCH:
+        favorite_side = None
+        general_scenario = f"parelho {'empatando' if goal_difference == 0 else 'perdendo'}"
+        if goal_difference == 0:
+            scenario = f"parelho empatando {detail}"
+        else:
+            losing_side = "casa" if status == "perdendo" else "fora"
+            scenario = f"{losing_side} parelho perdendo {detail}"
+    else:
+        favorite_side = "casa" if group == _HOME_FAVORITE else "fora"
+        general_scenario = f"favorito {status}"
+        scenario = f"{favorite_side} favorito {status} {detail}"
+
+    scenario_id = SCENARIO_IDS[scenario]
+    general_scenario_id = GENERAL_SCENARIO_IDS[general_scenario]
+    return ScenarioResult(
+        scenario_id=scenario_id,
+        general_scenario_id=general_scenario_id,
+        scenario=SCENARIO_NAMES[scenario_id],
+        general_scenario=GENERAL_SCENARIOS[general_scenario_id],
+        favorite_side=favorite_side,
+        is_even_match=group == _EVEN_MATCH,
+        goal_difference=goal_difference,
+    )
+
+
+_SCENARIO_RESULTS = tuple(_build_scenario_result(key) for key in range(3 * _SLOTS_PER_GROUP))
+_SCENARIO_ID_BY_KEY = tuple(result.scenario_id for result in _SCENARIO_RESULTS)
+_GENERAL_SCENARIO_ID_BY_KEY = tuple(result.general_scenario_id for result in _SCENARIO_RESULTS)
+SCENARIO_RESULTS = tuple(sorted(_SCENARIO_RESULTS, key=lambda result: result.scenario_id))
+_WIDE_MARGIN_RESULTS = {}
+
+
+def _classify_arrays(favorite, home_favorite, home_goals, away_goals) -> BatchClassification:
+    """Array form of the key computation in ``classify_alert``.
+
+    ``favorite`` marks rows whose odds name a favorite; ``home_favorite``
+    marks rows where that favorite is the home side.
+    """
+    import numpy as np
+
+    score_difference = home_goals - away_goals
+    group = np.where(favorite, np.where(home_favorite, _HOME_FAVORITE, _AWAY_FAVORITE), _EVEN_MATCH)
+    relative_difference = np.where(favorite & ~home_favorite, -score_difference, score_difference)
+    margin = np.minimum(np.abs(relative_difference), 3)
+    slot = np.where(
+        relative_difference == 0,
+        np.where(home_goals > 0, _SLOT_TIED_WITH_GOALS, _SLOT_TIED_WITHOUT_GOALS),
+        np.where(relative_difference < 0, _SLOT_LOSING, _SLOT_WINNING) + margin - 1,
+    )
+    keys = group * _SLOTS_PER_GROUP + slot
+
+    return BatchClassification(
+        scenario_ids=np.asarray(_SCENARIO_ID_BY_KEY, dtype=np.int8)[keys],
+        general_scenario_ids=np.asarray(_GENERAL_SCENARIO_ID_BY_KEY, dtype=np.int8)[keys],
+        goal_differences=np.abs(score_difference),
+    )
+
+
+def _result_with_goal_difference(result: ScenarioResult, goal_difference: int) -> ScenarioResult:
+    """Interned copy of a "mais de dois gols" result carrying the real margin."""
+    cache_key = (result.scenario_id, goal_difference)
+    cached = _WIDE_MARGIN_RESULTS.get(cache_key)
+    if cached is None:
+        cached = _WIDE_MARGIN_RESULTS[cache_key] = replace(result, goal_difference=goal_difference)
+    return cached
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Alert corpora used by the parser benchmarks.
+"""
+
+import random
+from typing import List
+
+
+REAL_ALERTS = [
+    """
+📣 Alerta Estratégia: mapa-de-calor 📣
+🏟 Jogo: La Luz (6º) x (13º) Paysandu FC
+🏆 Competição: Uruguay Segunda Division
+🕛 Tempo: 70 '
+⚽ Resultado: 1 x 2 (0 x 0 Intervalo)
+📈 Odds 1x2 Pre-live: 1.8 / 3.2 / 4
+
+https://cornerprobet.com/analysis/rpam7
+
+⚽: ❌
+
+https://cornerprobet.com
+""",
+    """
+📣 Alerta Estratégia: mapa-de-calor 📣
+🏟 Jogo: Olympique Akbou (6º) x (9º) ES Ben Aknoun
+🏆 Competição: Algeria Ligue 1
+🕛 Tempo: 71 '
+⚽ Resultado: 1 x 0 (0 x 0 Intervalo)
+📈 Odds 1x2 Pre-live: 2.62 / 2.9 / 2.5
+
+https://cornerprobet.com/analysis/rn85s
+
+⚽ 77' (ES Ben Aknoun)
+
+https://cornerprobet.com
+""",
+    (
+        "📣 Alerta Estratégia: mapa-de-calor 📣\n"
+        "🏟 Jogo: Lauterach (17º) x (2º) Kuchl\n"
+        "🏆 Competição: Austria Regionalliga: West\n"
+        "🕛 Tempo: 70 '\n"
+        "⚽ Resultado: 0 x 2 (0 x 0 Intervalo)\n"
+        "📈 Odds 1x2 Pre-live: 6.5 / 6.5 / 1.22\n\n\n"
+        "https://cornerprobet.com/analysis/re8qc"
+    ),
+]
+
+NON_ALERTS = [
+    "Bom dia a todos! Hoje tem muito jogo bom.",
+    "⚽: ❌",
+    "✅ Green! Parabéns a quem entrou.",
+    "📊 Resumo do dia: 12 greens / 5 reds\nhttps://cornerprobet.com",
+    "📣 Alerta Estratégia: mapa-de-calor 📣\n🏟 Jogo: Time A (1º) x (2º) Time B",
+]
+
+STRATEGIES = [
+    "mapa-de-calor", "Lay 0x1", "Over 1.5 HT", "Escanteios Asiáticos", "BTTS",
+    "Pressão (casa)", "Gol+ 2º Tempo", "Back Favorito 65'",
+]
+TEAMS = [
+    "Lauterach", "Kuchl", "La Luz", "Paysandu FC", "Olympique Akbou", "ES Ben Aknoun",
+    "São Paulo", "Grêmio", "Atlético Mineiro", "Malmö FF", "Beşiktaş", "Górnik Zabrze",
+    "Bodø/Glimt", "Ñublense", "Al-Ahly", "Olympiakos Piräus",
+]
+LEAGUES = [
+    "Austria Regionalliga: West", "Uruguay Segunda Division", "Algeria Ligue 1",
+    "Brazil Serie A", "Sweden Allsvenskan", "Turkey Süper Lig", "Poland Ekstraklasa",
+]
+
+
+OUTCOME_SUFFIXES = [
+    "\n\n⚽: ❌\n\nhttps://cornerprobet.com",
+    "\n\n⚽ 77' ({team})\n\nhttps://cornerprobet.com",
+    "\n\n⚽ 81' ({team})\n⚽ 88' ({team})\n\nhttps://cornerprobet.com",
+]
+
+
+def build_synthetic_alert(rng: random.Random, outcome_ratio: float = 0.0) -> str:
+    home_team, away_team = rng.sample(TEAMS, 2)
+    home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+    odds = [round(rng.uniform(1.1, 9.0), 2) for _ in range(3)]
+    if rng.random() < 0.3:
+        odds_text = " / ".join(f"{odd:.2f}".replace(".", ",") for odd in odds)
+    else:
+        odds_text = " / ".join(f"{odd:g}" for odd in odds)
+    separator = "\n" * rng.randint(1, 4)
+    field_separator = "\n\n" if rng.random() < 0.1 else "\n"
+    outcome = ""
+    if rng.random() < outcome_ratio:
+        outcome = rng.choice(OUTCOME_SUFFIXES).format(team=rng.choice((home_team, away_team)))
+
+    return field_separator.join((
+        f"📣 Alerta Estratégia: {rng.choice(STRATEGIES)} 📣",
+        f"🏟 Jogo: {home_team} ({rng.randint(1, 20)}º) x ({rng.randint(1, 20)}º) {away_team}",
+        f"🏆 Competição: {rng.choice(LEAGUES)}",
+        f"🕛 Tempo: {rng.randint(60, 85)} '",
+        f"⚽ Resultado: {home_goals} x {away_goals} "
+        f"({min(home_goals, rng.randint(0, 2))} x {min(away_goals, rng.randint(0, 2))} Intervalo)",
+        f"📈 Odds 1x2 Pre-live: {odds_text}",
+    )) + f"{separator}https://cornerprobet.com/analysis/{rng.randrange(16 ** 5):05x}{outcome}"
+
+
+def build_corpus(
+    size: int,
+    seed: int = 42,
+    non_alert_ratio: float = 0.0,
+    outcome_ratio: float = 0.0,
+) -> List[str]:
+    rng = random.Random(seed)
+    corpus = list(REAL_ALERTS)
+    while len(corpus) < size:
+        if rng.random() < non_alert_ratio:
+            corpus.append(rng.choice(NON_ALERTS))
+        else:
+            corpus.append(build_synthetic_alert(rng, outcome_ratio))
+    return corpus[:size]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory held by 100k parsed alerts: slotted/interned AlertData vs the former classes.
+
+Usage: python benchmarks/bench_alert_memory.py [alerts]
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+import sys
+import tracemalloc
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import classify_alert, parse_alert_message
+from benchmarks.alert_corpus import build_corpus
+from exports.export_scenario_xlsx import ExportRow
+
+
+@dataclass(frozen=True)
+class LegacyAlertData:
+    strategy: str
+    home_team: str
+    home_position: int
+    away_team: str
+    away_position: int
+    league: str
+    game_time: str
+    home_goals: int
+    away_goals: int
+    halftime_home_goals: int
+    halftime_away_goals: int
+    home_odd: float
+    draw_odd: float
+    away_odd: float
+    match_url: str
+
+
+@dataclass(frozen=True)
+class LegacyExportRow:
+    message_datetime: datetime
+    alert: LegacyAlertData
+    scenario: str
+    goal_scored: bool
+
+
+def _copy_str(value):
+    # Each legacy alert held its own string objects straight from the regex groups.
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def build_legacy_rows(corpus, message_datetime):
+    rows = []
+    for message in corpus:
+        alert = parse_alert_message(message)
+        legacy = LegacyAlertData(*(_copy_str(getattr(alert, field.name)) for field in fields(LegacyAlertData)))
+        rows.append(LegacyExportRow(message_datetime, legacy, _copy_str(classify_alert(alert).scenario), True))
+    return rows
+
+
+def build_rows(corpus, message_datetime):
+    rows = []
+    for message in corpus:
+        alert = parse_alert_message(message)
+        rows.append(ExportRow(message_datetime, alert, classify_alert(alert).scenario_id, True))
+    return rows
+
+
+def build_tuple_rows(corpus, message_datetime):
+    rows = []
+    for message in corpus:
+        alert = parse_alert_message(message)
+        rows.append((message_datetime, alert.as_tuple(), classify_alert(alert).scenario_id, True))
+    return rows
+
+
+def measure(builder, corpus, message_datetime):
+    tracemalloc.start()
+    rows = builder(corpus, message_datetime)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, current
+
+
+def run_benchmark(alert_count: int = 100_000) -> None:
+    corpus = build_corpus(alert_count)
+    message_datetime = datetime(2026, 5, 1, 12, 0)
+
+    results = {}
+    for label, builder in (
+        ("legado (dataclass + copias)", build_legacy_rows),
+        ("slots + strings internadas", build_rows),
+        ("tuplas (as_tuple)", build_tuple_rows),
+    ):
+        rows, retained = measure(builder, corpus, message_datetime)
+        results[label] = retained
+        print(f"{label:<30} {retained / 1024 / 1024:8.2f} MiB  {retained / len(rows):7.0f} B/alerta")
+        del rows
+
+    legacy = results["legado (dataclass + copias)"]
+    compact = results["slots + strings internadas"]
+    print(f"Reducao: {(1 - compact / legacy) * 100:.1f}% em {alert_count:,} alertas")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compare classify_batch with one classify_alert call per row.
+
+Usage: python benchmarks/bench_classify_batch.py [rows]
+"""
+
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import AlertData, classify_alert, classify_batch
+
+
+def build_columns(rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    home_odds = np.round(rng.uniform(1.05, 8.0, rows), 2)
+    away_odds = np.round(rng.uniform(1.05, 8.0, rows), 2)
+    home_goals = rng.integers(0, 5, rows)
+    away_goals = rng.integers(0, 5, rows)
+    return home_odds, away_odds, home_goals, away_goals
+
+
+def run_benchmark(rows: int = 1_000_000) -> None:
+    home_odds, away_odds, home_goals, away_goals = build_columns(rows)
+
+    started = time.perf_counter()
+    batch = classify_batch(home_odds, away_odds, home_goals, away_goals)
+    batch_seconds = time.perf_counter() - started
+
+    alerts = [
+        AlertData("mapa-de-calor", "Casa", 1, "Fora", 2, "Liga", "70", home_goal, away_goal, 0, 0,
+                  home_odd, 3.2, away_odd, "https://cornerprobet.com/analysis/x")
+        for home_odd, away_odd, home_goal, away_goal in zip(
+            home_odds.tolist(), away_odds.tolist(), home_goals.tolist(), away_goals.tolist()
+        )
+    ]
+    started = time.perf_counter()
+    scalar_ids = [classify_alert(alert).scenario_id for alert in alerts]
+    scalar_seconds = time.perf_counter() - started
+
+    if scalar_ids != batch.scenario_ids.tolist():
+        raise SystemExit("classify_batch divergiu de classify_alert")
+
+    print(f"classify_alert (loop)  {scalar_seconds * 1000:9.1f} ms  {rows / scalar_seconds:14,.0f} linhas/s")
+    print(f"classify_batch         {batch_seconds * 1000:9.1f} ms  {rows / batch_seconds:14,.0f} linhas/s")
+    print(f"Speedup: {scalar_seconds / batch_seconds:.1f}x em {rows:,} linhas")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compare the single-pass alert parser with the multi-scan reference parser.
+
+Usage: python benchmarks/bench_parse_alert_message.py [corpus_size] [repeat]
+"""
+
+from pathlib import Path
+import sys
+import timeit
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import parse_alert_message, parse_alert_message_reference
+from benchmarks.alert_corpus import build_corpus
+
+
+def run_benchmark(corpus_size: int = 20000, repeat: int = 5) -> None:
+    corpus = build_corpus(corpus_size, non_alert_ratio=0.1)
+
+    mismatches = sum(
+        1 for message in corpus
+        if parse_alert_message(message) != parse_alert_message_reference(message)
+    )
+    if mismatches:
+        raise SystemExit(f"Parser divergiu da referencia em {mismatches} mensagem(ns)")
+
+    timings = {}
+    for label, parser in (
+        ("referencia (7 regex)", parse_alert_message_reference),
+        ("passada unica", parse_alert_message),
+    ):
+        best = min(timeit.repeat(lambda: [parser(message) for message in corpus], number=1, repeat=repeat))
+        timings[label] = best
+        print(f"{label:<22} {best * 1000:8.1f} ms  {len(corpus) / best:12,.0f} msg/s")
+
+    speedup = timings["referencia (7 regex)"] / timings["passada unica"]
+    print(f"Speedup: {speedup:.2f}x em {len(corpus)} mensagens")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run_benchmark(size, repeat_count)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for the alert classifier hot path.
+
+Measures throughput and allocations of parse_alert_message, classify_alert,
+should_forward_strategy and extract_goal_outcome over a synthetic corpus and
+writes the results as JSON, tagged with the current commit, so runs can be
+compared between commits.
+
+Usage:
+    python benchmarks/run_suite.py [--size N] [--repeat N] [--output FILE]
+                                   [--compare BASELINE.json] [--tolerance 0.15]
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import platform
+from pathlib import Path
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import (
+    classify_alert,
+    compile_strategy_filter,
+    extract_goal_outcome,
+    parse_alert_message,
+    should_forward_strategy,
+)
+from benchmarks.alert_corpus import STRATEGIES, build_corpus
+
+
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+DEFAULT_SIZE = 20000
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.15
+STRATEGY_CONFIG = {
+    "enabled": True,
+    "mode": "whitelist",
+    "strategies": STRATEGIES[::2],
+}
+
+
+def build_cases(size: int) -> Dict[str, Callable[[], list]]:
+    """One zero-argument callable per benchmark, each covering the whole corpus."""
+    corpus = build_corpus(size, non_alert_ratio=0.1, outcome_ratio=0.5)
+    alerts = [alert for alert in map(parse_alert_message, corpus) if alert]
+    strategies = [alert.strategy for alert in alerts]
+    strategy_filter = compile_strategy_filter(STRATEGY_CONFIG)
+
+    return {
+        "parse_alert_message": lambda: [parse_alert_message(message) for message in corpus],
+        "classify_alert": lambda: [classify_alert(alert) for alert in alerts],
+        "should_forward_strategy[dict]": lambda: [
+            should_forward_strategy(strategy, STRATEGY_CONFIG) for strategy in strategies
+        ],
+        "should_forward_strategy[compilado]": lambda: [
+            should_forward_strategy(strategy, strategy_filter) for strategy in strategies
+        ],
+        "extract_goal_outcome": lambda: [extract_goal_outcome(message) for message in corpus],
+    }
+
+
+def measure(case: Callable[[], list], repeat: int) -> dict:
+    operations = len(case())
+    best = min(timeit.repeat(case, number=1, repeat=repeat))
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = case()
+        after = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    allocated = [stat for stat in after.compare_to(before, "filename") if stat.size_diff > 0]
+    del results
+
+    return {
+        "operations": operations,
+        "best_seconds": best,
+        "ops_per_second": operations / best if best else None,
+        "ns_per_op": best / operations * 1e9 if operations else None,
+        "allocated_blocks_per_op": sum(stat.count_diff for stat in allocated) / operations if operations else None,
+        "retained_bytes_per_op": sum(stat.size_diff for stat in allocated) / operations if operations else None,
+        "peak_bytes": peak,
+    }
+
+
+def run_suite(size: int = DEFAULT_SIZE, repeat: int = DEFAULT_REPEAT) -> dict:
+    benchmarks = {
+        name: measure(case, repeat)
+        for name, case in build_cases(size).items()
+    }
+    return {
+        "commit": _current_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus_size": size,
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+
+def compare_results(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Names of benchmarks whose time per operation regressed beyond ``tolerance``."""
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or not previous.get("ns_per_op") or result["ns_per_op"] is None:
+            continue
+
+        change = result["ns_per_op"] / previous["ns_per_op"] - 1
+        print(f"{name:<36} {previous['ns_per_op']:9.0f} → {result['ns_per_op']:9.0f} ns/op  ({change:+.1%})")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(f"Commit {results['commit'] or '?'} · Python {results['python']} · {results['corpus_size']} mensagens")
+    for name, result in results["benchmarks"].items():
+        print(
+            f"{name:<36} {result['ops_per_second']:12,.0f} op/s  {result['ns_per_op']:8.0f} ns/op  "
+            f"{result['allocated_blocks_per_op']:6.2f} blocos/op  {result['retained_bytes_per_op']:8.1f} B/op"
+        )
+
+
+def _current_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_suite(args.size, args.repeat)
+    print_results(results)
+
+    output = args.output or RESULTS_DIR / f"{results['commit'] or 'sem-commit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados salvos em {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            raise SystemExit(f"Regressão acima de {args.tolerance:.0%} em: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import os
 from pathlib import Path
 import re
 import sys
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Tuple, Union
 from zoneinfo import ZoneInfo
 
 from openpyxl import Workbook
@@ -23,7 +23,13 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from analysis.scenario_classifier import SCENARIO_NAMES, AlertData, parse_and_classify
+from analysis.scenario_classifier import (
+    SCENARIO_NAMES,
+    AlertData,
+    extract_goal_outcome,
+    is_cornerpro_alert,
+    parse_and_classify,
+)
 
 
 CONFIG_PATH = "client_config.json"
@@ -62,15 +68,15 @@ HEADERS = [
 ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExportRow:
     message_datetime: datetime
     alert: AlertData
-    scenario: str
+    scenario_id: int
     goal_scored: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnitResult:
     simple_unit: int
     simple_balance: int
@@ -149,25 +155,6 @@ def is_mapa_de_calor_strategy(strategy: str) -> bool:
     return _normalize_strategy(strategy) == _normalize_strategy(STRATEGY_NAME)
 
 
-def extract_goal_outcome(message_text: str) -> Optional[bool]:
-    goal_lines = []
-    for raw_line in message_text.splitlines():
-        line = raw_line.strip()
-        if not line or "⚽" not in line:
-            continue
-        if re.search(r"\bresultado\s*:", line, flags=re.IGNORECASE):
-            continue
-        goal_lines.append(line)
-
-    if not goal_lines:
-        return None
-
-    last_goal_line = goal_lines[-1]
-    if "❌" in last_goal_line:
-        return False
-    return True
-
-
 def calculate_unit_results(goal_results: Iterable[bool]) -> List[UnitResult]:
     results = []
     simple_balance = 0
@@ -206,10 +193,11 @@ async def collect_rows(
     source_chat_id: Union[int, str],
     start_local: datetime,
     end_local: datetime,
-) -> Dict[str, List[ExportRow]]:
-    rows_by_scenario = {scenario: [] for scenario in SCENARIO_NAMES}
+) -> Dict[int, List[ExportRow]]:
+    rows_by_scenario = {scenario_id: [] for scenario_id in range(len(SCENARIO_NAMES))}
     skipped_without_result = 0
     skipped_unparseable = 0
+    skipped_not_alert = 0
     skipped_other_strategy = 0
     collected_descending = []
 
@@ -226,6 +214,9 @@ async def collect_rows(
             break
         if not message_text:
             continue
+        if not is_cornerpro_alert(message_text):
+            skipped_not_alert += 1
+            continue
 
         parsed = parse_and_classify(message_text)
         if not parsed:
@@ -245,29 +236,30 @@ async def collect_rows(
         collected_descending.append(ExportRow(
             message_datetime=local_datetime,
             alert=alert,
-            scenario=scenario_result.scenario,
+            scenario_id=scenario_result.scenario_id,
             goal_scored=goal_outcome,
         ))
 
     for row in reversed(collected_descending):
-        rows_by_scenario[row.scenario].append(row)
+        rows_by_scenario[row.scenario_id].append(row)
 
     logger.info("Mensagens exportaveis: %s", len(collected_descending))
     logger.info("Ignoradas sem resultado green/red claro: %s", skipped_without_result)
+    logger.info("Ignoradas por nao serem alertas: %s", skipped_not_alert)
     logger.info("Ignoradas por formato nao parseavel: %s", skipped_unparseable)
     logger.info("Ignoradas por outra estrategia: %s", skipped_other_strategy)
     return rows_by_scenario
 
 
-def build_workbook(rows_by_scenario: Dict[str, List[ExportRow]]) -> Workbook:
+def build_workbook(rows_by_scenario: Dict[int, List[ExportRow]]) -> Workbook:
     workbook = Workbook()
     default_sheet = workbook.active
     workbook.remove(default_sheet)
 
     sheet_titles = build_sheet_titles(SCENARIO_NAMES)
-    for scenario in SCENARIO_NAMES:
+    for scenario_id, scenario in enumerate(SCENARIO_NAMES):
         sheet = workbook.create_sheet(sheet_titles[scenario])
-        rows = rows_by_scenario.get(scenario, [])
+        rows = rows_by_scenario.get(scenario_id, [])
         _write_scenario_sheet(sheet, scenario, rows)
 
     return workbook
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Cache of parsed game-analysis stats, keyed by matchday game id.
+
+Recent entries live in an in-memory LRU. Every entry is also written to a
+small SQLite table under ``analysis_html/`` so restarts keep them. Entries
+older than ``ttl`` seconds are treated as missing and re-fetched.
+"""
+
+from collections import OrderedDict
+import logging
+from pathlib import Path
+import sqlite3
+import time
+from typing import Callable, NamedTuple, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_TTL = 6 * 3600.0
+MAX_ENTRIES = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    game_id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    ppj_fav TEXT,
+    media_gm_casa TEXT,
+    media_gs_fora TEXT,
+    url TEXT NOT NULL
+);
+"""
+
+
+class AnalysisStats(NamedTuple):
+    ppj_fav: Optional[str]
+    media_gm_casa: Optional[str]
+    media_gs_fora: Optional[str]
+    url: str
+
+
+class AnalysisCache:
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = ANALYSIS_TTL,
+        max_entries: int = MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.connection = None
+        if path:
+            try:
+                self.connection = sqlite3.connect(str(path))
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.executescript(SCHEMA)
+                self.connection.commit()
+            except sqlite3.Error as error:
+                logger.warning(f"⚠️  Cache de análises só em memória ({error})")
+                self.connection = None
+
+    @classmethod
+    def from_config(cls, cache_config: Optional[dict], default_path: Union[str, Path]) -> Optional["AnalysisCache"]:
+        cache_config = cache_config or {}
+        if not cache_config.get("enabled", True):
+            return None
+        return cls(
+            cache_config.get("path", default_path),
+            ttl=cache_config.get("ttl", ANALYSIS_TTL),
+            max_entries=cache_config.get("max_entries", MAX_ENTRIES),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, game_id) -> Optional[AnalysisStats]:
+        key = str(game_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+
+        if entry is None or self.clock() - entry[0] >= self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._remember(key, entry)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, game_id, stats: AnalysisStats) -> None:
+        key = str(game_id)
+        entry = (self.clock(), stats)
+        self._remember(key, entry)
+        if self.connection is None:
+            return
+        try:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO analysis (game_id, fetched_at, ppj_fav, media_gm_casa, media_gs_fora, url) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry[0], *stats),
+            )
+            self.connection.commit()
+        except sqlite3.Error as error:
+            logger.error(f"❌ Erro ao gravar cache de análises: {error}")
+
+    def prune(self) -> int:
+        """Drop expired rows from disk; returns how many were removed."""
+        if self.connection is None:
+            return 0
+        cursor = self.connection.execute("DELETE FROM analysis WHERE fetched_at <= ?", (self.clock() - self.ttl,))
+        self.connection.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[tuple]:
+        if self.connection is None:
+            return None
+        try:
+            row = self.connection.execute(
+                "SELECT fetched_at, ppj_fav, media_gm_casa, media_gs_fora, url FROM analysis WHERE game_id = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as error:
+            logger.warning(f"⚠️  Erro ao ler cache de análises: {error}")
+            return None
+        if row is None:
+            return None
+        return row[0], AnalysisStats(*row[1:])
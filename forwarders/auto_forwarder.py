@@ -5,11 +5,12 @@ Monitora mensagens de um bot específico e encaminha automaticamente para um gru
 """
 
 import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
 import os
 import re
-import requests
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -23,7 +24,14 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from analysis.scenario_classifier import StrategyMatcher, is_cornerpro_alert, parse_alert_message
 from data import invalid_leagues, nationality_countries
+from forwarders.analysis_cache import AnalysisCache, AnalysisStats
+from forwarders.dedup import AlertDeduplicator
+from forwarders.game_analysis import GameAnalysisClient
+from forwarders.matchday_index import MatchdayIndex, normalize_text
+from forwarders.outbox import MAX_REPLAY_AGE, Outbox
+from forwarders.startup import StartupTimer, peers_in_storage
 
 # Configuração de logging
 logging.basicConfig(
@@ -32,13 +40,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def normalize_text(text):
-    """
-    Normaliza texto removendo acentos, convertendo para minúsculo e removendo espaços extras
-    """
-    if not text:
-        return ""
-    return unidecode(text.lower().strip())
+# Intervalo (s) entre logs de métricas
+METRICS_LOG_INTERVAL = 300
 
 # Diretórios
 BASE_DIR = ROOT_DIR
@@ -127,6 +130,7 @@ class TeamEquivalenceCache:
 # Instâncias globais dos caches
 league_cache = LeagueEquivalenceCache()
 team_cache = TeamEquivalenceCache()
+matchday_index = MatchdayIndex(MATCHDAY_DATA_DIR)
 
 def clean_team_name(nome):
     """
@@ -284,24 +288,11 @@ def find_game_in_matchday(league, home_team, away_team):
     Retorna: (home_name, away_name, game_id) ou (None, None, None)
     """
     try:
-        # Encontrar o arquivo JSON mais recente
-        json_files = list(MATCHDAY_DATA_DIR.glob("*.json"))
-        if not json_files:
+        # Índice do arquivo JSON mais recente (só é relido quando o arquivo muda)
+        if not matchday_index.refresh():
             logger.warning("⚠️  Nenhum arquivo JSON encontrado em matchday_data/")
             return None, None, None
         
-        # Pegar o arquivo mais recente
-        latest_json = max(json_files, key=lambda p: p.stat().st_mtime)
-        logger.info(f"📄 Lendo arquivo: {latest_json.name}")
-        
-        with open(latest_json, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Navegar na estrutura: data -> horários -> ligas -> games
-        if 'data' not in data:
-            logger.warning("⚠️  Chave 'data' não encontrada no JSON")
-            return None, None, None
-        
         # Normalizar nomes para comparação
         league_normalized = normalize_text(league)
         home_normalized = normalize_text(home_team)
@@ -364,55 +355,27 @@ def find_game_in_matchday(league, home_team, away_team):
             
             return home_match and away_match
         
-        def is_reasonable_match(game_home, game_away, home_target, away_target, strategy_name, game_league=None):
-            """Verifica se o match encontrado é razoável (evita falsos positivos)"""
-            # Para busca geral (fallback), ser mais rigoroso
-            if strategy_name == "busca geral":
-                game_home_norm = normalize_text(game_home)
-                game_away_norm = normalize_text(game_away)
-                home_target_norm = normalize_text(home_target)
-                away_target_norm = normalize_text(away_target)
-                
-                # Calcular similaridade básica (quantos caracteres coincidem)
-                home_similarity = len(set(home_target_norm) & set(game_home_norm)) / max(len(home_target_norm), len(game_home_norm))
-                away_similarity = len(set(away_target_norm) & set(game_away_norm)) / max(len(away_target_norm), len(game_away_norm))
-                
-                # Requerer pelo menos 50% de similaridade para busca geral
-                MIN_SIMILARITY = 0.5
-                if home_similarity < MIN_SIMILARITY or away_similarity < MIN_SIMILARITY:
-                    logger.debug(f"🚫 Match rejeitado por baixa similaridade: {home_similarity:.2f}, {away_similarity:.2f}")
-                    return False
+        # Países e nacionalidades conhecidos, para validar a liga dos jogos da busca geral
+        known_countries = set([normalize_text(c) for c in nationality_countries.NACIONALITY_COUNTRIES.values()])
+        known_nationalities = set([normalize_text(n) for n in nationality_countries.NACIONALITY_COUNTRIES.keys()])
+        all_known = known_countries | known_nationalities
+        
+        def is_compatible_league(game_league):
+            """Verifica se a liga do jogo não está em um país completamente diferente (evita falsos positivos)"""
+            league_words = normalize_text(league).split()
+            game_league_words = normalize_text(game_league).split()
+            
+            # Se a liga original tem indicação de país, verificar compatibilidade
+            if len(league_words) > 0 and len(game_league_words) > 0:
+                original_country = league_words[0]  # Primeira palavra da liga original
                 
-                # Validação adicional: verificar se a liga do jogo não está em um país completamente diferente
-                if game_league:
-                    league_words = normalize_text(league).split()
-                    game_league_words = normalize_text(game_league).split()
-                    
-                    # Se a liga original tem indicação de país, verificar compatibilidade
-                    if len(league_words) > 0 and len(game_league_words) > 0:
-                        original_country = league_words[0]  # Primeira palavra da liga original
-                        
-                        # Usar NACIONALITY_COUNTRIES para obter países conhecidos
-                        known_countries = set([normalize_text(c) for c in nationality_countries.NACIONALITY_COUNTRIES.values()])
-                        known_nationalities = set([normalize_text(n) for n in nationality_countries.NACIONALITY_COUNTRIES.keys()])
-                        all_known = known_countries | known_nationalities
-                        
-                        # Se o país original é conhecido e a liga do jogo não contém referência compatível
-                        if original_country in all_known:
-                            # Verificar se há alguma compatibilidade entre os países
-                            has_country_match = False
-                            for word in game_league_words:
-                                if word in all_known:
-                                    has_country_match = True
-                                    break
-                            
-                            if not has_country_match:
-                                logger.debug(f"🚫 Match rejeitado por incompatibilidade de país: '{league}' vs '{game_league}'")
-                                return False
+                # Se o país original é conhecido e a liga do jogo não contém referência compatível
+                if original_country in all_known:
+                    return any(word in all_known for word in game_league_words)
             
             return True
         
-        def try_all_team_combinations(game_home, game_away, strategy_name, game_league=None):
+        def try_all_team_combinations(game_home, game_away):
             """
             Tenta todas as combinações de nomes das equipes
             Primeiro tenta busca exata, depois busca flexível
@@ -436,12 +399,7 @@ def find_game_in_matchday(league, home_team, away_team):
             for home_target, away_target, desc in combinations:
                 if home_target and away_target:
                     if check_team_match_flexible(game_home, game_away, home_target, away_target):
-                        # Validar se é um match razoável
-                        if is_reasonable_match(game_home, game_away, home_target, away_target, strategy_name, game_league):
-                            return True, f"{desc} (flexível)"
-                        else:
-                            logger.debug(f"🚫 Match flexível rejeitado: {game_home} vs {game_away}")
-                            continue
+                        return True, f"{desc} (flexível)"
             
             return False, ""
         
@@ -507,30 +465,28 @@ def find_game_in_matchday(league, home_team, away_team):
             # Coletar todos os jogos correspondentes no cache
             cache_matches = []
             
-            # Buscar a liga equivalente no JSON
-            for time_slot, leagues in data['data'].items():
-                for league_name, league_data in leagues.items():
-                    if normalize_text(league_name) == normalize_text(cached_league):
-                        logger.info(f"🎯 Liga do cache encontrada no JSON: '{league_name}'")
-                        
-                        if 'games' in league_data:
-                            for game in league_data['games']:
-                                game_home = game.get('home_name', '')
-                                game_away = game.get('away_name', '')
-                                
-                                # Verificar cache de equipes primeiro
-                                cached_home = team_cache.get_equivalent(home_team)
-                                cached_away = team_cache.get_equivalent(away_team)
-                                
-                                if cached_home and cached_away:
-                                    if (normalize_text(game_home) == normalize_text(cached_home) and 
-                                        normalize_text(game_away) == normalize_text(cached_away)):
-                                        cache_matches.append((game_home, game_away, game['id'], "cache completo", league_name))
-                                
-                                # Se não tem cache completo de equipes, tentar combinações normais
-                                success, match_desc = try_all_team_combinations(game_home, game_away, "cache de liga", league_name)
-                                if success:
-                                    cache_matches.append((game_home, game_away, game['id'], f"cache de liga, {match_desc}", league_name))
+            # Verificar cache de equipes primeiro
+            cached_home = team_cache.get_equivalent(home_team)
+            cached_away = team_cache.get_equivalent(away_team)
+            cached_pair_games = (
+                set(matchday_index.games_with_teams(cached_home, cached_away))
+                if cached_home and cached_away
+                else set()
+            )
+            
+            # Buscar a liga equivalente no índice
+            cached_league_games = matchday_index.games_in_league(cached_league)
+            if cached_league_games:
+                logger.info(f"🎯 Liga do cache encontrada no JSON: '{cached_league_games[0].league}'")
+            
+            for game in cached_league_games:
+                if game in cached_pair_games:
+                    cache_matches.append((game.home_name, game.away_name, game.game_id, "cache completo", game.league))
+                
+                # Se não tem cache completo de equipes, tentar combinações normais
+                success, match_desc = try_all_team_combinations(game.home_name, game.away_name)
+                if success:
+                    cache_matches.append((game.home_name, game.away_name, game.game_id, f"cache de liga, {match_desc}", game.league))
             
             # Selecionar o melhor match
             if cache_matches:
@@ -546,51 +502,23 @@ def find_game_in_matchday(league, home_team, away_team):
         # Coletar todos os matches das estratégias 1 e 2
         all_matches = []
         
-        # Percorrer todos os horários
-        for time_slot, leagues in data['data'].items():
-            # Percorrer todas as ligas nesse horário
-            for league_name, league_data in leagues.items():
-                league_name_normalized = normalize_text(league_name)
-                
-                # ESTRATÉGIA 1: Busca direta por nome da liga
-                if league_name_normalized == league_normalized:
-                    logger.info(f"🎯 Liga encontrada diretamente: '{league_name}'")
-                    
-                    if 'games' in league_data:
-                        for game in league_data['games']:
-                            game_home = game.get('home_name', '')
-                            game_away = game.get('away_name', '')
-                            
-                            # Tentar todas as combinações de nomes
-                            success, match_desc = try_all_team_combinations(game_home, game_away, "liga direta", league_name)
-                            if success:
-                                all_matches.append((game_home, game_away, game['id'], f"liga direta, {match_desc}", league_name))
-                
-                # ESTRATÉGIA 2: Busca por país (primeira palavra da liga)
+        # ESTRATÉGIA 1: Busca direta por nome da liga
+        # ESTRATÉGIA 2: Busca por país (primeira palavra da liga)
+        # Os jogos das duas estratégias vêm juntos, na ordem do arquivo
+        logged_leagues = set()
+        for game, is_direct in matchday_index.games_for_league(league, get_country_variations(country)):
+            strategy_name = "liga direta" if is_direct else "busca por país"
+            if game.league not in logged_leagues:
+                logged_leagues.add(game.league)
+                if is_direct:
+                    logger.info(f"🎯 Liga encontrada diretamente: '{game.league}'")
                 else:
-                    # Verificar se a liga corresponde a alguma variação do país
-                    country_variations = get_country_variations(country)
-                    country_match = False
-                    matched_variation = ""
-                    
-                    for country_var in country_variations:
-                        if league_name_normalized.startswith(normalize_text(country_var)):
-                            country_match = True
-                            matched_variation = country_var
-                            break
-                    
-                    if country_match:
-                        logger.info(f"🌍 Liga com país correspondente encontrada: '{league_name}' (país: '{country}' → '{matched_variation}')")
-                        
-                        if 'games' in league_data:
-                            for game in league_data['games']:
-                                game_home = game.get('home_name', '')
-                                game_away = game.get('away_name', '')
-                                
-                                # Tentar todas as combinações de nomes
-                                success, match_desc = try_all_team_combinations(game_home, game_away, "busca por país", league_name)
-                                if success:
-                                    all_matches.append((game_home, game_away, game['id'], f"busca por país, {match_desc}", league_name))
+                    logger.info(f"🌍 Liga com país correspondente encontrada: '{game.league}' (país: '{country}')")
+            
+            # Tentar todas as combinações de nomes
+            success, match_desc = try_all_team_combinations(game.home_name, game.away_name)
+            if success:
+                all_matches.append((game.home_name, game.away_name, game.game_id, f"{strategy_name}, {match_desc}", game.league))
         
         # Selecionar o melhor match das estratégias 1 e 2
         if all_matches:
@@ -604,21 +532,16 @@ def find_game_in_matchday(league, home_team, away_team):
                 team_cache.add_equivalence(away_team, game_away)
                 return game_home, game_away, game_id
         
-        # ESTRATÉGIA 3: Busca apenas pelas equipes em todas as ligas (fallback)
+        # ESTRATÉGIA 3: Busca aproximada pelas equipes em todas as ligas (fallback)
+        # Só os jogos que compartilham trigramas com os nomes são pontuados, do mais parecido ao menos
         logger.info(f"🔄 Tentando busca geral pelas equipes em todas as ligas...")
         fallback_matches = []
         
-        for time_slot, leagues in data['data'].items():
-            for league_name, league_data in leagues.items():
-                if 'games' in league_data:
-                    for game in league_data['games']:
-                        game_home = game.get('home_name', '')
-                        game_away = game.get('away_name', '')
-                        
-                        # Tentar todas as combinações de nomes
-                        success, match_desc = try_all_team_combinations(game_home, game_away, "busca geral", league_name)
-                        if success:
-                            fallback_matches.append((game_home, game_away, game['id'], f"busca geral, {match_desc}", league_name))
+        for game, similarity in matchday_index.search_teams(home_team, away_team):
+            if not is_compatible_league(game.league):
+                logger.debug(f"🚫 Match rejeitado por incompatibilidade de país: '{league}' vs '{game.league}'")
+                continue
+            fallback_matches.append((game.home_name, game.away_name, game.game_id, f"busca geral, similaridade {similarity:.2f}", game.league))
         
         # Selecionar o melhor match do fallback
         if fallback_matches:
@@ -693,11 +616,18 @@ def extract_stats_from_html(html_content):
         return None, None, None
 
 
-def fetch_game_analysis(home_name, away_name, game_id):
+async def fetch_game_analysis(analysis_client, home_name, away_name, game_id, cache=None):
     """
-    Busca a página de análise do jogo e extrai estatísticas.
-    Retorna: (ppj_fav, media_gm_casa, media_gs_fora) ou (None, None, None)
+    Busca a página de análise do jogo e extrai estatísticas, sem bloquear o event loop.
+    Com ``cache``, análises recentes do mesmo game_id são reaproveitadas sem rede.
+    Retorna: (ppj_fav, media_gm_casa, media_gs_fora, url) ou (None, None, None, None)
     """
+    if cache is not None:
+        cached = cache.get(game_id)
+        if cached is not None:
+            logger.info(f"💾 Análise do jogo {game_id} reaproveitada do cache")
+            return tuple(cached)
+    
     try:
         # Limpar nomes das equipes
         home_clean = clean_team_name(home_name)
@@ -708,46 +638,23 @@ def fetch_game_analysis(home_name, away_name, game_id):
         
         logger.info(f"🔍 Buscando análise: {url}")
         
-        headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7,es-BR;q=0.6,es;q=0.5',
-            'Cache-Control': 'max-age=0',
-            'Connection': 'keep-alive',
-            'Referer': 'https://classic.cornerprobet.com/pt/',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36',
-            'sec-ch-ua': '"Chromium";v="140", "Not=A?Brand";v="24", "Google Chrome";v="140"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Linux"'
-        }
-        
-        cookies = {
-            'cf_clearance': 'Wm6RQ7Nzct7GiGTXfL41S2MHxZFwj6BO9.LgtyJgb.E-1756481292-1.2.1.1-6DsNhXG3ovfc2qv3HqeHG1G6UEGhYFSzRvoTd1YzL7vESDzwQu5QN7Aes4knLjjMMsh3FneOq4aGcfA_Ff2wDFTOuRR7xNmedEfHKrOKkABUktTG.GUPcB4FgyBh1hoYMFPXM7ABVyHGA1c47nwsnhUqje4pmYFytFUxcMuObKNDrv6dgyLTXGDSMONamGw3v612f_BVgtBDnByf3Tiu_hSDYQ4qfDuOJtrlX3BTYfo',
-            '_gcl_au': '1.1.280675726.1760124239',
-            '_gid': 'GA1.2.1064458828.1760648319',
-            '_ga': 'GA1.2.2007463621.1752198586',
-            '_clck': '1qdf3kl%5E2%5Eg0h%5E0%5E2122',
-            '_clsk': '1nv3cu1%5E1761442277835%5E1%5E1%5Ek.clarity.ms%2Fcollect',
-            '_ga_ZEJ7MW3BNF': 'GS2.1.s1761442276$o164$g0$t1761442281$j55$l0$h0',
-            'PHPSESSID': 'kpls2s1p7bgqpdr14hjs276jdd'
-        }
-        
-        response = requests.get(url, headers=headers, cookies=cookies, timeout=30)
-        response.raise_for_status()
+        html = await analysis_client.fetch(url)
         #  write html
         # html_file_path = ANALYSIS_HTML_DIR / f"analysis_{game_id}.html"
         # with open(html_file_path, 'w', encoding='utf-8') as html_file:
-        #     html_file.write(response.text)
+        #     html_file.write(html)
+        
+        # Extrair estatísticas do HTML (BeautifulSoup é CPU, roda fora do event loop)
+        ppj_fav, media_gm_casa, media_gs_fora = await asyncio.to_thread(extract_stats_from_html, html)
         
-        # Extrair estatísticas do HTML
-        ppj_fav, media_gm_casa, media_gs_fora = extract_stats_from_html(response.text)
+        # Página sem estatísticas (layout diferente, bloqueio) não vai para o cache
+        if cache is not None and any((ppj_fav, media_gm_casa, media_gs_fora)):
+            cache.put(game_id, AnalysisStats(ppj_fav, media_gm_casa, media_gs_fora, url))
         
         return ppj_fav, media_gm_casa, media_gs_fora, url
         
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
         logger.error(f"❌ Erro ao buscar análise do jogo: {e}")
         return None, None, None, None
@@ -756,6 +663,16 @@ class AutoMessageForwarder:
     def __init__(self, config_path="client_config.json"):
         """Inicializa o forwarder automático"""
         self.config = self.load_config(config_path)
+        self.metrics = Counter()
+        self.outbox = Outbox.from_config(self.config.get("outbox"), "auto_outbox.sqlite3")
+        self.deduplicator = AlertDeduplicator.from_config(self.config.get("dedup"))
+        self.analysis_client = GameAnalysisClient.from_config(self.config.get("analysis"))
+        self.analysis_cache = AnalysisCache.from_config(
+            (self.config.get("analysis") or {}).get("cache"),
+            ANALYSIS_HTML_DIR / "analysis_cache.sqlite3",
+        )
+        # Busca no matchday e caches de equivalência ficam numa única thread, fora do event loop
+        self.matchday_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="matchday")
         
         # Modo híbrido: Usuário lê, Bot envia
         if self.config.get("bot_token") and self.config.get("phone_number"):
@@ -819,6 +736,7 @@ class AutoMessageForwarder:
                 "api_id": int(os.getenv('API_ID')),
                 "api_hash": os.getenv('API_HASH'),
                 "debug": os.getenv('DEBUG', 'true').lower() == 'true',
+                "alerts_only": os.getenv('ALERTS_ONLY', 'false').lower() == 'true',
             }
             
             # Suporte para bot_token ou phone_number
@@ -889,6 +807,9 @@ class AutoMessageForwarder:
                     "strategies": []
                 }
             
+            # Compila o matcher uma única vez, junto da configuração do forwarder
+            forwarder["strategy_matcher"] = self.compile_strategy_matcher(forwarder)
+            
             # Log da configuração de cada forwarder
             strategy_config = forwarder["strategy_filters"]
             source_id = forwarder["source_user_id"]
@@ -903,6 +824,11 @@ class AutoMessageForwarder:
                 
         return config
     
+    @staticmethod
+    def compile_strategy_matcher(forwarder):
+        """Matcher das estratégias configuradas no forwarder"""
+        return StrategyMatcher(forwarder["strategy_filters"].get("strategies", []), strip=False)
+    
     def register_handlers(self):
         """Registra os handlers de mensagens para todas as fontes configuradas"""
         
@@ -951,30 +877,24 @@ class AutoMessageForwarder:
             return False
         
         # Extrair primeira e segunda linha (onde está a estratégia)
-        first_line = message_text.split('\n')[0].lower().strip()
-        second_line = message_text.split('\n')[1].lower().strip() if len(message_text.split('\n')) > 1 else ""
+        lines = message_text.split('\n', 2)
+        first_line = lines[0].lower().strip()
+        second_line = lines[1].lower().strip() if len(lines) > 1 else ""
         
         if self.config.get("debug", False):
             source_id = forwarder_config["source_user_id"]
             logger.info(f"🔍 [{source_id}] Analisando primeira linha: '{first_line}'\n Segunda linha: '{second_line}'")
         
-        # Lista de estratégias configuradas
-        strategies = strategy_config.get("strategies", [])
         mode = strategy_config.get("mode", "whitelist")
         
-        # Verificar se alguma estratégia está presente na primeira linha
-        strategy_found = False
-        matched_strategy = None
+        # Matcher pré-compilado no carregamento da configuração
+        matcher = forwarder_config.get("strategy_matcher")
+        if matcher is None:
+            matcher = forwarder_config["strategy_matcher"] = self.compile_strategy_matcher(forwarder_config)
         
-        for strategy in strategies:
-            if strategy.lower() in first_line.lower():
-                strategy_found = True
-                matched_strategy = strategy
-                break
-            if strategy.lower() in second_line.lower():
-                strategy_found = True
-                matched_strategy = strategy
-                break
+        # Verificar se alguma estratégia está presente na primeira ou segunda linha
+        matched_strategy = matcher.find(first_line) or matcher.find(second_line)
+        strategy_found = matched_strategy is not None
         
         # Aplicar lógica de whitelist ou blacklist
         if mode == "whitelist":
@@ -1002,6 +922,92 @@ class AutoMessageForwarder:
                 matching_forwarders.append(forwarder)
         return matching_forwarders
     
+    async def enrich_alert(self, message_text):
+        """
+        Texto extra do alerta (link da análise). Se não ficar pronto dentro de
+        analysis.latency_budget segundos, a busca é cancelada e o alerta segue sem ele.
+        """
+        budget = self.analysis_client.latency_budget
+        try:
+            return await asyncio.wait_for(self._build_stats_text(message_text), timeout=budget)
+        except asyncio.TimeoutError:
+            self.metrics["analises_expiradas"] += 1
+            logger.warning(f"⏱️  Análise do jogo não ficou pronta em {budget:.1f}s; alerta segue sem ela")
+            return ""
+    
+    async def _build_stats_text(self, message_text):
+        """Busca liga/times, jogo no matchday e análise para alertas Lay 0x1 / Lay 1x2"""
+        stats_text = ""
+        if message_text:
+            first_line = message_text.split('\n')[0].lower().strip() if message_text else ""
+            second_line = message_text.split('\n')[1].lower().strip() if len(message_text.split('\n')) > 1 else ""
+            
+            # Verificar se contém "Lay 0x1" na primeira ou segunda linha
+            if ("lay 0x1" in first_line or "lay 0x1" in second_line or "lay 1x2" in first_line or "lay 1x2" in second_line):                            
+                # Extrair liga e times da mensagem
+                league, home_team, away_team = extract_league_and_teams(message_text)
+                
+                if league and home_team and away_team:
+                    # logger.info(f"📊 Liga original: {league}")
+                    # logger.info(f"🏠 Casa: {home_team}")
+                    # logger.info(f"✈️  Fora: {away_team}")
+                    
+                    # Converter nome da liga e verificar validade
+                    converted_league, league_validity_emoji = convert_league_name(league)
+                    # logger.info(f"📊 Liga convertida: {converted_league}")
+                    
+                    # Buscar jogo no matchday JSON usando a liga convertida
+                    loop = asyncio.get_running_loop()
+                    home_name, away_name, game_id = await loop.run_in_executor(
+                        self.matchday_executor, find_game_in_matchday, converted_league, home_team, away_team
+                    )
+                    
+                    if home_name and away_name and game_id:
+                        # Buscar análise do jogo e extrair estatísticas
+                        ppj_fav, media_gm_casa, media_gs_fora, url = await fetch_game_analysis(
+                            self.analysis_client, home_name, away_name, game_id, self.analysis_cache
+                        )
+                        
+                        # if ppj_fav or media_gm_casa or media_gs_fora:
+                        #     logger.info(f"✅ Estatísticas extraídas com sucesso!")
+                        
+                        #     # Montar texto com estatísticas
+                        #     stats_text = "\n\n📊 Critérios:"
+                        #     # Adicionar critério de liga válida/inválida
+                        #     # stats_text += f"\n🏆 Liga Válida: {league_validity_emoji}"
+                        #     if ppj_fav:
+                        #       if float(ppj_fav) < 1.2:
+                        #         stats_text += f"\n🎯 PPJ Fav: {ppj_fav} ❌"
+                        #       else:
+                        #         stats_text += f"\n🎯 PPJ Fav: {ppj_fav} ✅"
+                        #     if media_gm_casa:
+                        #         if float(media_gm_casa) < 1:
+                        #             stats_text += f"\n⚽ Média G.M Casa: {media_gm_casa} ❌"
+                        #         else:
+                        #             stats_text += f"\n⚽ Média G.M Casa: {media_gm_casa} ✅"
+                        #     if media_gs_fora:
+                        #         if float(media_gs_fora) < 0.8:
+                        #             stats_text += f"\n🛡️ Média G.S Fora: {media_gs_fora} ❌"
+                        #         else:
+                        #             stats_text += f"\n🛡️ Média G.S Fora: {media_gs_fora} ✅"
+                        #     stats_text += f"\n\n{url}"
+                        # else:
+                        #     # Mesmo sem dados da partida, mostrar critério da liga
+                        #     stats_text = f"\n\n📊 Critérios:\n🏆 Liga Válida: {league_validity_emoji}"
+                        #     stats_text += f"\n\n{url}"
+                        #     logger.warning(f"⚠️  Não foi possível extrair estatísticas ({url})")
+                        if url:
+                            stats_text += f"\n\n{url}"
+                    # else:
+                    #   # Mesmo sem encontrar o jogo, mostrar critério da liga
+                    #   stats_text = f"\n\n📊 Critérios:\n🏆 Liga Válida: {league_validity_emoji}"
+                    #   stats_text += f"\n\nDados da partida não encontrados"
+                    #   logger.warning(f"⚠️  Jogo não encontrado no matchday")
+                # else:
+                #   stats_text += f"\n\nDados da partida não encontrados"
+                #   logger.warning(f"⚠️  Não foi possível extrair liga/times da mensagem")
+        return stats_text
+    
     async def forward_message(self, client: Client, message: Message):
         """Encaminha uma mensagem para todos os grupos de destino configurados"""
         try:
@@ -1010,6 +1016,20 @@ class AutoMessageForwarder:
 
             logger.debug(f"📩 Mensagem recebida de {source_id}: {message.text or '[Mídia]'}")
             
+            # Pré-filtro: descarta mensagens que não são alertas antes de qualquer processamento
+            if self.config.get("alerts_only", False) and not is_cornerpro_alert(message.text):
+                self.metrics["ignoradas_nao_alerta"] += 1
+                logger.debug(f"🚫 [{source_id}] Mensagem não é um alerta CornerPro")
+                return
+            
+            # Descarta alertas repetidos (reenvios do CornerPro) antes de enriquecer ou enviar
+            if self.deduplicator is not None and message.text:
+                alert = parse_alert_message(message.text)
+                if alert and self.deduplicator.is_duplicate(source_id, alert):
+                    self.metrics["duplicadas_ignoradas"] += 1
+                    logger.info(f"♻️  [{source_id}] Alerta repetido ignorado: {alert.strategy} {alert.match_url}")
+                    return
+            
             # Encontrar todas as configurações de forwarder para esta fonte
             forwarder_configs = self.get_forwarder_config(source_id)
             if not forwarder_configs:
@@ -1021,6 +1041,9 @@ class AutoMessageForwarder:
             logger.info(f"📨 [{source_id}] Nova mensagem recebida: {text_preview}")
             logger.info(f"🎯 [{source_id}] Processando {len(forwarder_configs)} destino(s)")
             
+            # Enriquecimento calculado uma única vez por mensagem, só quando algum destino o usa
+            stats_text = None
+            
             # Processar cada forwarder configurado para esta fonte
             for forwarder_config in forwarder_configs:
                 target_id = forwarder_config["target_chat_id"]
@@ -1028,73 +1051,13 @@ class AutoMessageForwarder:
                 try:
                     # Verificar filtros de estratégia para este forwarder específico
                     if not self.should_forward_message(message.text, forwarder_config):
+                        self.metrics["bloqueadas_por_filtro"] += 1
                         logger.info(f"🚫 [{source_id}→{target_id}] Mensagem bloqueada pelos filtros de estratégia")
                         continue
                     
-                    # Verificar se é estratégia "Lay 0x1" para buscar análise
-                    stats_text = ""
-                    if message.text:
-                        first_line = message.text.split('\n')[0].lower().strip() if message.text else ""
-                        second_line = message.text.split('\n')[1].lower().strip() if len(message.text.split('\n')) > 1 else ""
-                        
-                        # Verificar se contém "Lay 0x1" na primeira ou segunda linha
-                        if ("lay 0x1" in first_line or "lay 0x1" in second_line or "lay 1x2" in first_line or "lay 1x2" in second_line):                            
-                            # Extrair liga e times da mensagem
-                            league, home_team, away_team = extract_league_and_teams(message.text)
-                            
-                            if league and home_team and away_team:
-                                # logger.info(f"📊 Liga original: {league}")
-                                # logger.info(f"🏠 Casa: {home_team}")
-                                # logger.info(f"✈️  Fora: {away_team}")
-                                
-                                # Converter nome da liga e verificar validade
-                                converted_league, league_validity_emoji = convert_league_name(league)
-                                # logger.info(f"📊 Liga convertida: {converted_league}")
-                                
-                                # Buscar jogo no matchday JSON usando a liga convertida
-                                home_name, away_name, game_id = find_game_in_matchday(converted_league, home_team, away_team)
-                                
-                                if home_name and away_name and game_id:
-                                    # Buscar análise do jogo e extrair estatísticas
-                                    ppj_fav, media_gm_casa, media_gs_fora, url = fetch_game_analysis(home_name, away_name, game_id)
-                                    
-                                    # if ppj_fav or media_gm_casa or media_gs_fora:
-                                    #     logger.info(f"✅ Estatísticas extraídas com sucesso!")
-                                        
-                                    #     # Montar texto com estatísticas
-                                    #     stats_text = "\n\n📊 Critérios:"
-                                    #     # Adicionar critério de liga válida/inválida
-                                    #     # stats_text += f"\n🏆 Liga Válida: {league_validity_emoji}"
-                                    #     if ppj_fav:
-                                    #       if float(ppj_fav) < 1.2:
-                                    #         stats_text += f"\n🎯 PPJ Fav: {ppj_fav} ❌"
-                                    #       else:
-                                    #         stats_text += f"\n🎯 PPJ Fav: {ppj_fav} ✅"
-                                    #     if media_gm_casa:
-                                    #         if float(media_gm_casa) < 1:
-                                    #             stats_text += f"\n⚽ Média G.M Casa: {media_gm_casa} ❌"
-                                    #         else:
-                                    #             stats_text += f"\n⚽ Média G.M Casa: {media_gm_casa} ✅"
-                                    #     if media_gs_fora:
-                                    #         if float(media_gs_fora) < 0.8:
-                                    #             stats_text += f"\n🛡️ Média G.S Fora: {media_gs_fora} ❌"
-                                    #         else:
-                                    #             stats_text += f"\n🛡️ Média G.S Fora: {media_gs_fora} ✅"
-                                    #     stats_text += f"\n\n{url}"
-                                    # else:
-                                    #     # Mesmo sem dados da partida, mostrar critério da liga
-                                    #     stats_text = f"\n\n📊 Critérios:\n🏆 Liga Válida: {league_validity_emoji}"
-                                    #     stats_text += f"\n\n{url}"
-                                    #     logger.warning(f"⚠️  Não foi possível extrair estatísticas ({url})")
-                                    stats_text += f"\n\n{url}"
-                                # else:
-                                #   # Mesmo sem encontrar o jogo, mostrar critério da liga
-                                #   stats_text = f"\n\n📊 Critérios:\n🏆 Liga Válida: {league_validity_emoji}"
-                                #   stats_text += f"\n\nDados da partida não encontrados"
-                                #   logger.warning(f"⚠️  Jogo não encontrado no matchday")
-                            # else:
-                            #   stats_text += f"\n\nDados da partida não encontrados"
-                            #   logger.warning(f"⚠️  Não foi possível extrair liga/times da mensagem")
+                    # Busca a análise para alertas "Lay 0x1"/"Lay 1x2", dentro do orçamento de latência
+                    if stats_text is None:
+                        stats_text = await self.enrich_alert(message.text)
                     
                     # Formata a mensagem com estatísticas (se houver)
                     if message.text:
@@ -1102,12 +1065,20 @@ class AutoMessageForwarder:
                     else:
                         formatted_message = "[Mensagem com mídia]"
                     
+                    # Registra no outbox antes de enviar, para reenviar caso o processo caia
+                    outbox_id = None
+                    if self.outbox is not None:
+                        outbox_id = self.outbox.add(source_id, message.id, target_id, formatted_message)
+                    
                     # Encaminha para o grupo de destino específico usando o cliente apropriado
                     await self.send_app.send_message(
                         chat_id=target_id,
                         text=formatted_message
                     )
                     
+                    if self.outbox is not None:
+                        self.outbox.mark_sent(outbox_id)
+                    self.metrics["encaminhadas"] += 1
                     logger.info(f"✅ [{source_id}→{target_id}] Mensagem encaminhada automaticamente!")
                     
                 except Exception as e:
@@ -1121,62 +1092,146 @@ class AutoMessageForwarder:
     async def start(self):
         """Inicia o cliente e o monitoramento"""
         logger.info("🚀 Iniciando Message Forwarder Automático Multi-Fonte...")
+        self._metrics_task = asyncio.create_task(self._log_metrics_periodically())
+        timer = StartupTimer()
         
-        # No modo híbrido, precisamos iniciar ambos os clientes
-        if self.hybrid_mode:
-            async with self.user_app, self.bot_app:
-                # Obtém informações do usuário (para leitura)
-                me_user = await self.user_app.get_me()
-                logger.info(f"👤 Usuário (leitura): {me_user.first_name} {me_user.last_name or ''} (@{me_user.username or 'sem_username'})")
-                
-                # Obtém informações do bot (para envio)
-                me_bot = await self.bot_app.get_me()
-                logger.info(f"🤖 Bot (envio): {me_bot.first_name} (@{me_bot.username or 'sem_username'})")
-                
-                # Carregar diálogos para popular cache de peers (usuário)
-                logger.info("🔄 Carregando cache de diálogos do usuário...")
-                user_dialog_count = 0
-                async for dialog in self.user_app.get_dialogs(limit=100):
-                    user_dialog_count += 1
-                logger.info(f"✅ Cache do usuário carregado com {user_dialog_count} diálogos")
-                
-                # Para o bot, carregar o cache dos destinos configurados
-                logger.info("🔄 Carregando cache de destinos do bot...")
-                for forwarder in self.config["forwarders"]:
-                    target_id = forwarder["target_chat_id"]
-                    try:
-                        # Tentar acessar o chat para popular o cache do bot
-                        chat = await self.bot_app.get_chat(target_id)
-                        logger.info(f"✅ Bot: cache carregado para destino '{getattr(chat, 'title', target_id)}'")
-                    except Exception as e:
-                        logger.warning(f"⚠️  Bot: não conseguiu carregar cache para destino {target_id}: {e}")
-                
-                await self._verify_forwarders()
-                
-                logger.info("👂 Aguardando mensagens de todas as fontes configuradas... (Pressione Ctrl+C para parar)")
-                
-                # Mantém o cliente rodando
-                await asyncio.Event().wait()
+        try:
+            # No modo híbrido, precisamos iniciar ambos os clientes
+            if self.hybrid_mode:
+                async with self.user_app, self.bot_app:
+                    await self._run_connected(timer)
+            else:
+                # Modo normal (apenas um cliente)
+                async with self.app:
+                    await self._run_connected(timer)
+        finally:
+            if self.deduplicator is not None:
+                self.deduplicator.save()
+            if self.outbox is not None:
+                await self.outbox.close()
+            await self.analysis_client.aclose()
+            if self.analysis_cache is not None:
+                self.analysis_cache.close()
+            self.matchday_executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _run_connected(self, timer):
+        """Escuta mensagens assim que os clientes conectam e verifica o resto em segundo plano"""
+        timer.mark("conexão")
+        # Pendências de antes da conexão; as novas mensagens seguem pelo fluxo normal
+        replay_entries = self._load_outbox_backlog()
+        if self.analysis_cache is not None:
+            self.analysis_cache.prune()
+        
+        if self.config.get("background_startup", True):
+            logger.info("👂 Aguardando mensagens de todas as fontes configuradas... (Pressione Ctrl+C para parar)")
+            self._startup_task = asyncio.create_task(self._run_startup_checks(timer, replay_entries))
         else:
-            # Modo normal (apenas um cliente)
-            async with self.app:
-                # Obtém informações do usuário/bot
-                me = await self.app.get_me()
-                logger.info(f"👤 Logado como: {me.first_name} {me.last_name or ''} (@{me.username or 'sem_username'})")
-                
-                # Carregar diálogos para popular cache de peers
-                logger.info("🔄 Carregando cache de diálogos...")
-                dialog_count = 0
-                async for dialog in self.app.get_dialogs(limit=100):
-                    dialog_count += 1
-                logger.info(f"✅ Cache carregado com {dialog_count} diálogos")
-                
+            await self._run_startup_checks(timer, replay_entries)
+            logger.info("👂 Aguardando mensagens de todas as fontes configuradas... (Pressione Ctrl+C para parar)")
+        
+        # Mantém o cliente rodando
+        await asyncio.Event().wait()
+    
+    async def _run_startup_checks(self, timer, replay_entries=()):
+        """Contas, cache de peers e verificação dos forwarders, em paralelo e cronometrados"""
+        async def log_accounts():
+            async with timer.phase("contas"):
+                await self._log_accounts()
+        
+        async def warm_and_verify():
+            try:
+                async with timer.phase("cache de diálogos"):
+                    await self._warm_caches()
+            finally:
+                # Só reenvia com os peers dos destinos já em cache
+                self._replay_task = asyncio.create_task(self._replay_outbox(replay_entries))
+            async with timer.phase("verificação dos forwarders"):
                 await self._verify_forwarders()
-                
-                logger.info("👂 Aguardando mensagens de todas as fontes configuradas... (Pressione Ctrl+C para parar)")
-                
-                # Mantém o cliente rodando
-                await asyncio.Event().wait()
+        
+        results = await asyncio.gather(log_accounts(), warm_and_verify(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Erro na inicialização: {result}")
+        logger.info(f"🏁 Inicialização concluída em {timer.elapsed():.2f}s")
+    
+    async def _log_accounts(self):
+        """Mostra as contas conectadas"""
+        if self.hybrid_mode:
+            # Obtém informações do usuário (para leitura) e do bot (para envio)
+            me_user, me_bot = await asyncio.gather(self.user_app.get_me(), self.bot_app.get_me())
+            logger.info(f"👤 Usuário (leitura): {me_user.first_name} {me_user.last_name or ''} (@{me_user.username or 'sem_username'})")
+            logger.info(f"🤖 Bot (envio): {me_bot.first_name} (@{me_bot.username or 'sem_username'})")
+        else:
+            me = await self.app.get_me()
+            logger.info(f"👤 Logado como: {me.first_name} {me.last_name or ''} (@{me.username or 'sem_username'})")
+    
+    async def _warm_caches(self):
+        """Popula o cache de peers, pulando o que a sessão já conhece"""
+        source_ids = [forwarder["source_user_id"] for forwarder in self.config["forwarders"]]
+        target_ids = [forwarder["target_chat_id"] for forwarder in self.config["forwarders"]]
+        
+        # Carregar diálogos para popular cache de peers (usuário/app principal)
+        if await peers_in_storage(self.app, source_ids + target_ids):
+            logger.info("✅ Todos os chats configurados já estão na sessão; diálogos não recarregados")
+        else:
+            logger.info("🔄 Carregando cache de diálogos...")
+            dialog_count = 0
+            async for dialog in self.app.get_dialogs(limit=100):
+                dialog_count += 1
+            logger.info(f"✅ Cache carregado com {dialog_count} diálogos")
+        
+        # Para o bot, carregar o cache dos destinos configurados
+        if not self.hybrid_mode or await peers_in_storage(self.bot_app, target_ids):
+            return
+        
+        logger.info("🔄 Carregando cache de destinos do bot...")
+        
+        async def warm_target(target_id):
+            try:
+                # Tentar acessar o chat para popular o cache do bot
+                chat = await self.bot_app.get_chat(target_id)
+                logger.info(f"✅ Bot: cache carregado para destino '{getattr(chat, 'title', target_id)}'")
+            except Exception as e:
+                logger.warning(f"⚠️  Bot: não conseguiu carregar cache para destino {target_id}: {e}")
+        
+        await asyncio.gather(*(warm_target(target_id) for target_id in dict.fromkeys(target_ids)))
+    
+    def _load_outbox_backlog(self):
+        """Inicia o outbox e lista as mensagens que não chegaram a ser enviadas"""
+        if self.outbox is None:
+            return []
+        
+        self.outbox.prune()
+        self.outbox.start()
+        max_age = (self.config.get("outbox") or {}).get("max_replay_age", MAX_REPLAY_AGE)
+        return self.outbox.pending(max_age)
+    
+    async def _replay_outbox(self, entries):
+        """Reenvia mensagens registradas no outbox que não chegaram a ser enviadas"""
+        if entries:
+            logger.info(f"📦 Reenviando {len(entries)} mensagem(ns) pendente(s) do outbox")
+        
+        for entry in entries:
+            try:
+                await self.send_app.send_message(chat_id=entry.target_chat_id, text=entry.text)
+                self.outbox.mark_sent(entry.id)
+                self.metrics["reenviadas_do_outbox"] += 1
+                logger.info(f"✅ [{entry.source_chat_id}→{entry.target_chat_id}] Mensagem pendente reenviada")
+            except Exception as e:
+                logger.error(f"❌ [{entry.source_chat_id}→{entry.target_chat_id}] Erro ao reenviar do outbox: {e}")
+    
+    def get_metrics(self):
+        """Retorna os contadores de mensagens processadas/ignoradas"""
+        return dict(self.metrics)
+    
+    async def _log_metrics_periodically(self):
+        """Loga periodicamente os contadores de métricas"""
+        interval = self.config.get("metrics_log_interval", METRICS_LOG_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            if self.metrics:
+                summary = ", ".join(f"{key}={value}" for key, value in sorted(self.metrics.items()))
+                logger.info(f"📊 Métricas: {summary}")
     
     async def _verify_forwarders(self):
         """Verifica as configurações de forwarders"""
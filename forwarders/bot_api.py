@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Telegram Bot API client on a shared keep-alive connection pool.
+"""
+
+import importlib.util
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+# httpx logs every request URL at INFO, and Bot API URLs contain the token.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_BASE_URL = "https://api.telegram.org"
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 15.0
+MAX_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0
+
+
+class BotApiError(RuntimeError):
+    def __init__(self, description, error_code=None, retry_after=None):
+        super().__init__(description)
+        self.error_code = error_code
+        self.retry_after = retry_after
+
+
+class BotApiClient:
+    def __init__(
+        self,
+        token: str,
+        base_url: str = DEFAULT_BASE_URL,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        http2: bool = True,
+        max_connections: int = MAX_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if not token:
+            raise ValueError("bot_token não configurado")
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️  Pacote 'h2' não instalado. Bot API usará HTTP/1.1.")
+            http2 = False
+
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_config(cls, token: str, bot_api_config: Optional[dict] = None) -> "BotApiClient":
+        bot_api_config = bot_api_config or {}
+        return cls(
+            token,
+            base_url=bot_api_config.get("base_url") or os.getenv("BOT_API_BASE_URL") or DEFAULT_BASE_URL,
+            connect_timeout=bot_api_config.get("connect_timeout", CONNECT_TIMEOUT),
+            read_timeout=bot_api_config.get("read_timeout", READ_TIMEOUT),
+            http2=bot_api_config.get("http2", True),
+            max_connections=bot_api_config.get("max_connections", MAX_CONNECTIONS),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so the pool is bound to the running event loop.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.base_url}/bot{self.token}/",
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def call(self, method: str, payload: Optional[dict] = None) -> dict:
+        response = await self.client.post(method, json=payload or {})
+
+        # Errors such as 429 carry a JSON body with parameters.retry_after.
+        try:
+            response_data = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise BotApiError(f"Resposta inválida da Bot API ({response.status_code})", response.status_code)
+
+        if not response_data.get("ok"):
+            raise BotApiError(
+                response_data.get("description", "erro desconhecido"),
+                error_code=response_data.get("error_code", response.status_code),
+                retry_after=(response_data.get("parameters") or {}).get("retry_after"),
+            )
+        return response_data.get("result", {})
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Per-forum circuit breakers for the send paths (Bot API, bot MTProto, user).
+
+A path that keeps failing is opened and skipped, so alerts go straight to a
+path that works. Open paths are probed in the background; a successful probe
+half-opens the breaker and the next real send decides whether it closes.
+"""
+
+import asyncio
+from collections import Counter
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "fechado"
+OPEN = "aberto"
+HALF_OPEN = "semiaberto"
+
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30.0
+SLOW_LATENCY = 5.0
+LATENCY_ALPHA = 0.2
+PROBE_INTERVAL = 10.0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        latency_alpha: float = LATENCY_ALPHA,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_alpha = latency_alpha
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.latency_ewma: Optional[float] = None
+
+    def record_success(self, latency: float) -> Optional[str]:
+        """Update latency and close the breaker; returns the new state if it changed."""
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.latency_alpha * (latency - self.latency_ewma)
+        self.consecutive_failures = 0
+        return self._transition(CLOSED)
+
+    def record_failure(self) -> Optional[str]:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            return self._transition(OPEN)
+        return None
+
+    def probe_due(self) -> bool:
+        return self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout
+
+    def record_probe(self, succeeded: bool) -> Optional[str]:
+        if succeeded:
+            return self._transition(HALF_OPEN)
+        self.opened_at = self.clock()
+        return None
+
+    def _transition(self, state: str) -> Optional[str]:
+        if state == self.state:
+            return None
+        self.state = state
+        return state
+
+
+class SendPathBreakers:
+    def __init__(
+        self,
+        paths: Sequence[str],
+        metrics: Optional[Counter] = None,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        slow_latency: float = SLOW_LATENCY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.paths = tuple(paths)
+        self.metrics = metrics if metrics is not None else Counter()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_latency = slow_latency
+        self.clock = clock
+        self.breakers: Dict[Tuple[int, str], CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls, paths: Sequence[str], breaker_config: Optional[dict], metrics: Optional[Counter] = None):
+        breaker_config = breaker_config or {}
+        return cls(
+            paths,
+            metrics=metrics,
+            failure_threshold=breaker_config.get("failure_threshold", FAILURE_THRESHOLD),
+            reset_timeout=breaker_config.get("reset_timeout", RESET_TIMEOUT),
+            slow_latency=breaker_config.get("slow_latency", SLOW_LATENCY),
+        )
+
+    def breaker(self, chat_id: int, path: str) -> CircuitBreaker:
+        key = (chat_id, path)
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout, clock=self.clock)
+            self.breakers[key] = breaker
+        return breaker
+
+    def order(self, chat_id: int) -> List[str]:
+        """Paths to try for ``chat_id``: healthy, then slow, then open ones as a last resort."""
+        healthy, slow, unavailable = [], [], []
+        for path in self.paths:
+            breaker = self.breaker(chat_id, path)
+            if breaker.state == OPEN:
+                unavailable.append(path)
+            elif breaker.latency_ewma is not None and breaker.latency_ewma > self.slow_latency:
+                slow.append(path)
+            else:
+                healthy.append(path)
+        return healthy + slow + unavailable
+
+    def record_success(self, chat_id: int, path: str, latency: float) -> None:
+        self.metrics[f"envios_via_{_metric_label(path)}"] += 1
+        self._report(chat_id, path, self.breaker(chat_id, path).record_success(latency))
+
+    def record_failure(self, chat_id: int, path: str) -> None:
+        self.metrics[f"falhas_via_{_metric_label(path)}"] += 1
+        self._report(chat_id, path, self.breaker(chat_id, path).record_failure())
+
+    async def probe_due_paths(self, probe: Callable[[str, int], Awaitable[object]]) -> None:
+        for (chat_id, path), breaker in list(self.breakers.items()):
+            if not breaker.probe_due():
+                continue
+            try:
+                await probe(path, chat_id)
+            except Exception as error:
+                logger.debug("Sonda de %s para %s falhou: %s", path, chat_id, error)
+                breaker.record_probe(False)
+            else:
+                self._report(chat_id, path, breaker.record_probe(True))
+
+    async def run_probes(self, probe: Callable[[str, int], Awaitable[object]], interval: float = PROBE_INTERVAL) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.probe_due_paths(probe)
+
+    def _report(self, chat_id: int, path: str, new_state: Optional[str]) -> None:
+        if new_state is None:
+            return
+        self.metrics[f"circuito_{_metric_label(path)}_{new_state}"] += 1
+        log = logger.warning if new_state == OPEN else logger.info
+        log("🔌 [%s] Caminho '%s' agora %s", chat_id, path, new_state)
+
+
+def _metric_label(path: str) -> str:
+    return path.replace(" ", "_")
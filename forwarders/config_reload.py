@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Config hot reload: poll the config file's mtime and listen for SIGHUP.
+
+Tools that rewrite ``client_config.json`` (e.g. refresh_scenario_topics.py)
+can trigger a reload immediately through the forwarder's pid file. The
+forwarder holds an exclusive lock on that file while it runs, so a file left
+behind by a killed process (whose pid may since have been reused) is never
+signalled; the mtime watcher picks the change up instead.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+import signal
+from typing import IO, Callable, Dict, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no SIGHUP either
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+RELOAD_POLL_INTERVAL = 2.0
+SCENARIO_PID_FILE = "scenario_forwarder.pid"
+
+# Open pid files whose lock this process holds, by resolved path.
+_locked_pid_files: Dict[str, IO[str]] = {}
+
+
+class ConfigWatcher:
+    def __init__(
+        self,
+        path: Union[str, Path],
+        on_change: Callable[[], object],
+        interval: float = RELOAD_POLL_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = self._stat()
+        self._reload_requested = asyncio.Event()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changed(self) -> bool:
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        return True
+
+    def request_reload(self) -> None:
+        self._reload_requested.set()
+
+    def install_signal_handler(self) -> bool:
+        """Reload on SIGHUP; returns False where signals are unavailable (e.g. Windows)."""
+        if not hasattr(signal, "SIGHUP"):
+            return False
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.request_reload)
+        except (NotImplementedError, RuntimeError):
+            return False
+        return True
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._reload_requested.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+            requested = self._reload_requested.is_set()
+            self._reload_requested.clear()
+            if self.changed() or requested:
+                self.on_change()
+
+
+def write_pid_file(path: Union[str, Path] = SCENARIO_PID_FILE) -> bool:
+    """Write our pid and keep the file locked until ``remove_pid_file``; False if another forwarder holds it."""
+    try:
+        pid_file = open(path, "a+", encoding="utf-8")
+    except OSError as error:
+        logger.warning(f"⚠️  Não foi possível criar {path}: {error}")
+        return False
+
+    if fcntl is not None:
+        try:
+            fcntl.flock(pid_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            pid_file.close()
+            logger.warning(f"⚠️  {path} está em uso por outro forwarder; recarga por sinal desativada")
+            return False
+
+    pid_file.truncate(0)
+    pid_file.write(str(os.getpid()))
+    pid_file.flush()
+    _locked_pid_files[str(Path(path).resolve())] = pid_file
+    return True
+
+
+def remove_pid_file(path: Union[str, Path] = SCENARIO_PID_FILE) -> None:
+    pid_path = Path(path)
+    pid_file = _locked_pid_files.pop(str(pid_path.resolve()), None)
+    try:
+        if pid_path.read_text(encoding="utf-8").strip() == str(os.getpid()):
+            pid_path.unlink()
+    except OSError:
+        pass
+    if pid_file is not None:
+        pid_file.close()
+
+
+def _held_by_running_process(pid_file: IO[str]) -> bool:
+    """True while the process that wrote the pid file still holds its lock."""
+    try:
+        fcntl.flock(pid_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    fcntl.flock(pid_file, fcntl.LOCK_UN)
+    return False
+
+
+def send_reload_signal(path: Union[str, Path] = SCENARIO_PID_FILE) -> bool:
+    """Ask the running forwarder to reload its config; False if none is running."""
+    if not hasattr(signal, "SIGHUP") or fcntl is None:
+        return False
+    try:
+        with open(path, "r", encoding="utf-8") as pid_file:
+            pid = int(pid_file.read().strip())
+            if not _held_by_running_process(pid_file):
+                logger.warning(f"⚠️  {path} é de um processo que já terminou; sinal de recarga não enviado")
+                return False
+            os.kill(pid, signal.SIGHUP)
+    except (OSError, ValueError):
+        return False
+    return True
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Bounded TTL de-duplication of repeated alerts.
+
+An alert is identified by its match URL, strategy, score and game time,
+scoped to the source chat. Entries expire after ``ttl`` seconds and the
+oldest are evicted beyond ``max_entries``. The set can optionally be
+persisted to a JSON file so restarts keep recognising recent alerts.
+"""
+
+from collections import OrderedDict
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Callable, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import AlertData
+
+
+logger = logging.getLogger(__name__)
+
+DEDUP_TTL = 900.0
+MAX_ENTRIES = 10000
+SAVE_INTERVAL = 30.0
+
+
+def alert_fingerprint(alert: AlertData) -> str:
+    return f"{alert.match_url}|{alert.strategy}|{alert.home_goals}x{alert.away_goals}|{alert.game_time}"
+
+
+class AlertDeduplicator:
+    def __init__(
+        self,
+        ttl: float = DEDUP_TTL,
+        max_entries: int = MAX_ENTRIES,
+        path: Optional[str] = None,
+        save_interval: float = SAVE_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.save_interval = save_interval
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._expires_at: "OrderedDict[str, float]" = OrderedDict()
+        self._dirty = False
+        self._saved_at = clock()
+        self._load()
+
+    @classmethod
+    def from_config(cls, dedup_config: Optional[dict]) -> Optional["AlertDeduplicator"]:
+        dedup_config = dedup_config or {}
+        if not dedup_config.get("enabled", True):
+            return None
+        return cls(
+            ttl=dedup_config.get("ttl", DEDUP_TTL),
+            max_entries=dedup_config.get("max_entries", MAX_ENTRIES),
+            path=dedup_config.get("path"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def is_duplicate(self, source_chat_id: int, alert: AlertData) -> bool:
+        """Record ``alert`` and return True if it was already seen within the TTL."""
+        key = f"{source_chat_id}|{alert_fingerprint(alert)}"
+        now = self.clock()
+        self._expire(now)
+
+        if key in self._expires_at:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        self._expires_at[key] = now + self.ttl
+        while len(self._expires_at) > self.max_entries:
+            self._expires_at.popitem(last=False)
+        self._dirty = True
+        if self.path and now - self._saved_at >= self.save_interval:
+            self.save()
+        return False
+
+    def stats(self) -> Tuple[int, int]:
+        return self.hits, self.misses
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._expires_at, file)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logger.error(f"❌ Erro ao salvar cache de duplicados: {error}")
+            return
+        self._dirty = False
+        self._saved_at = self.clock()
+
+    def _expire(self, now: float) -> None:
+        # Entries are inserted in expiry order, so expired ones sit at the front.
+        while self._expires_at:
+            key, expires_at = next(iter(self._expires_at.items()))
+            if expires_at > now:
+                break
+            del self._expires_at[key]
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError) as error:
+            logger.warning(f"⚠️  Cache de duplicados ignorado ({error})")
+            return
+
+        now = self.clock()
+        for key, expires_at in sorted(stored.items(), key=lambda item: item[1]):
+            if expires_at > now:
+                self._expires_at[key] = expires_at
+        while len(self._expires_at) > self.max_entries:
+            self._expires_at.popitem(last=False)
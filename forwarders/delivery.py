@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Paced delivery of forwarded messages, one queue and worker per forum.
+
+Telegram allows roughly 20 messages per minute into the same group. Each
+forum gets a token bucket tuned to that limit, and Bot API ``retry_after``
+or MTProto ``FloodWait`` responses block the bucket for the requested time
+before the job is retried.
+
+Optionally, alerts for the same topic that pile up behind each other are
+coalesced: when another alert for that topic is already waiting, the worker
+waits ``coalesce_window`` seconds and merges the queued alerts for the topic
+into one message of at most ``max_message_length`` characters. Any other
+alert is sent immediately.
+"""
+
+import asyncio
+from collections import Counter, deque
+from dataclasses import dataclass, field, replace
+import logging
+import time
+from pathlib import Path
+import sys
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from forwarders.routing import TopicRef
+
+
+logger = logging.getLogger(__name__)
+
+GROUP_MESSAGES_PER_MINUTE = 20
+GROUP_BURST = 5
+MAX_ATTEMPTS = 3
+MAX_QUEUE_SIZE = 1000
+COALESCE_WINDOW = 0.0
+MAX_MESSAGE_LENGTH = 4096
+COALESCE_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate_per_second <= 0 or capacity < 1:
+            raise ValueError("rate_per_second deve ser > 0 e capacity >= 1")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated_at = clock()
+
+    @classmethod
+    def per_minute(cls, messages_per_minute: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        return cls(messages_per_minute / 60, burst, clock)
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        now = self.clock()
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second)
+            self.updated_at = now
+
+        self.tokens -= 1
+        ready_at = self.updated_at
+        if self.tokens < 0:
+            ready_at += -self.tokens / self.rate_per_second
+        return max(0.0, ready_at - now)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, retry_after: float) -> None:
+        """Hold every send until ``retry_after`` seconds from now, then allow one."""
+        blocked_until = self.clock() + max(0.0, retry_after)
+        self.updated_at = max(self.updated_at, blocked_until)
+        self.tokens = min(self.tokens, 1.0)
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryJob:
+    source_chat_id: int
+    forum_chat_id: int
+    topic_ref: TopicRef
+    text: str
+    scenario: str
+    source_message_id: Optional[int] = None
+    outbox_id: Optional[int] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    coalesced: Tuple["DeliveryJob", ...] = ()
+
+    @property
+    def parts(self) -> Tuple["DeliveryJob", ...]:
+        """The original jobs carried by this one (just itself unless coalesced)."""
+        return self.coalesced or (self,)
+
+
+def coalesce_jobs(jobs: List[DeliveryJob], separator: str = COALESCE_SEPARATOR) -> DeliveryJob:
+    """Merge jobs for the same topic into one, keeping the first job's identity."""
+    if len(jobs) == 1:
+        return jobs[0]
+    return replace(jobs[0], text=separator.join(job.text for job in jobs), coalesced=tuple(jobs))
+
+
+def retry_after_from_error(error: BaseException) -> Optional[float]:
+    """Seconds Telegram asked us to wait, from a Bot API error or a Pyrogram FloodWait."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+
+    try:
+        from pyrogram.errors import FloodWait
+    except ImportError:
+        return None
+
+    if isinstance(error, FloodWait) and isinstance(error.value, (int, float)):
+        return float(error.value)
+    return None
+
+
+class DeliveryQueue:
+    def __init__(
+        self,
+        send: Callable[[DeliveryJob], Awaitable[object]],
+        messages_per_minute: float = GROUP_MESSAGES_PER_MINUTE,
+        burst: float = GROUP_BURST,
+        max_attempts: int = MAX_ATTEMPTS,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        coalesce_window: float = COALESCE_WINDOW,
+        max_message_length: int = MAX_MESSAGE_LENGTH,
+        metrics: Optional[Counter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.send = send
+        self.messages_per_minute = messages_per_minute
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.max_queue_size = max_queue_size
+        self.coalesce_window = coalesce_window
+        self.max_message_length = max_message_length
+        self.metrics = metrics if metrics is not None else Counter()
+        self.clock = clock
+        self.queues: Dict[int, asyncio.Queue] = {}
+        self.buckets: Dict[int, TokenBucket] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        # Jobs already taken off a queue while looking for coalescing partners.
+        self.held: Dict[int, Deque[DeliveryJob]] = {}
+
+    @classmethod
+    def from_config(cls, send, delivery_config: Optional[dict], metrics: Optional[Counter] = None):
+        delivery_config = delivery_config or {}
+        return cls(
+            send,
+            messages_per_minute=delivery_config.get("messages_per_minute", GROUP_MESSAGES_PER_MINUTE),
+            burst=delivery_config.get("burst", GROUP_BURST),
+            max_attempts=delivery_config.get("max_attempts", MAX_ATTEMPTS),
+            max_queue_size=delivery_config.get("max_queue_size", MAX_QUEUE_SIZE),
+            coalesce_window=delivery_config.get("coalesce_window", COALESCE_WINDOW),
+            max_message_length=delivery_config.get("max_message_length", MAX_MESSAGE_LENGTH),
+            metrics=metrics,
+        )
+
+    def submit(self, job: DeliveryJob) -> bool:
+        """Enqueue ``job`` on its forum's queue; False if that queue is full."""
+        queue = self.queues.get(job.forum_chat_id)
+        if queue is None:
+            queue = self._start_worker(job.forum_chat_id)
+
+        try:
+            # Jobs held back for coalescing still count against the limit.
+            if self.max_queue_size > 0 and self.pending(job.forum_chat_id) >= self.max_queue_size:
+                raise asyncio.QueueFull
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.metrics["descartadas_fila_cheia"] += 1
+            logger.error(
+                "❌ [%s→%s] Fila de envio cheia (%s). Mensagem descartada.",
+                job.source_chat_id,
+                job.forum_chat_id,
+                self.max_queue_size,
+            )
+            return False
+
+        self.metrics["enfileiradas"] += 1
+        return True
+
+    def pending(self, forum_chat_id: Optional[int] = None) -> int:
+        if forum_chat_id is not None:
+            queue = self.queues.get(forum_chat_id)
+            return queue.qsize() + len(self.held.get(forum_chat_id, ())) if queue else 0
+        return sum(self.pending(forum_chat_id) for forum_chat_id in self.queues)
+
+    async def drain(self) -> None:
+        """Wait until every queued job has been delivered or given up on."""
+        for queue in list(self.queues.values()):
+            await queue.join()
+
+    async def close(self) -> None:
+        workers = list(self.workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.workers.clear()
+        self.queues.clear()
+        self.held.clear()
+
+    def _start_worker(self, forum_chat_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.queues[forum_chat_id] = queue
+        self.held[forum_chat_id] = deque()
+        self.buckets[forum_chat_id] = TokenBucket.per_minute(self.messages_per_minute, self.burst, self.clock)
+        self.workers[forum_chat_id] = asyncio.create_task(self._run_worker(forum_chat_id, queue))
+        return queue
+
+    async def _run_worker(self, forum_chat_id: int, queue: asyncio.Queue) -> None:
+        bucket = self.buckets[forum_chat_id]
+        held = self.held[forum_chat_id]
+        while True:
+            job = held.popleft() if held else await queue.get()
+            batch = [job]
+            try:
+                if self.coalesce_window > 0 and self._has_backlog(job, queue, held):
+                    await asyncio.sleep(self.coalesce_window)
+                    batch = self._take_batch(job, queue, held)
+                    if len(batch) > 1:
+                        self.metrics["alertas_agrupados"] += len(batch)
+                await self._deliver(coalesce_jobs(batch), bucket)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @staticmethod
+    def _hold_queued(queue: asyncio.Queue, held: Deque[DeliveryJob]) -> None:
+        while not queue.empty():
+            held.append(queue.get_nowait())
+
+    def _has_backlog(self, job: DeliveryJob, queue: asyncio.Queue, held: Deque[DeliveryJob]) -> bool:
+        """True if another alert for ``job``'s topic is already waiting."""
+        self._hold_queued(queue, held)
+        return any(other.topic_ref == job.topic_ref for other in held)
+
+    def _take_batch(self, first: DeliveryJob, queue: asyncio.Queue, held: Deque[DeliveryJob]) -> List[DeliveryJob]:
+        """Pull queued jobs for ``first``'s topic that still fit in one message, in order."""
+        self._hold_queued(queue, held)
+
+        batch = [first]
+        length = len(first.text)
+        remaining = deque()
+        topic_closed = False
+        while held:
+            job = held.popleft()
+            if not topic_closed and job.topic_ref == first.topic_ref:
+                merged_length = length + len(COALESCE_SEPARATOR) + len(job.text)
+                if merged_length <= self.max_message_length:
+                    batch.append(job)
+                    length = merged_length
+                    continue
+                # Later alerts for this topic must not jump ahead of this one.
+                topic_closed = True
+            remaining.append(job)
+        held.extend(remaining)
+        return batch
+
+    async def _deliver(self, job: DeliveryJob, bucket: TokenBucket) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            await bucket.acquire()
+            try:
+                await self.send(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                retry_after = retry_after_from_error(error)
+                if retry_after is None:
+                    self._give_up(job, error)
+                    return
+
+                bucket.penalize(retry_after)
+                self.metrics["limites_de_envio"] += 1
+                logger.warning(
+                    "⏳ [%s→%s] Limite do Telegram: aguardando %.0fs (tentativa %s/%s)",
+                    job.source_chat_id,
+                    job.forum_chat_id,
+                    retry_after,
+                    attempt,
+                    self.max_attempts,
+                )
+                if attempt == self.max_attempts:
+                    self._give_up(job, error)
+                    return
+            else:
+                self.metrics["enviadas"] += 1
+                return
+
+    def _give_up(self, job: DeliveryJob, error: Exception) -> None:
+        self.metrics["envios_falhos"] += 1
+        logger.error(
+            "❌ [%s→%s] Erro ao enviar mensagem: %s",
+            job.source_chat_id,
+            job.forum_chat_id,
+            error,
+        )
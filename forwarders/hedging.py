@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Hedged sends: if the primary path is slower than its usual latency, race a
+second path instead of waiting for the timeout.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import hashlib
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+MIN_HEDGE_DELAY = 0.3
+
+
+class LatencyTracker:
+    """Recent latencies per path, for percentile-based hedge delays."""
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, path: str, latency: float) -> None:
+        samples = self._samples.get(path)
+        if samples is None:
+            samples = self._samples[path] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def percentile(self, path: str, quantile: float) -> Optional[float]:
+        samples = self._samples.get(path)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
+
+
+@dataclass(frozen=True, slots=True)
+class HedgeOutcome:
+    winner: str
+    result: Any
+    hedged: bool
+
+
+def derive_random_id(source_chat_id: int, source_message_id: int, forum_chat_id: int, top_msg_id: int) -> int:
+    """Stable MTProto random_id for one alert in one topic, so repeated sends are de-duplicated."""
+    return derive_batch_random_id([(source_chat_id, source_message_id)], forum_chat_id, top_msg_id)
+
+
+def derive_batch_random_id(sources: Iterable[Tuple[int, int]], forum_chat_id: int, top_msg_id: int) -> int:
+    """Stable random_id for a message carrying every ``(source_chat_id, source_message_id)`` alert.
+
+    A merged message gets a different id than any of its alerts sent alone,
+    so a replay that merges an already-sent alert with new ones is not
+    mistaken for a duplicate.
+    """
+    alerts = ";".join(f"{source_chat_id}:{source_message_id}" for source_chat_id, source_message_id in sources)
+    key = f"{alerts}:{forum_chat_id}:{top_msg_id}".encode()
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True) or 1
+
+
+async def race_with_hedge(
+    primary_label: str,
+    primary: Callable[[], Awaitable[Any]],
+    hedge_label: str,
+    hedge: Callable[[], Awaitable[Any]],
+    hedge_delay: Optional[float],
+) -> HedgeOutcome:
+    """Run ``primary``; after ``hedge_delay`` seconds without an answer, also run ``hedge``.
+
+    Returns the first successful result and cancels the loser. When both fail,
+    the primary's error is raised.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    if hedge_delay is None:
+        return HedgeOutcome(primary_label, await primary_task, False)
+
+    done, _pending = await asyncio.wait({primary_task}, timeout=hedge_delay)
+    if done:
+        return HedgeOutcome(primary_label, primary_task.result(), False)
+
+    hedge_task = asyncio.ensure_future(hedge())
+    labels = {primary_task: primary_label, hedge_task: hedge_label}
+    pending = {primary_task, hedge_task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return HedgeOutcome(labels[task], task.result(), True)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    hedge_task.exception()
+    raise primary_task.exception()
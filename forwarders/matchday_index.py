@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+In-memory index of the newest matchday file in ``matchday_data/``.
+
+The JSON is parsed once and its games are indexed by normalized league,
+by prefixes of the league's first word (country lookups) and by the
+normalized home/away pair. The file is re-read only when the directory or
+the newest file's mtime changes. Games keep the file's order, so callers
+that pick the first match behave as if they had walked the JSON.
+
+Team names are also indexed by character trigram, so the fuzzy fallback
+only scores games that share trigrams with the query and ranks them by
+Dice similarity.
+"""
+
+from collections import Counter
+from functools import lru_cache
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from unidecode import unidecode
+
+
+logger = logging.getLogger(__name__)
+
+MIN_TEAM_SIMILARITY = 0.5
+MAX_SEARCH_RESULTS = 10
+WORD_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(text):
+    """
+    Normaliza texto removendo acentos, convertendo para minúsculo e removendo espaços extras
+    """
+    if not text:
+        return ""
+    return unidecode(text.lower().strip())
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigramas por palavra, com espaços nas bordas (como o pg_trgm)"""
+    grams = set()
+    for word in WORD_PATTERN.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def dice_similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return 2 * len(first & second) / (len(first) + len(second))
+
+
+class MatchdayGame(NamedTuple):
+    order: int
+    league: str
+    home_name: str
+    away_name: str
+    game_id: object
+    home_norm: str
+    away_norm: str
+
+
+class MatchdayIndex:
+    def __init__(self, data_dir: Union[str, Path]):
+        self.data_dir = Path(data_dir)
+        self.path: Optional[Path] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self.games: List[MatchdayGame] = []
+        self.by_league: Dict[str, List[MatchdayGame]] = {}
+        self.by_country_prefix: Dict[str, List[str]] = {}
+        self.by_teams: Dict[Tuple[str, str], List[MatchdayGame]] = {}
+        # Trigrama → ordens dos jogos cujo mandante/visitante o contém
+        self.home_postings: Dict[str, List[int]] = {}
+        self.away_postings: Dict[str, List[int]] = {}
+        self.trigram_sizes: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def refresh(self) -> bool:
+        """Reload if a newer matchday file appeared or the current one changed; False when none exists."""
+        try:
+            dir_mtime = self.data_dir.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = None
+
+        if self.path is not None and self._signature is not None and self._signature[0] == dir_mtime:
+            try:
+                if self.path.stat().st_mtime_ns == self._signature[1]:
+                    return True
+            except OSError:
+                pass
+
+        latest = self._latest_file()
+        if latest is None:
+            self.path = None
+            self._signature = None
+            self._clear()
+            return False
+
+        path, file_mtime = latest
+        if path == self.path and self._signature is not None and self._signature[1] == file_mtime:
+            self._signature = (dir_mtime, file_mtime)
+            return True
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # Arquivo sendo escrito pelo fetcher: mantém o índice anterior e tenta de novo depois
+            logger.warning(f"⚠️  Não foi possível ler {path.name}: {e}")
+            return bool(self.games)
+
+        self.load(data)
+        self.path = path
+        self._signature = (dir_mtime, file_mtime)
+        logger.info(f"📄 Índice do matchday carregado de {path.name}: {len(self.games)} jogos")
+        return True
+
+    def _latest_file(self) -> Optional[Tuple[Path, int]]:
+        latest = None
+        for path in self.data_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                continue
+            if latest is None or mtime > latest[1]:
+                latest = (path, mtime)
+        return latest
+
+    def load(self, data: dict) -> None:
+        self._clear()
+        if "data" not in data:
+            logger.warning("⚠️  Chave 'data' não encontrada no JSON")
+            return
+
+        # Navegar na estrutura: data -> horários -> ligas -> games
+        for leagues in data["data"].values():
+            for league_name, league_data in leagues.items():
+                league_norm = normalize_text(league_name)
+                if league_norm not in self.by_league:
+                    self.by_league[league_norm] = []
+                    self._index_country_prefixes(league_norm)
+
+                for game in league_data.get("games", ()):
+                    if "id" not in game:
+                        continue
+                    home_name = game.get("home_name", "")
+                    away_name = game.get("away_name", "")
+                    indexed = MatchdayGame(
+                        order=len(self.games),
+                        league=league_name,
+                        home_name=home_name,
+                        away_name=away_name,
+                        game_id=game["id"],
+                        home_norm=normalize_text(home_name),
+                        away_norm=normalize_text(away_name),
+                    )
+                    self.games.append(indexed)
+                    self.by_league[league_norm].append(indexed)
+                    self.by_teams.setdefault((indexed.home_norm, indexed.away_norm), []).append(indexed)
+                    self._index_trigrams(indexed)
+
+    def _index_trigrams(self, game: MatchdayGame) -> None:
+        home_grams = trigrams(game.home_norm)
+        away_grams = trigrams(game.away_norm)
+        for gram in home_grams:
+            self.home_postings.setdefault(gram, []).append(game.order)
+        for gram in away_grams:
+            self.away_postings.setdefault(gram, []).append(game.order)
+        self.trigram_sizes.append((len(home_grams), len(away_grams)))
+
+    def _index_country_prefixes(self, league_norm: str) -> None:
+        words = league_norm.split(" ", 1)
+        for end in range(1, len(words[0]) + 1):
+            self.by_country_prefix.setdefault(words[0][:end], []).append(league_norm)
+
+    def leagues_with_prefix(self, prefix: str) -> List[str]:
+        """Normalized league names starting with ``prefix``, in file order."""
+        if not prefix or " " in prefix:
+            return [league for league in self.by_league if league.startswith(prefix)]
+        return self.by_country_prefix.get(prefix, [])
+
+    def games_in_league(self, league: str) -> List[MatchdayGame]:
+        return self.by_league.get(normalize_text(league), [])
+
+    def games_with_teams(self, home_team: str, away_team: str) -> List[MatchdayGame]:
+        return self.by_teams.get((normalize_text(home_team), normalize_text(away_team)), [])
+
+    def games_for_league(
+        self, league: str, country_variations: Iterable[str]
+    ) -> List[Tuple[MatchdayGame, bool]]:
+        """
+        Jogos da liga exata (True) e das ligas do mesmo país (False), na ordem do arquivo.
+        """
+        league_norm = normalize_text(league)
+        direct = self.by_league.get(league_norm, [])
+
+        country_leagues = []
+        for variation in country_variations:
+            for candidate in self.leagues_with_prefix(normalize_text(variation)):
+                if candidate != league_norm and candidate not in country_leagues:
+                    country_leagues.append(candidate)
+
+        games = [(game, True) for game in direct]
+        for candidate in country_leagues:
+            games.extend((game, False) for game in self.by_league[candidate])
+        games.sort(key=lambda item: item[0].order)
+        return games
+
+    def search_teams(
+        self,
+        home_team: str,
+        away_team: str,
+        min_similarity: float = MIN_TEAM_SIMILARITY,
+        limit: int = MAX_SEARCH_RESULTS,
+    ) -> List[Tuple[MatchdayGame, float]]:
+        """
+        Jogos cujos dois times lembram a busca, do mais parecido ao menos parecido.
+
+        Só são pontuados os jogos que compartilham trigramas com os dois nomes.
+        A nota é a média do Dice de mandante e visitante, e cada lado precisa
+        atingir ``min_similarity``.
+        """
+        home_query = trigrams(normalize_text(home_team))
+        away_query = trigrams(normalize_text(away_team))
+        if not home_query or not away_query:
+            return []
+
+        home_shared = self._shared_trigrams(self.home_postings, home_query)
+        away_shared = self._shared_trigrams(self.away_postings, away_query)
+
+        ranked = []
+        for order, home_count in home_shared.items():
+            away_count = away_shared.get(order)
+            if not away_count:
+                continue
+            home_size, away_size = self.trigram_sizes[order]
+            home_score = 2 * home_count / (len(home_query) + home_size)
+            away_score = 2 * away_count / (len(away_query) + away_size)
+            if home_score < min_similarity or away_score < min_similarity:
+                continue
+            ranked.append((self.games[order], (home_score + away_score) / 2))
+
+        ranked.sort(key=lambda item: (-item[1], item[0].order))
+        return ranked[:limit]
+
+    @staticmethod
+    def _shared_trigrams(postings: Dict[str, List[int]], query: FrozenSet[str]) -> Counter:
+        shared = Counter()
+        for gram in query:
+            shared.update(postings.get(gram, ()))
+        return shared
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Durable outbox for routed alerts, in SQLite WAL mode.
+
+Every routed alert is inserted before it is sent and marked sent afterwards.
+Inserts and updates are committed in small batches by a background task, so
+the handler only pays for an uncommitted insert. On startup, unsent rows
+younger than ``max_age`` seconds are replayed. Rows older than ``retention``
+seconds are pruned on startup and then every ``prune_interval`` seconds by
+the same background task.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+COMMIT_INTERVAL = 0.05
+MAX_BATCH = 100
+MAX_REPLAY_AGE = 600.0
+RETENTION = 86400.0
+PRUNE_INTERVAL = 3600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    source_chat_id INTEGER NOT NULL,
+    source_message_id INTEGER,
+    target_chat_id INTEGER NOT NULL,
+    message_thread_id INTEGER,
+    top_msg_id INTEGER,
+    scenario TEXT,
+    text TEXT NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_unsent ON outbox (sent_at, created_at);
+"""
+
+
+class OutboxEntry(NamedTuple):
+    id: int
+    created_at: float
+    source_chat_id: int
+    source_message_id: Optional[int]
+    target_chat_id: int
+    message_thread_id: Optional[int]
+    top_msg_id: Optional[int]
+    scenario: Optional[str]
+    text: str
+
+
+class Outbox:
+    def __init__(
+        self,
+        path: Union[str, Path],
+        commit_interval: float = COMMIT_INTERVAL,
+        max_batch: int = MAX_BATCH,
+        retention: float = RETENTION,
+        prune_interval: float = PRUNE_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = str(path)
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self.clock = clock
+        self.pruned_at = clock()
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+        self.uncommitted = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+
+    @classmethod
+    def from_config(cls, outbox_config: Optional[dict], default_path: str) -> Optional["Outbox"]:
+        outbox_config = outbox_config or {}
+        if not outbox_config.get("enabled", True):
+            return None
+        return cls(
+            outbox_config.get("path", default_path),
+            commit_interval=outbox_config.get("commit_interval", COMMIT_INTERVAL),
+            max_batch=outbox_config.get("max_batch", MAX_BATCH),
+            retention=outbox_config.get("retention", RETENTION),
+            prune_interval=outbox_config.get("prune_interval", PRUNE_INTERVAL),
+        )
+
+    def add(
+        self,
+        source_chat_id: int,
+        source_message_id: Optional[int],
+        target_chat_id: int,
+        text: str,
+        message_thread_id: Optional[int] = None,
+        top_msg_id: Optional[int] = None,
+        scenario: Optional[str] = None,
+    ) -> int:
+        cursor = self.connection.execute(
+            "INSERT INTO outbox (created_at, source_chat_id, source_message_id, target_chat_id, "
+            "message_thread_id, top_msg_id, scenario, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.clock(), source_chat_id, source_message_id, target_chat_id,
+             message_thread_id, top_msg_id, scenario, text),
+        )
+        self._written()
+        return cursor.lastrowid
+
+    def mark_sent(self, entry_id: Optional[int]) -> None:
+        if entry_id is None:
+            return
+        self.connection.execute("UPDATE outbox SET sent_at = ? WHERE id = ?", (self.clock(), entry_id))
+        self._written()
+
+    def pending(self, max_age: float = MAX_REPLAY_AGE) -> List[OutboxEntry]:
+        """Unsent entries created in the last ``max_age`` seconds, oldest first."""
+        rows = self.connection.execute(
+            "SELECT id, created_at, source_chat_id, source_message_id, target_chat_id, "
+            "message_thread_id, top_msg_id, scenario, text FROM outbox "
+            "WHERE sent_at IS NULL AND created_at >= ? ORDER BY id",
+            (self.clock() - max_age,),
+        ).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def prune(self, retention: Optional[float] = None) -> int:
+        if retention is None:
+            retention = self.retention
+        self.pruned_at = self.clock()
+        cursor = self.connection.execute("DELETE FROM outbox WHERE created_at < ?", (self.pruned_at - retention,))
+        self._written()
+        self.commit()
+        return cursor.rowcount
+
+    def commit(self) -> None:
+        if self.uncommitted:
+            self.connection.commit()
+            self.uncommitted = 0
+
+    def start(self) -> None:
+        """Start the background batch committer on the running loop."""
+        if self._flush_task is None:
+            self._flush_requested = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._commit_periodically())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        self.commit()
+        self.connection.close()
+
+    def _written(self) -> None:
+        self.uncommitted += 1
+        if self._flush_task is None:
+            self.commit()
+        elif self.uncommitted >= self.max_batch:
+            self._flush_requested.set()
+
+    async def _commit_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.commit_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                if self.clock() - self.pruned_at >= self.prune_interval:
+                    self.prune()
+                self.commit()
+            except sqlite3.Error as error:
+                logger.error(f"❌ Erro ao gravar outbox: {error}")
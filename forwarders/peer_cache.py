@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Resolved InputPeer objects per (client, chat), so MTProto sends skip resolve_peer.
+"""
+
+from collections import Counter
+import logging
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_peer_invalid_error(error: BaseException) -> bool:
+    """True for errors meaning a cached InputPeer can no longer be used."""
+    try:
+        from pyrogram.errors import ChannelInvalid, PeerIdInvalid
+    except ImportError:
+        return False
+    return isinstance(error, (PeerIdInvalid, ChannelInvalid))
+
+
+class PeerCache:
+    def __init__(self, metrics: Optional[Counter] = None):
+        self.metrics = metrics if metrics is not None else Counter()
+        self._peers: Dict[Tuple[Hashable, int], object] = {}
+
+    def __len__(self) -> int:
+        return len(self._peers)
+
+    @staticmethod
+    def _key(client, chat_id: int) -> Tuple[Hashable, int]:
+        return getattr(client, "name", None) or id(client), chat_id
+
+    async def resolve(self, client, chat_id: int):
+        key = self._key(client, chat_id)
+        peer = self._peers.get(key)
+        if peer is not None:
+            self.metrics["peers_em_cache"] += 1
+            return peer
+
+        self.metrics["peers_resolvidos"] += 1
+        peer = await client.resolve_peer(chat_id)
+        self._peers[key] = peer
+        return peer
+
+    def invalidate(self, client, chat_id: int) -> None:
+        if self._peers.pop(self._key(client, chat_id), None) is not None:
+            self.metrics["peers_invalidados"] += 1
+            logger.warning("⚠️  Peer %s removido do cache (%s)", chat_id, self._key(client, chat_id)[0])
+
+    async def warm(self, clients: Iterable, chat_ids: Iterable[int]) -> int:
+        """Resolve every chat on every client, skipping the ones a client cannot see."""
+        chat_ids = list(dict.fromkeys(chat_ids))
+        resolved = 0
+        for client in clients:
+            for chat_id in chat_ids:
+                try:
+                    await self.resolve(client, chat_id)
+                    resolved += 1
+                except Exception as error:
+                    logger.debug("Peer %s indisponível para %s: %s", chat_id, self._key(client, chat_id)[0], error)
+        return resolved
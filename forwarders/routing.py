@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Routing plan for the scenario forwarder, compiled once from the config.
+"""
+
+from dataclasses import dataclass
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analysis.scenario_classifier import SCENARIO_NAMES, StrategyFilter, compile_strategy_filter
+
+
+@dataclass(frozen=True, slots=True)
+class TopicRef:
+    message_thread_id: int
+    top_msg_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class RouteTarget:
+    forum_chat_id: int
+    strategy_filter: StrategyFilter
+    topic_table: Tuple[Optional[TopicRef], ...]
+
+    def topic_for(self, scenario_id: int) -> Optional[TopicRef]:
+        return self.topic_table[scenario_id]
+
+
+RoutingPlan = Dict[int, Tuple[RouteTarget, ...]]
+
+
+def resolve_topic_reference(scenario_topics: dict, scenario: str) -> Optional[TopicRef]:
+    configured_value = scenario_topics.get(scenario)
+    scenario_lower = scenario.lower()
+    if not configured_value:
+        for configured_scenario, topic_value in scenario_topics.items():
+            if configured_scenario.lower() == scenario_lower and topic_value:
+                configured_value = topic_value
+                break
+
+    if not configured_value:
+        return None
+
+    if isinstance(configured_value, dict):
+        message_thread_id = configured_value.get("message_thread_id") or configured_value.get("id")
+        top_msg_id = configured_value.get("top_msg_id") or configured_value.get("top_message") or message_thread_id
+        if not message_thread_id or not top_msg_id:
+            return None
+        return TopicRef(int(message_thread_id), int(top_msg_id))
+
+    topic_id = int(configured_value)
+    return TopicRef(topic_id, topic_id)
+
+
+def build_topic_table(scenario_topics: dict) -> Tuple[Optional[TopicRef], ...]:
+    """Topic references resolved once, indexed by scenario id."""
+    return tuple(
+        resolve_topic_reference(scenario_topics, scenario)
+        for scenario in SCENARIO_NAMES
+    )
+
+
+def build_route_target(forwarder: dict) -> RouteTarget:
+    return RouteTarget(
+        forum_chat_id=forwarder["forum_chat_id"],
+        strategy_filter=compile_strategy_filter(forwarder.get("strategy_filters")),
+        topic_table=build_topic_table(forwarder.get("scenario_topics") or {}),
+    )
+
+
+def build_routing_plan(forwarders: Iterable[dict]) -> RoutingPlan:
+    """Map each source_chat_id to its targets, in config order."""
+    routes: Dict[int, list] = {}
+    for forwarder in forwarders:
+        routes.setdefault(forwarder["source_chat_id"], []).append(build_route_target(forwarder))
+    return {source_chat_id: tuple(targets) for source_chat_id, targets in routes.items()}
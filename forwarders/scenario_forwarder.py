@@ -4,26 +4,47 @@ Scenario-based Telegram message forwarder.
 """
 
 import asyncio
+from collections import Counter
 import json
 import logging
 import os
 import secrets
 import sys
+import time
 from pathlib import Path
 
-import requests
 from pyrogram import Client, filters, raw
+from pyrogram.errors import RandomIdDuplicate
 from pyrogram.types import Message
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from analysis.scenario_classifier import (
-    SCENARIO_NAMES,
-    parse_and_classify,
-    should_forward_strategy,
+from analysis.incremental_parser import IncrementalAlertParser
+from analysis.scenario_classifier import is_cornerpro_alert
+from forwarders.bot_api import BotApiClient
+from forwarders.circuit_breaker import OPEN as CIRCUIT_OPEN, SendPathBreakers
+from forwarders.config_reload import (
+    RELOAD_POLL_INTERVAL,
+    SCENARIO_PID_FILE,
+    ConfigWatcher,
+    remove_pid_file,
+    write_pid_file,
 )
+from forwarders.dedup import AlertDeduplicator
+from forwarders.delivery import DeliveryJob, DeliveryQueue, retry_after_from_error
+from forwarders.hedging import (
+    HEDGE_PERCENTILE,
+    MIN_HEDGE_DELAY,
+    LatencyTracker,
+    derive_batch_random_id,
+    race_with_hedge,
+)
+from forwarders.outbox import MAX_REPLAY_AGE, Outbox
+from forwarders.peer_cache import PeerCache, is_peer_invalid_error
+from forwarders.routing import TopicRef, build_routing_plan, build_topic_table
+from forwarders.startup import StartupTimer, peers_in_storage
 
 
 logging.basicConfig(
@@ -32,10 +53,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+METRICS_LOG_INTERVAL = 300
+
 
 class ScenarioMessageForwarder:
     def __init__(self, config_path="client_config.json"):
+        self.config_path = config_path
         self.config = self.load_config(config_path)
+        self.routing_plan = build_routing_plan(self.config["scenario_forwarders"])
+        self.source_chats = filters.chat(list(self.routing_plan))
+        self.metrics = Counter()
+        self.alert_parser = IncrementalAlertParser()
+        self.peer_cache = PeerCache(self.metrics)
+        self.bot_api = (
+            BotApiClient.from_config(self.config["bot_token"], self.config.get("bot_api"))
+            if self.config.get("bot_token")
+            else None
+        )
+        self.deduplicator = AlertDeduplicator.from_config(self.config.get("dedup"))
+        self.outbox = Outbox.from_config(self.config.get("outbox"), "scenario_outbox.sqlite3")
+        self.delivery = DeliveryQueue.from_config(self.deliver_job, self.config.get("delivery"), self.metrics)
 
         if self.config.get("bot_token") and self.config.get("phone_number"):
             logger.info("🔄 Modo HÍBRIDO ativado: Usuário lê + Bot envia")
@@ -75,6 +112,13 @@ class ScenarioMessageForwarder:
             self.send_app = self.app
             self.hybrid_mode = False
 
+        self.send_paths = SendPathBreakers.from_config(
+            self.get_send_path_labels(),
+            self.config.get("circuit_breaker"),
+            self.metrics,
+        )
+        self.hedging_config = self.config.get("hedging") or {}
+        self.send_latencies = LatencyTracker()
         self.register_handlers()
 
     def load_config(self, config_path):
@@ -89,6 +133,13 @@ class ScenarioMessageForwarder:
                 config["bot_token"] = os.getenv("BOT_TOKEN")
             if os.getenv("PHONE_NUMBER"):
                 config["phone_number"] = os.getenv("PHONE_NUMBER")
+            if os.getenv("DELIVERY_MESSAGES_PER_MINUTE"):
+                config["delivery"] = {
+                    "messages_per_minute": float(os.getenv("DELIVERY_MESSAGES_PER_MINUTE")),
+                    "burst": float(os.getenv("DELIVERY_BURST", "5")),
+                }
+            if os.getenv("DELIVERY_COALESCE_WINDOW"):
+                config.setdefault("delivery", {})["coalesce_window"] = float(os.getenv("DELIVERY_COALESCE_WINDOW"))
 
             if os.getenv("SCENARIO_SOURCE_CHAT_ID") and os.getenv("SCENARIO_FORUM_CHAT_ID"):
                 config["scenario_forwarders"] = [{
@@ -133,17 +184,13 @@ class ScenarioMessageForwarder:
             })
             forwarder.setdefault("scenario_topics", {})
 
-            missing_topics = [
-                scenario
-                for scenario in SCENARIO_NAMES
-                if not self._get_topic_reference(forwarder["scenario_topics"], scenario)
-            ]
+            missing_topics = build_topic_table(forwarder["scenario_topics"]).count(None)
             if missing_topics:
                 logger.warning(
                     "⚠️  Forwarder %s tem %s tópico(s) ausente(s). "
                     "Mensagens nesses cenários serão ignoradas.",
                     index,
-                    len(missing_topics),
+                    missing_topics,
                 )
 
             logger.info(
@@ -156,39 +203,78 @@ class ScenarioMessageForwarder:
         return config
 
     def register_handlers(self):
-        source_chat_ids = list({
-            forwarder["source_chat_id"]
-            for forwarder in self.config["scenario_forwarders"]
-        })
-
-        @self.app.on_message(filters.chat(source_chat_ids))
+        @self.app.on_message(self.source_chats)
         async def handle_source_message(client: Client, message: Message):
             await self.process_message(client, message)
 
-    def get_forwarder_configs(self, source_chat_id):
-        return [
-            forwarder
-            for forwarder in self.config["scenario_forwarders"]
-            if forwarder["source_chat_id"] == source_chat_id
+        @self.app.on_edited_message(self.source_chats)
+        async def handle_edited_source_message(client: Client, message: Message):
+            await self.process_edited_message(client, message)
+
+    def reload_config(self):
+        """Re-validate the config file and swap in a new routing plan; clients stay connected."""
+        try:
+            new_config = self.load_config(self.config_path)
+            new_plan = build_routing_plan(new_config["scenario_forwarders"])
+        except Exception as error:
+            self.metrics["recargas_falhas"] += 1
+            logger.error(f"❌ Recarga da configuração ignorada: {error}")
+            return False
+
+        restart_fields = [
+            field
+            for field in ("api_id", "api_hash", "bot_token", "phone_number")
+            if new_config.get(field) != self.config.get(field)
         ]
+        if restart_fields:
+            logger.warning(f"⚠️  Alterações em {', '.join(restart_fields)} só valem após reiniciar")
+
+        # Jobs already queued carry their resolved topic, so swapping the plan
+        # only affects messages that arrive after this point.
+        self.config = new_config
+        self.routing_plan = new_plan
+        new_sources = set(new_plan)
+        self.source_chats.update(new_sources)
+        self.source_chats.intersection_update(new_sources)
+
+        self.metrics["recargas"] += 1
+        logger.info(
+            f"🔄 Configuração recarregada: {len(new_config['scenario_forwarders'])} scenario forwarder(s), "
+            f"{len(new_sources)} fonte(s)"
+        )
+        return True
 
     async def process_message(self, client: Client, message: Message):
         source_chat_id = message.chat.id
         message_text = message.text or message.caption
 
         if not message_text:
+            self.metrics["ignoradas_sem_texto"] += 1
             logger.info(f"🚫 [{source_chat_id}] Mensagem sem texto ignorada")
             return
 
-        parsed = parse_and_classify(message_text)
+        if not is_cornerpro_alert(message_text):
+            self.metrics["ignoradas_nao_alerta"] += 1
+            logger.debug(f"🚫 [{source_chat_id}] Mensagem não é um alerta CornerPro")
+            return
+
+        parsed = self.alert_parser.parse(source_chat_id, message.id, message_text)
         if not parsed:
+            self.metrics["ignoradas_nao_parseaveis"] += 1
             logger.info(f"🚫 [{source_chat_id}] Mensagem não bate com o padrão de alerta")
             return
 
-        alert, scenario_result = parsed
-        forwarder_configs = self.get_forwarder_configs(source_chat_id)
+        self.metrics["alertas_classificados"] += 1
 
-        if not forwarder_configs:
+        alert, scenario_result = parsed.alert, parsed.scenario_result
+        if self.deduplicator is not None and self.deduplicator.is_duplicate(source_chat_id, alert):
+            self.metrics["duplicadas_ignoradas"] += 1
+            logger.info(f"♻️  [{source_chat_id}] Alerta repetido ignorado: {alert.strategy} {alert.match_url}")
+            return
+
+        targets = self.routing_plan.get(source_chat_id)
+
+        if not targets:
             logger.warning(f"⚠️  Nenhuma configuração encontrada para source_chat_id: {source_chat_id}")
             return
 
@@ -200,108 +286,221 @@ class ScenarioMessageForwarder:
             scenario_result.general_scenario,
         )
 
-        for forwarder_config in forwarder_configs:
-            forum_chat_id = forwarder_config["forum_chat_id"]
+        for target in targets:
+            forum_chat_id = target.forum_chat_id
 
-            try:
-                if not should_forward_strategy(alert.strategy, forwarder_config.get("strategy_filters", {})):
-                    logger.info(
-                        "🚫 [%s→%s] Estratégia '%s' bloqueada pelos filtros",
-                        source_chat_id,
-                        forum_chat_id,
-                        alert.strategy,
-                    )
-                    continue
-
-                topic_ref = self._get_topic_reference(
-                    forwarder_config.get("scenario_topics", {}),
-                    scenario_result.scenario,
+            if not target.strategy_filter.allows(alert.strategy):
+                logger.info(
+                    "🚫 [%s→%s] Estratégia '%s' bloqueada pelos filtros",
+                    source_chat_id,
+                    forum_chat_id,
+                    alert.strategy,
                 )
-                if not topic_ref:
-                    logger.warning(
-                        "⚠️  [%s→%s] Tópico não configurado para cenário '%s'",
-                        source_chat_id,
-                        forum_chat_id,
-                        scenario_result.scenario,
-                    )
-                    continue
+                continue
 
-                sender_label = await self.send_text_to_topic(
-                    chat_id=forum_chat_id,
-                    topic_ref=topic_ref,
-                    text=message_text,
-                )
-                logger.info(
-                    "✅ [%s→%s/%s] Mensagem enviada para '%s' via %s",
+            topic_ref = target.topic_for(scenario_result.scenario_id)
+            if not topic_ref:
+                logger.warning(
+                    "⚠️  [%s→%s] Tópico não configurado para cenário '%s'",
                     source_chat_id,
                     forum_chat_id,
-                    topic_ref["message_thread_id"],
                     scenario_result.scenario,
-                    sender_label,
                 )
-            except Exception as error:
-                logger.error(
-                    "❌ [%s→%s] Erro ao enviar mensagem: %s",
+                continue
+
+            outbox_id = None
+            if self.outbox is not None:
+                outbox_id = self.outbox.add(
                     source_chat_id,
+                    message.id,
                     forum_chat_id,
-                    error,
+                    message_text,
+                    message_thread_id=topic_ref.message_thread_id,
+                    top_msg_id=topic_ref.top_msg_id,
+                    scenario=scenario_result.scenario,
                 )
 
-    async def send_text_to_topic(self, chat_id, topic_ref, text):
-        if self.config.get("bot_token"):
+            self.delivery.submit(DeliveryJob(
+                source_chat_id=source_chat_id,
+                forum_chat_id=forum_chat_id,
+                topic_ref=topic_ref,
+                text=message_text,
+                scenario=scenario_result.scenario,
+                source_message_id=message.id,
+                outbox_id=outbox_id,
+            ))
+
+    async def deliver_job(self, job: DeliveryJob):
+        random_id = None
+        if all(part.source_message_id is not None for part in job.parts):
+            random_id = derive_batch_random_id(
+                [(part.source_chat_id, part.source_message_id) for part in job.parts],
+                job.forum_chat_id,
+                job.topic_ref.top_msg_id,
+            )
+        sender_label = await self.send_text_to_topic(
+            chat_id=job.forum_chat_id,
+            topic_ref=job.topic_ref,
+            text=job.text,
+            random_id=random_id,
+        )
+        if self.outbox is not None:
+            for part in job.parts:
+                self.outbox.mark_sent(part.outbox_id)
+        logger.info(
+            "✅ [%s→%s/%s] Mensagem enviada para '%s' via %s (%s alerta(s), %.1fs na fila)",
+            job.source_chat_id,
+            job.forum_chat_id,
+            job.topic_ref.message_thread_id,
+            job.scenario,
+            sender_label,
+            len(job.parts),
+            time.monotonic() - job.enqueued_at,
+        )
+
+    async def process_edited_message(self, client: Client, message: Message):
+        source_chat_id = message.chat.id
+        message_text = message.text or message.caption
+
+        if not message_text or not is_cornerpro_alert(message_text):
+            return
+
+        parsed = self.alert_parser.parse(source_chat_id, message.id, message_text)
+        if not parsed:
+            return
+
+        if parsed.from_cache:
+            self.metrics["edicoes_reaproveitadas"] += 1
+        else:
+            self.metrics["edicoes_reprocessadas"] += 1
+
+        if not parsed.outcome_changed or parsed.goal_outcome is None:
+            return
+
+        outcome_label = "green" if parsed.goal_outcome else "red"
+        self.metrics[f"resultados_{outcome_label}"] += 1
+        logger.info(
+            "%s [%s] Resultado '%s' para '%s' (%s)",
+            "🟢" if parsed.goal_outcome else "🔴",
+            source_chat_id,
+            outcome_label.upper(),
+            parsed.scenario_result.scenario,
+            parsed.alert.strategy,
+        )
+
+    async def send_text_to_topic(self, chat_id, topic_ref, text, random_id=None):
+        paths = self.send_paths.order(chat_id)
+        hedge_path = self.get_hedge_path(chat_id, paths)
+        attempted = set()
+        last_error = None
+
+        async def attempt(path):
+            attempted.add(path)
+            await self.attempt_send_path(path, chat_id, topic_ref, text, random_id)
+
+        for path in paths:
+            if path in attempted:
+                continue
             try:
-                await self.send_text_to_topic_with_bot_api(
-                    chat_id,
-                    topic_ref["message_thread_id"],
-                    text,
-                )
-                return "bot api"
-            except Exception as bot_api_error:
+                if hedge_path and path == paths[0]:
+                    outcome = await race_with_hedge(
+                        path,
+                        lambda: attempt(path),
+                        hedge_path,
+                        lambda: attempt(hedge_path),
+                        self.get_hedge_delay(path),
+                    )
+                    if outcome.hedged:
+                        self.metrics[f"hedge_vencedor_{outcome.winner.replace(' ', '_')}"] += 1
+                    return outcome.winner
+
+                await attempt(path)
+                return path
+            except Exception as send_error:
+                if retry_after_from_error(send_error) is not None:
+                    raise
+                last_error = send_error
+
+        raise last_error
+
+    async def attempt_send_path(self, path, chat_id, topic_ref, text, random_id=None):
+        started = time.monotonic()
+        try:
+            await self.send_text_via_path(path, chat_id, topic_ref, text, random_id)
+        except Exception as send_error:
+            if retry_after_from_error(send_error) is None:
+                self.send_paths.record_failure(chat_id, path)
                 logger.warning(
-                    "⚠️  Bot API falhou ao enviar para %s/%s (%s).",
+                    "⚠️  Envio via %s falhou para %s/%s (%s).",
+                    path,
                     chat_id,
-                    topic_ref["message_thread_id"],
-                    bot_api_error,
+                    topic_ref.message_thread_id,
+                    send_error,
                 )
+            raise
+
+        latency = time.monotonic() - started
+        self.send_paths.record_success(chat_id, path, latency)
+        self.send_latencies.record(path, latency)
+
+    def get_hedge_path(self, chat_id, paths):
+        """MTProto path to race against a slow Bot API send, when hedging is enabled."""
+        if not self.hedging_config.get("enabled") or not paths or paths[0] != "bot api":
+            return None
+        for path in paths[1:]:
+            if self.send_paths.breaker(chat_id, path).state != CIRCUIT_OPEN:
+                return path
+        return None
+
+    def get_hedge_delay(self, path):
+        delay = self.send_latencies.percentile(path, self.hedging_config.get("percentile", HEDGE_PERCENTILE))
+        if delay is None:
+            return None
+        return max(delay, self.hedging_config.get("min_delay", MIN_HEDGE_DELAY))
+
+    def get_send_path_labels(self):
+        paths = []
+        if self.config.get("bot_token"):
+            paths.append("bot api")
+        paths.append("bot" if self.hybrid_mode else "cliente")
+        if self.hybrid_mode:
+            paths.append("usuário")
+        return paths
+
+    async def send_text_via_path(self, path, chat_id, topic_ref, text, random_id=None):
+        if path == "bot api":
+            await self.send_text_to_topic_with_bot_api(chat_id, topic_ref.message_thread_id, text)
+        else:
+            sender_app = self.user_app if path == "usuário" else self.send_app
+            await self.send_text_to_topic_with_client(sender_app, chat_id, topic_ref.top_msg_id, text, random_id)
+
+    async def probe_send_path(self, path, chat_id):
+        if path == "bot api":
+            await self.call_bot_api("getChat", {"chat_id": chat_id})
+        else:
+            sender_app = self.user_app if path == "usuário" else self.send_app
+            await sender_app.get_chat(chat_id)
+
+    async def send_text_to_topic_with_client(self, sender_app, chat_id, top_msg_id, text, random_id=None):
+        peer = await self.peer_cache.resolve(sender_app, chat_id)
+        if random_id is None:
+            random_id = sender_app.rnd_id() if hasattr(sender_app, "rnd_id") else secrets.randbits(63)
 
         try:
-            await self.send_text_to_topic_with_client(
-                self.send_app,
-                chat_id,
-                topic_ref["top_msg_id"],
-                text,
-            )
-            return "bot" if self.hybrid_mode else "cliente"
-        except Exception as send_error:
-            if not self.hybrid_mode:
-                raise send_error
-
-            logger.warning(
-                "⚠️  Envio pelo bot falhou para %s/%s (%s). Tentando pelo usuário.",
-                chat_id,
-                topic_ref["top_msg_id"],
-                send_error,
-            )
-            await self.send_text_to_topic_with_client(
-                self.user_app,
-                chat_id,
-                topic_ref["top_msg_id"],
-                text,
-            )
-            return "usuário"
-
-    async def send_text_to_topic_with_client(self, sender_app, chat_id, top_msg_id, text):
-        peer = await sender_app.resolve_peer(chat_id)
-        random_id = sender_app.rnd_id() if hasattr(sender_app, "rnd_id") else secrets.randbits(63)
-
-        await sender_app.invoke(
-            raw.functions.messages.SendMessage(
-                peer=peer,
-                message=text,
-                random_id=random_id,
-                top_msg_id=int(top_msg_id),
+            await sender_app.invoke(
+                raw.functions.messages.SendMessage(
+                    peer=peer,
+                    message=text,
+                    random_id=random_id,
+                    top_msg_id=int(top_msg_id),
+                )
             )
-        )
+        except RandomIdDuplicate:
+            logger.info("♻️  Mensagem já entregue em %s/%s (random_id repetido)", chat_id, top_msg_id)
+        except Exception as error:
+            if is_peer_invalid_error(error):
+                self.peer_cache.invalidate(sender_app, chat_id)
+            raise
 
     async def send_text_to_topic_with_bot_api(self, chat_id, top_msg_id, text):
         await self.call_bot_api("sendMessage", {
@@ -311,34 +510,111 @@ class ScenarioMessageForwarder:
         })
 
     async def call_bot_api(self, method, payload):
-        token = self.config.get("bot_token")
-        if not token:
+        if self.bot_api is None:
             raise ValueError("bot_token não configurado")
-
-        url = f"https://api.telegram.org/bot{token}/{method}"
-        response_data = await asyncio.to_thread(self._post_bot_api, url, payload)
-        if not response_data.get("ok"):
-            description = response_data.get("description", "erro desconhecido")
-            raise RuntimeError(description)
-        return response_data.get("result", {})
+        return await self.bot_api.call(method, payload)
 
     async def start(self):
         logger.info("🚀 Iniciando Scenario Forwarder...")
+        self._metrics_task = asyncio.create_task(self._log_metrics_periodically())
+        self._probe_task = asyncio.create_task(self.send_paths.run_probes(self.probe_send_path))
+        self._start_config_watcher()
 
-        if self.hybrid_mode:
-            async with self.user_app, self.bot_app:
-                await self._log_accounts()
-                await self._warm_dialog_cache()
-                await self._verify_forwarders()
-                logger.info("👂 Aguardando alertas dos grupos source... (Ctrl+C para parar)")
-                await asyncio.Event().wait()
+        timer = StartupTimer()
+        try:
+            if self.hybrid_mode:
+                async with self.user_app, self.bot_app:
+                    await self._run_connected(timer)
+            else:
+                async with self.app:
+                    await self._run_connected(timer)
+        finally:
+            remove_pid_file(self.config.get("pid_file", SCENARIO_PID_FILE))
+            await self.delivery.close()
+            if self.deduplicator is not None:
+                self.deduplicator.save()
+            if self.outbox is not None:
+                await self.outbox.close()
+            if self.bot_api is not None:
+                await self.bot_api.aclose()
+
+    async def _run_connected(self, timer):
+        timer.mark("conexão")
+        self._replay_outbox()
+
+        if self.config.get("background_startup", True):
+            logger.info("👂 Aguardando alertas dos grupos source... (Ctrl+C para parar)")
+            self._startup_task = asyncio.create_task(self._run_startup_checks(timer))
         else:
-            async with self.app:
+            await self._run_startup_checks(timer)
+            logger.info("👂 Aguardando alertas dos grupos source... (Ctrl+C para parar)")
+
+        await asyncio.Event().wait()
+
+    async def _run_startup_checks(self, timer):
+        async def log_accounts():
+            async with timer.phase("contas"):
                 await self._log_accounts()
+
+        async def warm_and_verify():
+            async with timer.phase("cache de diálogos"):
                 await self._warm_dialog_cache()
+            async with timer.phase("verificação dos forwarders"):
                 await self._verify_forwarders()
-                logger.info("👂 Aguardando alertas dos grupos source... (Ctrl+C para parar)")
-                await asyncio.Event().wait()
+
+        results = await asyncio.gather(log_accounts(), warm_and_verify(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Erro na inicialização: {result}")
+        logger.info(f"🏁 Inicialização concluída em {timer.elapsed():.2f}s")
+
+    def _replay_outbox(self):
+        """Re-enqueue alerts routed before the last shutdown that were never sent."""
+        if self.outbox is None:
+            return
+
+        self.outbox.prune()
+        self.outbox.start()
+        max_age = (self.config.get("outbox") or {}).get("max_replay_age", MAX_REPLAY_AGE)
+        entries = self.outbox.pending(max_age)
+        for entry in entries:
+            self.delivery.submit(DeliveryJob(
+                source_chat_id=entry.source_chat_id,
+                forum_chat_id=entry.target_chat_id,
+                topic_ref=TopicRef(entry.message_thread_id, entry.top_msg_id),
+                text=entry.text,
+                scenario=entry.scenario,
+                source_message_id=entry.source_message_id,
+                outbox_id=entry.id,
+            ))
+        if entries:
+            self.metrics["reenviadas_do_outbox"] += len(entries)
+            logger.info(f"📦 {len(entries)} alerta(s) pendente(s) do outbox reenfileirado(s)")
+
+    def _start_config_watcher(self):
+        if os.getenv("API_ID") or not Path(self.config_path).exists():
+            return
+
+        watcher = ConfigWatcher(
+            self.config_path,
+            self.reload_config,
+            self.config.get("config_reload_interval", RELOAD_POLL_INTERVAL),
+        )
+        if watcher.install_signal_handler():
+            write_pid_file(self.config.get("pid_file", SCENARIO_PID_FILE))
+        self._config_watcher_task = asyncio.create_task(watcher.run())
+        logger.info(f"👀 Monitorando {self.config_path} para recarga automática")
+
+    def get_metrics(self):
+        return dict(self.metrics)
+
+    async def _log_metrics_periodically(self):
+        interval = self.config.get("metrics_log_interval", METRICS_LOG_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            if self.metrics:
+                summary = ", ".join(f"{key}={value}" for key, value in sorted(self.metrics.items()))
+                logger.info(f"📊 Métricas: {summary}")
 
     async def _log_accounts(self):
         if self.hybrid_mode:
@@ -351,6 +627,15 @@ class ScenarioMessageForwarder:
             logger.info(f"👤 Logado como: {account.first_name} (@{account.username or 'sem_username'})")
 
     async def _warm_dialog_cache(self):
+        chat_ids = [
+            chat_id
+            for forwarder in self.config["scenario_forwarders"]
+            for chat_id in (forwarder["source_chat_id"], forwarder["forum_chat_id"])
+        ]
+        if await peers_in_storage(self.app, chat_ids):
+            logger.info("✅ Todos os chats configurados já estão na sessão; diálogos não recarregados")
+            return
+
         dialog_count = 0
         async for _dialog in self.app.get_dialogs(limit=100):
             dialog_count += 1
@@ -376,6 +661,15 @@ class ScenarioMessageForwarder:
             except Exception as error:
                 logger.error(f"❌ Fórum {index} inválido ({forum_chat_id}): {error}")
 
+        clients = (self.user_app, self.bot_app) if self.hybrid_mode else (self.app,)
+        chat_ids = [
+            chat_id
+            for forwarder in self.config["scenario_forwarders"]
+            for chat_id in (forwarder["forum_chat_id"], forwarder["source_chat_id"])
+        ]
+        resolved = await self.peer_cache.warm(clients, chat_ids)
+        logger.info(f"✅ Cache de peers carregado com {resolved} peer(s)")
+
     async def get_forum_access_label(self, chat_id):
         try:
             chat = await self.send_app.get_chat(chat_id)
@@ -393,42 +687,6 @@ class ScenarioMessageForwarder:
 
             raise send_error
 
-    @staticmethod
-    def _get_topic_reference(scenario_topics, scenario):
-        configured_value = scenario_topics.get(scenario)
-        scenario_lower = scenario.lower()
-        if not configured_value:
-            for configured_scenario, topic_value in scenario_topics.items():
-                if configured_scenario.lower() == scenario_lower and topic_value:
-                    configured_value = topic_value
-                    break
-
-        if not configured_value:
-            return None
-
-        if isinstance(configured_value, dict):
-            message_thread_id = configured_value.get("message_thread_id") or configured_value.get("id")
-            top_msg_id = configured_value.get("top_msg_id") or configured_value.get("top_message") or message_thread_id
-            if not message_thread_id or not top_msg_id:
-                return None
-            return {
-                "message_thread_id": int(message_thread_id),
-                "top_msg_id": int(top_msg_id),
-            }
-
-        topic_id = int(configured_value)
-        return {
-            "message_thread_id": topic_id,
-            "top_msg_id": topic_id,
-        }
-
-    @staticmethod
-    def _get_topic_id(scenario_topics, scenario):
-        topic_ref = ScenarioMessageForwarder._get_topic_reference(scenario_topics, scenario)
-        if not topic_ref:
-            return None
-        return topic_ref["message_thread_id"]
-
     @staticmethod
     def _load_scenario_topics_from_env():
         raw_topics = os.getenv("SCENARIO_TOPICS_JSON")
@@ -440,12 +698,6 @@ class ScenarioMessageForwarder:
             logger.error("❌ SCENARIO_TOPICS_JSON não é um JSON válido")
             return {}
 
-    @staticmethod
-    def _post_bot_api(url, payload):
-        response = requests.post(url, json=payload, timeout=30)
-        response.raise_for_status()
-        return response.json()
-
 
 async def main():
     try:
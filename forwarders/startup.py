@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Startup helpers shared by the forwarders: timed phases and a check for
+whether the session storage already knows every configured peer.
+"""
+
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Dict, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.phases: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.phases[name] = elapsed
+            logger.info(f"⏱️  {name}: {elapsed:.2f}s")
+
+    def mark(self, name: str) -> float:
+        """Log and record the time since startup began under ``name``."""
+        elapsed = self.elapsed()
+        self.phases[name] = elapsed
+        logger.info(f"⏱️  {name}: {elapsed:.2f}s")
+        return elapsed
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+async def peers_in_storage(client, chat_ids: Iterable[int]) -> bool:
+    """True when the client's session storage already has every peer, so no dialog crawl is needed."""
+    storage = getattr(client, "storage", None)
+    if storage is None:
+        return False
+
+    for chat_id in chat_ids:
+        try:
+            await storage.get_peer_by_id(chat_id)
+        except KeyError:
+            return False
+        except Exception as error:
+            logger.debug(f"Não foi possível consultar o peer {chat_id} no storage: {error}")
+            return False
+    return True
@@ -30,6 +30,13 @@ sudo apt update && sudo apt upgrade -y
 # 2. Instalar dependências
 echo "🐍 2. Instalando Python e ferramentas..."
 sudo apt install -y python3 python3-pip python3-venv git curl wget
+# Python 3.10+ é obrigatório; no Ubuntu 20.04 ele vem do PPA deadsnakes
+if ! sudo apt install -y python3.10 python3.10-venv; then
+    sudo apt install -y software-properties-common
+    sudo add-apt-repository -y ppa:deadsnakes/ppa
+    sudo apt update
+    sudo apt install -y python3.10 python3.10-venv
+fi
 
 # 3. Baixar projeto
 echo "📁 3. Baixando projeto do GitHub..."
@@ -44,7 +51,7 @@ fi
 
 # 4. Criar ambiente virtual
 echo "🐍 4. Criando ambiente virtual Python..."
-python3 -m venv venv
+python3.10 -m venv venv
 source venv/bin/activate
 
 # 5. Instalar dependências Python
@@ -26,6 +26,13 @@ sudo apt update -y
 # 2. Instalar dependências básicas
 print_color "🛠️  Instalando dependências..." "$YELLOW"
 sudo apt install -y python3 python3-pip python3-venv git curl wget screen
+# Python 3.10+ é obrigatório; no Ubuntu 20.04 ele vem do PPA deadsnakes
+if ! sudo apt install -y python3.10 python3.10-venv; then
+    sudo apt install -y software-properties-common
+    sudo add-apt-repository -y ppa:deadsnakes/ppa
+    sudo apt update
+    sudo apt install -y python3.10 python3.10-venv
+fi
 
 # 3. Clonar repositório
 print_color "📁 Baixando projeto..." "$YELLOW"
@@ -40,7 +47,7 @@ fi
 
 # 4. Configurar ambiente Python
 print_color "🐍 Configurando ambiente Python..." "$YELLOW"
-python3 -m venv venv
+python3.10 -m venv venv
 source venv/bin/activate
 pip install -r requirements.txt
 
@@ -8,6 +8,11 @@ if ! command -v python3 &> /dev/null; then
     sudo apt update && sudo apt install -y python3 python3-pip
 fi
 
+if ! python3 -c 'import sys; sys.exit(sys.version_info < (3, 10))'; then
+    echo "❌ Python 3.10+ é necessário (encontrado: $(python3 --version 2>&1))."
+    exit 1
+fi
+
 # Verifica se pip está instalado
 if ! command -v pip3 &> /dev/null; then
     echo "❌ pip3 não encontrado. Instalando..."
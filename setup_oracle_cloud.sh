@@ -11,6 +11,13 @@ sudo apt update && sudo apt upgrade -y
 # Instalar dependências
 echo "🐍 Instalando Python e dependências..."
 sudo apt install -y python3 python3-pip python3-venv git curl
+# Python 3.10+ é obrigatório; no Ubuntu 20.04 ele vem do PPA deadsnakes
+if ! sudo apt install -y python3.10 python3.10-venv; then
+    sudo apt install -y software-properties-common
+    sudo add-apt-repository -y ppa:deadsnakes/ppa
+    sudo apt update
+    sudo apt install -y python3.10 python3.10-venv
+fi
 
 # Clonar repositório
 echo "📥 Clonando repositório..."
@@ -20,7 +27,7 @@ cd message-forwarder
 
 # Configurar ambiente virtual
 echo "🔧 Configurando ambiente virtual..."
-python3 -m venv venv
+python3.10 -m venv venv
 source venv/bin/activate
 pip install -r requirements.txt
 
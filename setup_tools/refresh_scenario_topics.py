@@ -15,6 +15,7 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from analysis.scenario_classifier import SCENARIO_NAMES
+from forwarders.config_reload import SCENARIO_PID_FILE, send_reload_signal
 
 
 CONFIG_PATH = Path("client_config.json")
@@ -52,6 +53,9 @@ async def refresh_scenario_topics():
 
     print("✅ client_config.json atualizado")
 
+    if send_reload_signal(config.get("pid_file", SCENARIO_PID_FILE)):
+        print("🔄 Scenario Forwarder em execução notificado para recarregar a configuração")
+
 
 async def fetch_scenario_topics(app, input_channel):
     result = await app.invoke(
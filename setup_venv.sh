@@ -12,6 +12,12 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
+if ! python3 -c 'import sys; sys.exit(sys.version_info < (3, 10))'; then
+    echo "❌ Python 3.10+ é necessário (encontrado: $(python3 --version 2>&1))."
+    echo "   Instale o python3.10 e crie o ambiente com: python3.10 -m venv venv"
+    exit 1
+fi
+
 # Verificar se pip está instalado
 if ! command -v pip3 &> /dev/null; then
     echo "❌ pip3 não encontrado. Instalando..."
@@ -0,0 +1,122 @@
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.analysis_cache import AnalysisCache, AnalysisStats
+from forwarders.auto_forwarder import fetch_game_analysis
+from forwarders.game_analysis import GameAnalysisClient
+
+ANALYSIS_HTML = """
+<div class="home_form"></div><p class="ppg">1.85 PPJ</p>
+<table>
+  <tr style="background: #1c4252"><td>1.6</td><td>Média Golos Marcados</td><td>1.1</td></tr>
+</table>
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+STATS = AnalysisStats("1.85", "1.6", "1.3", "https://cornerprobet.com/pt/analysis/a-b/1")
+
+
+class AnalysisCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "analysis_cache.sqlite3"
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_entries_survive_a_restart_until_the_ttl(self):
+        cache = AnalysisCache(self.path, ttl=3600, clock=self.clock)
+        cache.put(1, STATS)
+        cache.close()
+
+        reopened = AnalysisCache(self.path, ttl=3600, clock=self.clock)
+        self.assertEqual(reopened.get("1"), STATS)
+
+        self.clock.now += 3600
+        self.assertIsNone(reopened.get(1))
+        self.assertEqual(reopened.prune(), 1)
+        self.assertEqual((reopened.hits, reopened.misses), (1, 1))
+        reopened.close()
+
+    def test_memory_is_bounded_by_lru(self):
+        cache = AnalysisCache(max_entries=2, clock=self.clock)
+        cache.put(1, STATS)
+        cache.put(2, STATS)
+        cache.get(1)
+        cache.put(3, STATS)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNone(cache.get(2))
+
+    def test_disabled_in_config(self):
+        self.assertIsNone(AnalysisCache.from_config({"enabled": False}, self.path))
+
+
+class CachedFetchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_repeat_alerts_do_not_hit_the_network(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url)
+            return httpx.Response(200, text=ANALYSIS_HTML)
+
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(handler))
+        cache = AnalysisCache()
+
+        with self.assertLogs("forwarders.auto_forwarder", level="INFO"):
+            first = await fetch_game_analysis(analysis, "A", "B", 7, cache)
+            second = await fetch_game_analysis(analysis, "A", "B", 7, cache)
+        await analysis.aclose()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[:3], ("1.85", "1.6", None))
+        self.assertEqual(len(requests_seen), 1)
+
+    async def test_failed_fetches_are_not_cached(self):
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+        cache = AnalysisCache()
+
+        with self.assertLogs("forwarders.auto_forwarder", level="ERROR"):
+            await fetch_game_analysis(analysis, "A", "B", 7, cache)
+        await analysis.aclose()
+
+        self.assertEqual(len(cache), 0)
+
+    async def test_pages_without_stats_are_not_cached(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request.url)
+            return httpx.Response(200, text="<html></html>")
+
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(handler))
+        cache = AnalysisCache()
+
+        with self.assertLogs("forwarders.auto_forwarder", level="INFO"):
+            first = await fetch_game_analysis(analysis, "A", "B", 7, cache)
+            await fetch_game_analysis(analysis, "A", "B", 7, cache)
+        await analysis.aclose()
+
+        self.assertEqual(first[:3], (None, None, None))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(len(requests_seen), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
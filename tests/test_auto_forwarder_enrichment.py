@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+import sys
+import tempfile
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders import auto_forwarder
+from forwarders.auto_forwarder import AutoMessageForwarder
+
+
+LAY_ALERT = "\n".join([
+    "Lay 0x1",
+    "Estratégia: Lay 0x1 HT",
+    "🏆 Brazil Serie A",
+    "⚽ Grêmio vs Santos",
+])
+
+
+def build_forwarder(path, forwarders):
+    path.write_text(json.dumps({
+        "api_id": 1,
+        "api_hash": "hash",
+        "bot_token": "1:token",
+        "outbox": {"enabled": False},
+        "dedup": {"enabled": False},
+        "analysis": {"cache": {"enabled": False}},
+        "forwarders": forwarders,
+    }), encoding="utf-8")
+    forwarder = AutoMessageForwarder(str(path))
+    forwarder.sent = []
+
+    async def send_message(chat_id, text):
+        forwarder.sent.append((chat_id, text))
+
+    forwarder.send_app = SimpleNamespace(send_message=send_message)
+    return forwarder
+
+
+def build_message(text, chat_id=-100):
+    return SimpleNamespace(id=1, text=text, chat=SimpleNamespace(id=chat_id))
+
+
+def target(target_chat_id, strategies=None):
+    return {
+        "source_user_id": -100,
+        "target_chat_id": target_chat_id,
+        "strategy_filters": {
+            "enabled": strategies is not None,
+            "mode": "whitelist",
+            "strategies": strategies or [],
+        },
+    }
+
+
+class EnrichmentOncePerMessageTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.temp_dir.name) / "client_config.json"
+
+        self.lookups = []
+        self.fetches = []
+
+        def find_game(league, home_team, away_team):
+            self.lookups.append((league, home_team, away_team))
+            return "Grêmio", "Santos", 42
+
+        async def fetch(client, home_name, away_name, game_id, cache=None):
+            self.fetches.append(game_id)
+            return None, None, None, f"https://cornerprobet.com/pt/analysis/gremio-santos/{game_id}"
+
+        patches = [
+            mock.patch.object(auto_forwarder, "find_game_in_matchday", side_effect=find_game),
+            mock.patch.object(auto_forwarder, "fetch_game_analysis", side_effect=fetch),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_one_lookup_is_shared_by_every_target(self):
+        with self.assertLogs(level="INFO"):
+            forwarder = build_forwarder(self.config_path, [target(-1001), target(-1002), target(-1003)])
+            await forwarder.forward_message(None, build_message(LAY_ALERT))
+        forwarder.matchday_executor.shutdown()
+
+        self.assertEqual(len(self.lookups), 1)
+        self.assertEqual(self.fetches, [42])
+        self.assertEqual([chat_id for chat_id, _text in forwarder.sent], [-1001, -1002, -1003])
+        self.assertTrue(all(text.endswith("/42") for _chat_id, text in forwarder.sent))
+
+    async def test_no_lookup_when_every_target_filters_the_alert_out(self):
+        with self.assertLogs(level="INFO"):
+            forwarder = build_forwarder(self.config_path, [target(-1001, ["over"]), target(-1002, ["btts"])])
+            await forwarder.forward_message(None, build_message(LAY_ALERT))
+        forwarder.matchday_executor.shutdown()
+
+        self.assertEqual(self.lookups, [])
+        self.assertEqual(forwarder.sent, [])
+
+
+class StrategyMatcherConfigTest(unittest.IsolatedAsyncioTestCase):
+    async def test_each_forwarder_entry_carries_its_compiled_matcher(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with self.assertLogs(level="INFO"):
+                forwarder = build_forwarder(Path(temp_dir) / "client_config.json", [target(-1001, ["lay"]), target(-1002)])
+        forwarder.matchday_executor.shutdown()
+        lay_only, unfiltered = forwarder.config["forwarders"]
+
+        self.assertEqual(lay_only["strategy_matcher"].find("lay 0x1"), "lay")
+        self.assertTrue(forwarder.should_forward_message(LAY_ALERT, lay_only))
+        self.assertTrue(forwarder.should_forward_message("Over 1.5 HT", unfiltered))
+        self.assertFalse(forwarder.should_forward_message("Over 1.5 HT", lay_only))
+        # Entries copied from the config keep using the compiled matcher
+        self.assertTrue(forwarder.should_forward_message(LAY_ALERT, dict(lay_only)))
+
+        # Entries built elsewhere get their matcher compiled once and stored
+        blacklist = {**target(-1003, ["lay"]), "strategy_filters": {"enabled": True, "mode": "blacklist", "strategies": ["lay"]}}
+        self.assertFalse(forwarder.should_forward_message(LAY_ALERT, blacklist))
+        matcher = blacklist["strategy_matcher"]
+        self.assertFalse(forwarder.should_forward_message(LAY_ALERT, blacklist))
+        self.assertIs(blacklist["strategy_matcher"], matcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
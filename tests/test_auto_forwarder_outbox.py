@@ -0,0 +1,128 @@
+import json
+import sqlite3
+from pathlib import Path
+import sys
+import tempfile
+from types import SimpleNamespace
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.scenario_classifier import parse_alert_message
+from forwarders.auto_forwarder import AutoMessageForwarder
+from forwarders.dedup import AlertDeduplicator
+from forwarders.startup import StartupTimer
+
+
+class FakeClient:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class OutboxReplayTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        temp_path = Path(self.temp_dir.name)
+        config_path = temp_path / "client_config.json"
+        config_path.write_text(json.dumps({
+            "api_id": 1,
+            "api_hash": "hash",
+            "bot_token": "1:token",
+            "outbox": {"path": str(temp_path / "outbox.sqlite3")},
+            "dedup": {"enabled": False},
+            "analysis": {"cache": {"enabled": False}},
+            "forwarders": [{"source_user_id": -100, "target_chat_id": -1001}],
+        }), encoding="utf-8")
+        with self.assertLogs(level="INFO"):
+            self.forwarder = AutoMessageForwarder(str(config_path))
+        self.events = []
+
+        async def send_message(chat_id, text):
+            self.events.append(("envio", text))
+
+        async def warm_caches():
+            self.events.append(("cache", None))
+
+        async def nothing():
+            pass
+
+        self.forwarder.send_app = SimpleNamespace(send_message=send_message)
+        self.forwarder._warm_caches = warm_caches
+        self.forwarder._log_accounts = nothing
+        self.forwarder._verify_forwarders = nothing
+
+    async def asyncTearDown(self):
+        await self.forwarder.outbox.close()
+        self.forwarder.matchday_executor.shutdown()
+        self.temp_dir.cleanup()
+
+    async def test_backlog_is_replayed_after_peers_are_warmed(self):
+        outbox = self.forwarder.outbox
+        outbox.add(-100, 1, -1001, "pendente")
+        backlog = self.forwarder._load_outbox_backlog()
+        # Chegou depois da conexão: é enviada pelo fluxo normal, não pelo replay
+        outbox.add(-100, 2, -1001, "nova")
+
+        with self.assertLogs(level="INFO"):
+            await self.forwarder._run_startup_checks(StartupTimer(), backlog)
+            await self.forwarder._replay_task
+
+        self.assertEqual(self.events, [("cache", None), ("envio", "pendente")])
+        self.assertEqual([entry.text for entry in outbox.pending()], ["nova"])
+        self.assertEqual(self.forwarder.metrics["reenviadas_do_outbox"], 1)
+
+    async def test_shutdown_commits_the_outbox(self):
+        outbox = self.forwarder.outbox
+
+        async def run_connected(timer):
+            # Escrita ainda não gravada pelo commit periódico quando o cliente cai
+            outbox.commit_interval = 3600
+            outbox.start()
+            outbox.mark_sent(outbox.add(-100, 1, -1001, "enviada"))
+            raise ConnectionError("conexão perdida")
+
+        self.forwarder.app = FakeClient()
+        self.forwarder._run_connected = run_connected
+        with self.assertLogs(level="INFO"), self.assertRaises(ConnectionError):
+            await self.forwarder.start()
+        self.forwarder._metrics_task.cancel()
+
+        reader = sqlite3.connect(outbox.path)
+        try:
+            rows = reader.execute("SELECT text, sent_at IS NOT NULL FROM outbox").fetchall()
+        finally:
+            reader.close()
+        self.assertEqual(rows, [("enviada", 1)])
+
+    async def test_shutdown_saves_dedup_fingerprints(self):
+        dedup_path = Path(self.temp_dir.name) / "dedup.json"
+        self.forwarder.deduplicator = AlertDeduplicator(path=str(dedup_path))
+        alert = parse_alert_message(
+            "📣 Alerta Estratégia: mapa-de-calor 📣\n"
+            "🏟 Jogo: Lauterach (17º) x (2º) Kuchl\n"
+            "🏆 Competição: Austria Regionalliga: West\n"
+            "🕛 Tempo: 70 '\n"
+            "⚽ Resultado: 0 x 2 (0 x 0 Intervalo)\n"
+            "📈 Odds 1x2 Pre-live: 6.5 / 6.5 / 1.22\n"
+            "https://cornerprobet.com/analysis/re8qc"
+        )
+
+        async def run_connected(timer):
+            # Antes do SAVE_INTERVAL: só o desligamento grava o arquivo
+            self.assertFalse(self.forwarder.deduplicator.is_duplicate(-100, alert))
+            raise ConnectionError("conexão perdida")
+
+        self.forwarder.app = FakeClient()
+        self.forwarder._run_connected = run_connected
+        with self.assertLogs(level="INFO"), self.assertRaises(ConnectionError):
+            await self.forwarder.start()
+        self.forwarder._metrics_task.cancel()
+
+        self.assertTrue(AlertDeduplicator(path=str(dedup_path)).is_duplicate(-100, alert))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.bot_api import BotApiClient, BotApiError
+
+
+class FakeBotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+    connections = set()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        type(self).requests_seen.append((self.path, json.loads(body or b"{}")))
+        type(self).connections.add(self.client_address)
+
+        if self.path.endswith("/sendMessage"):
+            self._reply(200, {"ok": True, "result": {"message_id": len(self.requests_seen)}})
+        elif self.path.endswith("/flood"):
+            self._reply(429, {
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 7",
+                "parameters": {"retry_after": 7},
+            })
+        else:
+            self._reply(502, None)
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode() if data is not None else b"Bad Gateway"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if data is not None else "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BotApiClientTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBotApiHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeBotApiHandler.requests_seen = []
+        FakeBotApiHandler.connections = set()
+        self.client = BotApiClient("123:abc", base_url=self.base_url, connect_timeout=1, read_timeout=2)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_calls_method_under_token_path_and_reuses_connection(self):
+        first = await self.client.call("sendMessage", {"chat_id": -1001, "text": "a"})
+        second = await self.client.call("sendMessage", {"chat_id": -1001, "text": "b"})
+
+        self.assertEqual((first["message_id"], second["message_id"]), (1, 2))
+        self.assertEqual(FakeBotApiHandler.requests_seen[0], ("/bot123:abc/sendMessage", {"chat_id": -1001, "text": "a"}))
+        self.assertEqual(len(FakeBotApiHandler.connections), 1)
+
+    async def test_rate_limit_error_carries_retry_after(self):
+        with self.assertRaises(BotApiError) as context:
+            await self.client.call("flood", {})
+
+        self.assertEqual(context.exception.error_code, 429)
+        self.assertEqual(context.exception.retry_after, 7)
+
+    async def test_non_json_error_raises_http_error(self):
+        with self.assertRaises(Exception) as context:
+            await self.client.call("broken", {})
+
+        self.assertNotIsInstance(context.exception, BotApiError)
+
+    def test_base_url_is_configurable(self):
+        client = BotApiClient.from_config("t", {"base_url": "http://localhost:8081/"})
+        self.assertEqual(client.base_url, "http://localhost:8081")
+
+
+if __name__ == "__main__":
+    unittest.main()
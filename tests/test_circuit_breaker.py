@@ -0,0 +1,113 @@
+from collections import Counter
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, SendPathBreakers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_consecutive_failures_and_success_resets(self):
+        breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+
+        self.assertIsNone(breaker.record_failure())
+        self.assertIsNone(breaker.record_success(0.1))
+        self.assertIsNone(breaker.record_failure())
+        self.assertEqual(breaker.record_failure(), OPEN)
+
+    def test_probe_half_opens_and_one_failure_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+
+        self.assertFalse(breaker.probe_due())
+        clock.now += 30
+        self.assertTrue(breaker.probe_due())
+        self.assertEqual(breaker.record_probe(True), HALF_OPEN)
+        self.assertEqual(breaker.record_failure(), OPEN)
+
+    def test_latency_is_smoothed(self):
+        breaker = CircuitBreaker(latency_alpha=0.5)
+        breaker.record_success(1.0)
+        breaker.record_success(3.0)
+
+        self.assertAlmostEqual(breaker.latency_ewma, 2.0)
+
+
+class SendPathBreakersTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.metrics = Counter()
+        self.paths = SendPathBreakers(
+            ["bot api", "bot", "usuário"],
+            metrics=self.metrics,
+            failure_threshold=2,
+            reset_timeout=30,
+            slow_latency=5,
+            clock=self.clock,
+        )
+
+    def test_broken_path_moves_to_the_end_for_that_forum_only(self):
+        self.paths.record_failure(-1001, "bot api")
+        self.paths.record_failure(-1001, "bot api")
+
+        self.assertEqual(self.paths.order(-1001), ["bot", "usuário", "bot api"])
+        self.assertEqual(self.paths.order(-1002), ["bot api", "bot", "usuário"])
+        self.assertEqual(self.metrics["circuito_bot_api_aberto"], 1)
+        self.assertEqual(self.metrics["falhas_via_bot_api"], 2)
+
+    def test_slow_path_is_tried_after_fast_ones(self):
+        self.paths.record_success(-1001, "bot api", 12.0)
+        self.paths.record_success(-1001, "bot", 0.3)
+
+        self.assertEqual(self.paths.order(-1001), ["bot", "usuário", "bot api"])
+        self.assertEqual(self.metrics["envios_via_bot"], 1)
+
+    async def test_background_probe_restores_path_after_reset_timeout(self):
+        probed = []
+
+        async def probe(path, chat_id):
+            probed.append((path, chat_id))
+
+        self.paths.record_failure(-1001, "bot api")
+        self.paths.record_failure(-1001, "bot api")
+
+        await self.paths.probe_due_paths(probe)
+        self.assertEqual(probed, [])
+
+        self.clock.now += 30
+        await self.paths.probe_due_paths(probe)
+
+        self.assertEqual(probed, [("bot api", -1001)])
+        self.assertEqual(self.paths.breaker(-1001, "bot api").state, HALF_OPEN)
+        self.assertEqual(self.paths.order(-1001)[0], "bot api")
+
+        self.paths.record_success(-1001, "bot api", 0.2)
+        self.assertEqual(self.paths.breaker(-1001, "bot api").state, CLOSED)
+        self.assertEqual(self.metrics["circuito_bot_api_fechado"], 1)
+
+    async def test_failed_probe_keeps_path_open(self):
+        async def probe(path, chat_id):
+            raise RuntimeError("Forbidden")
+
+        self.paths.record_failure(-1001, "bot api")
+        self.paths.record_failure(-1001, "bot api")
+        self.clock.now += 30
+        await self.paths.probe_due_paths(probe)
+
+        self.assertEqual(self.paths.breaker(-1001, "bot api").state, OPEN)
+        self.assertFalse(self.paths.breaker(-1001, "bot api").probe_due())
+
+
+if __name__ == "__main__":
+    unittest.main()
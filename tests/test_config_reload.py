@@ -0,0 +1,139 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+import signal
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.config_reload import ConfigWatcher, remove_pid_file, send_reload_signal, write_pid_file
+from forwarders.scenario_forwarder import ScenarioMessageForwarder
+
+
+def build_config(forwarders):
+    return {
+        "api_id": 1,
+        "api_hash": "hash",
+        "bot_token": "1:token",
+        "outbox": {"enabled": False},
+        "scenario_forwarders": forwarders,
+    }
+
+
+class ConfigReloadTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.temp_dir.name) / "client_config.json"
+        self.write_config([{
+            "source_chat_id": -100,
+            "forum_chat_id": -1001,
+            "scenario_topics": {"parelho empatando sem gols": 5},
+        }])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_config(self, forwarders):
+        self.config_path.write_text(json.dumps(build_config(forwarders)), encoding="utf-8")
+
+    def test_reload_swaps_routing_plan_and_source_filter_in_place(self):
+        with self.assertLogs(level="INFO"):
+            forwarder = ScenarioMessageForwarder(str(self.config_path))
+        source_filter = forwarder.source_chats
+        old_target = forwarder.routing_plan[-100][0]
+
+        self.write_config([
+            {"source_chat_id": -100, "forum_chat_id": -1001, "scenario_topics": {"parelho empatando sem gols": 9}},
+            {"source_chat_id": -200, "forum_chat_id": -2001},
+        ])
+        with self.assertLogs(level="INFO"):
+            self.assertTrue(forwarder.reload_config())
+
+        self.assertIs(forwarder.source_chats, source_filter)
+        self.assertEqual(set(source_filter), {-100, -200})
+        self.assertEqual(forwarder.routing_plan[-100][0].topic_table[-1].message_thread_id, 9)
+        self.assertEqual(old_target.topic_table[-1].message_thread_id, 5)
+
+    def test_invalid_config_keeps_the_current_plan(self):
+        with self.assertLogs(level="INFO"):
+            forwarder = ScenarioMessageForwarder(str(self.config_path))
+        plan = forwarder.routing_plan
+
+        self.config_path.write_text("{ inválido", encoding="utf-8")
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(forwarder.reload_config())
+
+        self.assertIs(forwarder.routing_plan, plan)
+        self.assertEqual(forwarder.metrics["recargas_falhas"], 1)
+
+    async def test_watcher_reloads_on_file_change(self):
+        reloads = []
+        watcher = ConfigWatcher(self.config_path, lambda: reloads.append(True), interval=0.01)
+        task = asyncio.create_task(watcher.run())
+        try:
+            await asyncio.sleep(0.03)
+            self.assertEqual(reloads, [])
+
+            self.write_config([])
+            stat = self.config_path.stat()
+            os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            await asyncio.sleep(0.05)
+            self.assertEqual(reloads, [True])
+        finally:
+            task.cancel()
+
+    async def test_sighup_through_pid_file_triggers_reload(self):
+        reloads = []
+        watcher = ConfigWatcher(self.config_path, lambda: reloads.append(True), interval=10)
+        if not watcher.install_signal_handler():
+            self.skipTest("SIGHUP indisponível nesta plataforma")
+        pid_file = Path(self.temp_dir.name) / "forwarder.pid"
+        self.assertTrue(write_pid_file(pid_file))
+        task = asyncio.create_task(watcher.run())
+        try:
+            self.assertTrue(send_reload_signal(pid_file))
+            await asyncio.sleep(0.05)
+            self.assertEqual(reloads, [True])
+        finally:
+            task.cancel()
+            remove_pid_file(pid_file)
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        self.assertFalse(pid_file.exists())
+
+    async def test_stale_pid_file_is_not_signalled(self):
+        reloads = []
+        watcher = ConfigWatcher(self.config_path, lambda: reloads.append(True), interval=10)
+        if not watcher.install_signal_handler():
+            self.skipTest("SIGHUP indisponível nesta plataforma")
+        # Left behind by a forwarder killed with SIGKILL: nobody holds the lock.
+        pid_file = Path(self.temp_dir.name) / "forwarder.pid"
+        pid_file.write_text(str(os.getpid()), encoding="utf-8")
+        task = asyncio.create_task(watcher.run())
+        try:
+            with self.assertLogs("forwarders.config_reload", level="WARNING"):
+                self.assertFalse(send_reload_signal(pid_file))
+            await asyncio.sleep(0.05)
+            self.assertEqual(reloads, [])
+        finally:
+            task.cancel()
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+
+    def test_second_forwarder_does_not_take_over_the_pid_file(self):
+        pid_file = Path(self.temp_dir.name) / "forwarder.pid"
+        self.assertTrue(write_pid_file(pid_file))
+        try:
+            with self.assertLogs("forwarders.config_reload", level="WARNING"):
+                self.assertFalse(write_pid_file(pid_file))
+            self.assertEqual(pid_file.read_text(encoding="utf-8"), str(os.getpid()))
+        finally:
+            remove_pid_file(pid_file)
+
+    def test_signal_without_running_forwarder(self):
+        self.assertFalse(send_reload_signal(Path(self.temp_dir.name) / "ausente.pid"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from dataclasses import replace
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.scenario_classifier import parse_alert_message
+from forwarders.dedup import AlertDeduplicator
+
+
+MESSAGE = """📣 Alerta Estratégia: mapa-de-calor 📣
+🏟 Jogo: La Luz (6º) x (13º) Paysandu FC
+🏆 Competição: Uruguay Segunda Division
+🕛 Tempo: 70 '
+⚽ Resultado: 1 x 2 (0 x 0 Intervalo)
+📈 Odds 1x2 Pre-live: 1.8 / 3.2 / 4
+
+https://cornerprobet.com/analysis/rpam7"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class AlertDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        self.alert = parse_alert_message(MESSAGE)
+        self.clock = FakeClock()
+
+    def test_repeated_alert_is_duplicate_until_ttl_expires(self):
+        dedup = AlertDeduplicator(ttl=60, clock=self.clock)
+
+        self.assertFalse(dedup.is_duplicate(-100, self.alert))
+        self.assertTrue(dedup.is_duplicate(-100, parse_alert_message(MESSAGE + "\n\n⚽: ❌")))
+        self.clock.now += 61
+        self.assertFalse(dedup.is_duplicate(-100, self.alert))
+        self.assertEqual(dedup.stats(), (1, 2))
+
+    def test_fingerprint_fields_and_source_distinguish_alerts(self):
+        dedup = AlertDeduplicator(clock=self.clock)
+        dedup.is_duplicate(-100, self.alert)
+
+        self.assertFalse(dedup.is_duplicate(-200, self.alert))
+        self.assertFalse(dedup.is_duplicate(-100, replace(self.alert, game_time="71")))
+        self.assertFalse(dedup.is_duplicate(-100, replace(self.alert, home_goals=2)))
+        self.assertFalse(dedup.is_duplicate(-100, replace(self.alert, strategy="BTTS")))
+        self.assertTrue(dedup.is_duplicate(-100, replace(self.alert, league="Outra")))
+
+    def test_memory_is_bounded(self):
+        dedup = AlertDeduplicator(max_entries=3, clock=self.clock)
+        for minute in range(10):
+            dedup.is_duplicate(-100, replace(self.alert, game_time=str(minute)))
+
+        self.assertEqual(len(dedup), 3)
+        self.assertFalse(dedup.is_duplicate(-100, replace(self.alert, game_time="0")))
+
+    def test_persisted_entries_survive_restart(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = str(Path(temp_dir) / "dedup.json")
+            dedup = AlertDeduplicator(ttl=60, path=path, clock=self.clock)
+            dedup.is_duplicate(-100, self.alert)
+            dedup.save()
+
+            self.assertTrue(AlertDeduplicator(ttl=60, path=path, clock=self.clock).is_duplicate(-100, self.alert))
+            self.clock.now += 61
+            self.assertFalse(AlertDeduplicator(ttl=60, path=path, clock=self.clock).is_duplicate(-100, self.alert))
+
+
+if __name__ == "__main__":
+    unittest.main()
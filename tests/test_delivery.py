@@ -0,0 +1,246 @@
+import asyncio
+from collections import Counter
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyrogram.errors import FloodWait
+
+from forwarders.bot_api import BotApiError
+from forwarders.delivery import (
+    COALESCE_SEPARATOR,
+    DeliveryJob,
+    DeliveryQueue,
+    TokenBucket,
+    retry_after_from_error,
+)
+from forwarders.routing import TopicRef
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def build_job(forum_chat_id=-1001, text="alerta", topic_id=7):
+    return DeliveryJob(
+        source_chat_id=-100,
+        forum_chat_id=forum_chat_id,
+        topic_ref=TopicRef(topic_id, topic_id),
+        text=text,
+        scenario="parelho empatando sem gols",
+    )
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_paced_at_the_configured_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket.per_minute(20, burst=2, clock=clock)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 3.0)
+        self.assertAlmostEqual(bucket.reserve(), 6.0)
+
+        clock.now += 60
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_penalize_blocks_until_retry_after(self):
+        clock = FakeClock()
+        bucket = TokenBucket.per_minute(20, burst=5, clock=clock)
+
+        bucket.penalize(12)
+
+        self.assertAlmostEqual(bucket.reserve(), 12.0)
+        self.assertAlmostEqual(bucket.reserve(), 15.0)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_reads_bot_api_and_flood_wait_errors(self):
+        self.assertEqual(retry_after_from_error(BotApiError("Too Many Requests", 429, retry_after=7)), 7.0)
+        self.assertEqual(retry_after_from_error(FloodWait(value=9)), 9.0)
+        self.assertIsNone(retry_after_from_error(BotApiError("Bad Request", 400)))
+        self.assertIsNone(retry_after_from_error(RuntimeError("boom")))
+
+
+class DeliveryQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_jobs_are_delivered_in_order_per_forum(self):
+        delivered = []
+
+        async def send(job):
+            delivered.append((job.forum_chat_id, job.text))
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10)
+        for index in range(3):
+            delivery.submit(build_job(-1001, f"a{index}"))
+            delivery.submit(build_job(-1002, f"b{index}"))
+
+        await delivery.drain()
+        await delivery.close()
+
+        self.assertEqual([text for forum, text in delivered if forum == -1001], ["a0", "a1", "a2"])
+        self.assertEqual([text for forum, text in delivered if forum == -1002], ["b0", "b1", "b2"])
+        self.assertEqual(delivery.metrics["enviadas"], 6)
+
+    async def test_retry_after_pauses_the_forum_and_retries(self):
+        attempts = []
+
+        async def send(job):
+            attempts.append(job.text)
+            if len(attempts) == 1:
+                raise BotApiError("Too Many Requests", 429, retry_after=0.05)
+
+        metrics = Counter()
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10, metrics=metrics)
+        delivery.submit(build_job())
+
+        started = asyncio.get_running_loop().time()
+        await delivery.drain()
+        elapsed = asyncio.get_running_loop().time() - started
+        await delivery.close()
+
+        self.assertEqual(attempts, ["alerta", "alerta"])
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertEqual(metrics["limites_de_envio"], 1)
+        self.assertEqual(metrics["enviadas"], 1)
+
+    async def test_other_errors_are_not_retried(self):
+        attempts = []
+
+        async def send(job):
+            attempts.append(job.text)
+            raise RuntimeError("chat not found")
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10)
+        delivery.submit(build_job())
+
+        with self.assertLogs("forwarders.delivery", level="ERROR"):
+            await delivery.drain()
+        await delivery.close()
+
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(delivery.metrics["envios_falhos"], 1)
+
+    async def test_full_queue_drops_new_jobs(self):
+        release = asyncio.Event()
+
+        async def send(job):
+            await release.wait()
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10, max_queue_size=1)
+        self.assertTrue(delivery.submit(build_job(text="primeira")))
+        await asyncio.sleep(0)
+        self.assertTrue(delivery.submit(build_job(text="segunda")))
+
+        with self.assertLogs("forwarders.delivery", level="ERROR"):
+            self.assertFalse(delivery.submit(build_job(text="terceira")))
+
+        release.set()
+        await delivery.drain()
+        await delivery.close()
+        self.assertEqual(delivery.metrics["descartadas_fila_cheia"], 1)
+
+
+class CoalescingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_single_alert_is_sent_without_waiting(self):
+        delivered = []
+
+        async def send(job):
+            delivered.append(job.text)
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10, coalesce_window=5)
+        delivery.submit(build_job(text="sozinho"))
+
+        await asyncio.wait_for(delivery.drain(), timeout=1)
+        await delivery.close()
+        self.assertEqual(delivered, ["sozinho"])
+
+    async def test_alert_for_another_topic_is_not_held_back(self):
+        delivered = []
+
+        async def send(job):
+            delivered.append(job.text)
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10, coalesce_window=5)
+        delivery.submit(build_job(text="a1"))
+        delivery.submit(build_job(text="b1", topic_id=8))
+
+        await asyncio.wait_for(delivery.drain(), timeout=1)
+        await delivery.close()
+        self.assertEqual(delivered, ["a1", "b1"])
+        self.assertEqual(delivery.metrics["alertas_agrupados"], 0)
+
+    async def test_backlog_for_a_topic_is_merged_in_order(self):
+        delivered = []
+
+        async def send(job):
+            delivered.append((job.topic_ref.message_thread_id, job.text, [part.text for part in job.parts]))
+
+        delivery = DeliveryQueue(send, messages_per_minute=6000, burst=10, coalesce_window=0.02)
+        delivery.submit(build_job(text="a1"))
+        delivery.submit(build_job(text="b1", topic_id=8))
+        delivery.submit(build_job(text="a2"))
+        await asyncio.sleep(0.005)
+        delivery.submit(build_job(text="a3"))
+
+        await delivery.drain()
+        await delivery.close()
+
+        self.assertEqual(delivered, [
+            (7, COALESCE_SEPARATOR.join(["a1", "a2", "a3"]), ["a1", "a2", "a3"]),
+            (8, "b1", ["b1"]),
+        ])
+        self.assertEqual(delivery.metrics["alertas_agrupados"], 3)
+        self.assertEqual(delivery.metrics["enviadas"], 2)
+
+    async def test_merged_message_respects_the_length_limit(self):
+        delivered = []
+
+        async def send(job):
+            delivered.append([part.text for part in job.parts])
+
+        limit = 2 * 40 + len(COALESCE_SEPARATOR)
+        delivery = DeliveryQueue(
+            send, messages_per_minute=6000, burst=10, coalesce_window=0.01, max_message_length=limit
+        )
+        texts = ["x" * 40, "y" * 40, "z" * 40]
+        for text in texts:
+            delivery.submit(build_job(text=text))
+
+        await delivery.drain()
+        await delivery.close()
+
+        self.assertEqual(delivered, [texts[:2], texts[2:]])
+
+    async def test_held_jobs_count_against_the_queue_limit(self):
+        release = asyncio.Event()
+
+        async def send(job):
+            await release.wait()
+
+        delivery = DeliveryQueue(
+            send, messages_per_minute=6000, burst=10, max_queue_size=3, coalesce_window=0.01
+        )
+        for job in (build_job(text="a1"), build_job(text="a2"), build_job(text="b1", topic_id=8)):
+            self.assertTrue(delivery.submit(job))
+        await asyncio.sleep(0.05)
+        self.assertEqual(delivery.pending(-1001), 1)
+
+        self.assertTrue(delivery.submit(build_job(text="c1", topic_id=9)))
+        self.assertTrue(delivery.submit(build_job(text="c2", topic_id=9)))
+        with self.assertLogs("forwarders.delivery", level="ERROR"):
+            self.assertFalse(delivery.submit(build_job(text="c3", topic_id=9)))
+
+        release.set()
+        await delivery.drain()
+        await delivery.close()
+        self.assertEqual(delivery.metrics["descartadas_fila_cheia"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
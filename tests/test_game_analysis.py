@@ -0,0 +1,98 @@
+import asyncio
+from pathlib import Path
+import sys
+import unittest
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.auto_forwarder import fetch_game_analysis
+from forwarders.game_analysis import GameAnalysisClient
+
+
+ANALYSIS_HTML = """
+<div class="home_form"></div><p class="ppg">1.85 PPJ</p>
+<table>
+  <tr style="background: #1c4252"><td>1.6</td><td>Média Golos Marcados</td><td>1.1</td></tr>
+  <tr><td>0.9</td><td>Média Golos Sofridos</td><td>1.3</td></tr>
+</table>
+"""
+
+
+class GameAnalysisClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_reuses_one_pooled_client_with_session_cookies(self):
+        seen = []
+
+        def handler(request):
+            seen.append((str(request.url), request.headers.get("cookie", "")))
+            return httpx.Response(200, text="<html></html>")
+
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(handler))
+        client = analysis.client
+        self.assertEqual(await analysis.fetch("https://cornerprobet.com/pt/analysis/a-b/1"), "<html></html>")
+        await analysis.fetch("https://cornerprobet.com/pt/analysis/a-b/2")
+
+        self.assertIs(analysis.client, client)
+        self.assertEqual(len(seen), 2)
+        self.assertIn("PHPSESSID=", seen[0][1])
+        await analysis.aclose()
+
+    async def test_http_errors_raise(self):
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        with self.assertRaises(httpx.HTTPStatusError):
+            await analysis.fetch("https://cornerprobet.com/pt/analysis/a-b/1")
+        await analysis.aclose()
+
+    def test_from_config(self):
+        analysis = GameAnalysisClient.from_config({"latency_budget": 2.5, "read_timeout": 4})
+        self.assertEqual(analysis.latency_budget, 2.5)
+        self.assertEqual(analysis.timeout.read, 4)
+
+
+class FetchGameAnalysisTest(unittest.IsolatedAsyncioTestCase):
+    async def test_extracts_stats_and_returns_the_url(self):
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=ANALYSIS_HTML)))
+
+        with self.assertLogs("forwarders.auto_forwarder", level="INFO"):
+            result = await fetch_game_analysis(analysis, "Grêmio", "Santos FC", 123)
+        await analysis.aclose()
+
+        self.assertEqual(result[:3], ("1.85", "1.6", "1.3"))
+        self.assertTrue(result[3].endswith("/123"))
+
+    async def test_slow_page_is_cancelled_without_blocking_the_loop(self):
+        async def slow_handler(request):
+            await asyncio.sleep(5)
+            return httpx.Response(200, text=ANALYSIS_HTML)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(slow_handler))
+        ticker_task = asyncio.create_task(ticker())
+        with self.assertLogs("forwarders.auto_forwarder", level="INFO"):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(fetch_game_analysis(analysis, "A", "B", 1), timeout=0.1)
+        ticker_task.cancel()
+        await analysis.aclose()
+
+        self.assertGreaterEqual(ticks, 5)
+
+    async def test_failures_return_nothing(self):
+        analysis = GameAnalysisClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+
+        with self.assertLogs("forwarders.auto_forwarder", level="ERROR"):
+            result = await fetch_game_analysis(analysis, "A", "B", 1)
+        await analysis.aclose()
+
+        self.assertEqual(result, (None, None, None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.bot_api import BotApiClient
+from forwarders.hedging import LatencyTracker, derive_batch_random_id, derive_random_id, race_with_hedge
+
+
+class SlowBotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(type(self).delay)
+        body = json.dumps({"ok": True, "result": {"message_id": 1}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeMtprotoPath:
+    """Stand-in for SendMessage: remembers random_ids like Telegram does."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.delivered = {}
+
+    async def send(self, random_id, text):
+        await asyncio.sleep(self.delay)
+        self.delivered.setdefault(random_id, text)
+
+
+class LatencyTrackerTest(unittest.TestCase):
+    def test_percentile_needs_minimum_samples(self):
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for latency in range(1, 10):
+            tracker.record("bot api", latency / 10)
+        self.assertIsNone(tracker.percentile("bot api", 0.9))
+
+        tracker.record("bot api", 1.0)
+        self.assertEqual(tracker.percentile("bot api", 0.9), 1.0)
+        self.assertEqual(tracker.percentile("bot api", 0.5), 0.6)
+        self.assertIsNone(tracker.percentile("bot", 0.9))
+
+
+class RandomIdTest(unittest.TestCase):
+    def test_random_id_is_stable_and_specific_to_alert_and_topic(self):
+        random_id = derive_random_id(-100, 42, -1001, 7)
+
+        self.assertEqual(random_id, derive_random_id(-100, 42, -1001, 7))
+        self.assertNotEqual(random_id, derive_random_id(-100, 43, -1001, 7))
+        self.assertNotEqual(random_id, derive_random_id(-100, 42, -1001, 8))
+        self.assertTrue(-(2 ** 63) <= random_id < 2 ** 63)
+
+    def test_merged_alerts_get_their_own_random_id(self):
+        single = derive_random_id(-100, 42, -1001, 7)
+        merged = derive_batch_random_id([(-100, 42), (-100, 43)], -1001, 7)
+
+        self.assertEqual(single, derive_batch_random_id([(-100, 42)], -1001, 7))
+        self.assertNotEqual(merged, single)
+        self.assertNotEqual(merged, derive_random_id(-100, 43, -1001, 7))
+
+
+class RaceWithHedgeTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowBotApiHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        self.bot_api = BotApiClient("1:t", base_url=f"http://127.0.0.1:{self.server.server_address[1]}")
+        self.mtproto = FakeMtprotoPath()
+        self.random_id = derive_random_id(-100, 42, -1001, 7)
+
+    async def asyncTearDown(self):
+        await self.bot_api.aclose()
+
+    def paths(self):
+        return (
+            "bot api",
+            lambda: self.bot_api.call("sendMessage", {"chat_id": -1001, "text": "alerta"}),
+            "bot",
+            lambda: self.mtproto.send(self.random_id, "alerta"),
+        )
+
+    async def test_slow_primary_is_hedged_and_mtproto_wins(self):
+        SlowBotApiHandler.delay = 0.5
+
+        outcome = await race_with_hedge(*self.paths(), hedge_delay=0.05)
+
+        self.assertEqual((outcome.winner, outcome.hedged), ("bot", True))
+        self.assertEqual(list(self.mtproto.delivered), [self.random_id])
+
+    async def test_fast_primary_is_not_hedged(self):
+        SlowBotApiHandler.delay = 0.0
+
+        outcome = await race_with_hedge(*self.paths(), hedge_delay=1.0)
+
+        self.assertEqual((outcome.winner, outcome.hedged), ("bot api", False))
+        self.assertEqual(self.mtproto.delivered, {})
+
+    async def test_without_latency_history_there_is_no_hedge(self):
+        SlowBotApiHandler.delay = 0.1
+
+        outcome = await race_with_hedge(*self.paths(), hedge_delay=None)
+
+        self.assertEqual(outcome.winner, "bot api")
+        self.assertEqual(self.mtproto.delivered, {})
+
+    async def test_repeated_mtproto_sends_share_one_random_id(self):
+        SlowBotApiHandler.delay = 0.5
+
+        for _ in range(2):
+            await race_with_hedge(*self.paths(), hedge_delay=0.05)
+
+        self.assertEqual(len(self.mtproto.delivered), 1)
+
+    async def test_failed_hedge_falls_back_to_primary_result(self):
+        async def failing_mtproto():
+            raise RuntimeError("CHAT_WRITE_FORBIDDEN")
+
+        async def slow_primary():
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        outcome = await race_with_hedge("bot api", slow_primary, "bot", failing_mtproto, hedge_delay=0.01)
+
+        self.assertEqual((outcome.winner, outcome.result), ("bot api", "ok"))
+
+    async def test_both_paths_failing_raises_primary_error(self):
+        async def failing(message):
+            await asyncio.sleep(0.02)
+            raise RuntimeError(message)
+
+        with self.assertRaisesRegex(RuntimeError, "primario"):
+            await race_with_hedge("bot api", lambda: failing("primario"), "bot", lambda: failing("hedge"), 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.incremental_parser import IncrementalAlertParser
+from analysis.scenario_classifier import extract_goal_outcome, parse_and_classify
+
+
+ORIGINAL_MESSAGE = """📣 Alerta Estratégia: mapa-de-calor 📣
+🏟 Jogo: La Luz (6º) x (13º) Paysandu FC
+🏆 Competição: Uruguay Segunda Division
+🕛 Tempo: 70 '
+⚽ Resultado: 1 x 2 (0 x 0 Intervalo)
+📈 Odds 1x2 Pre-live: 1.8 / 3.2 / 4
+
+https://cornerprobet.com/analysis/rpam7"""
+
+RED_EDIT = ORIGINAL_MESSAGE + "\n\n⚽: ❌\n\nhttps://cornerprobet.com"
+GREEN_EDIT = ORIGINAL_MESSAGE + "\n\n⚽ 77' (Paysandu FC)\n\nhttps://cornerprobet.com"
+
+
+class IncrementalAlertParserTest(unittest.TestCase):
+    def test_edit_reuses_cached_alert_and_reads_outcome_from_suffix(self):
+        parser = IncrementalAlertParser()
+
+        original = parser.parse(-100, 1, ORIGINAL_MESSAGE)
+        edited = parser.parse(-100, 1, RED_EDIT)
+
+        self.assertIsNone(original.goal_outcome)
+        self.assertFalse(original.from_cache)
+        self.assertTrue(edited.from_cache)
+        self.assertIs(edited.alert, original.alert)
+        self.assertIs(edited.scenario_result, original.scenario_result)
+        self.assertFalse(edited.goal_outcome)
+        self.assertTrue(edited.outcome_changed)
+        self.assertEqual((parser.hits, parser.misses), (1, 1))
+
+    def test_results_match_a_full_parse(self):
+        for edit in (RED_EDIT, GREEN_EDIT):
+            with self.subTest(edit=edit[-30:]):
+                parser = IncrementalAlertParser()
+                parser.parse(-100, 1, ORIGINAL_MESSAGE)
+                edited = parser.parse(-100, 1, edit)
+
+                alert, scenario_result = parse_and_classify(edit)
+                self.assertEqual(edited.alert, alert)
+                self.assertEqual(edited.scenario_result, scenario_result)
+                self.assertEqual(edited.goal_outcome, extract_goal_outcome(edit))
+
+    def test_repeated_edit_does_not_report_outcome_change_twice(self):
+        parser = IncrementalAlertParser()
+        parser.parse(-100, 1, ORIGINAL_MESSAGE)
+
+        self.assertTrue(parser.parse(-100, 1, RED_EDIT).outcome_changed)
+        self.assertFalse(parser.parse(-100, 1, RED_EDIT + "\n").outcome_changed)
+
+    def test_changed_body_is_parsed_from_scratch(self):
+        parser = IncrementalAlertParser()
+        parser.parse(-100, 1, ORIGINAL_MESSAGE)
+
+        edited = parser.parse(-100, 1, RED_EDIT.replace("70 '", "71 '"))
+
+        self.assertFalse(edited.from_cache)
+        self.assertEqual(edited.alert.game_time, "71")
+        self.assertFalse(edited.goal_outcome)
+
+    def test_lru_evicts_oldest_message(self):
+        parser = IncrementalAlertParser(max_entries=2)
+        for message_id in (1, 2, 3):
+            parser.parse(-100, message_id, ORIGINAL_MESSAGE)
+
+        self.assertEqual(len(parser), 2)
+        self.assertFalse(parser.parse(-100, 1, RED_EDIT).from_cache)
+        self.assertTrue(parser.parse(-100, 3, RED_EDIT).from_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.matchday_index import MatchdayIndex, dice_similarity, normalize_text, trigrams
+
+
+MATCHDAY = {
+    "data": {
+        "15:00": {
+            "Spain La Liga": {"games": [
+                {"id": 1, "home_name": "Atlético Madrid", "away_name": "Sevilla"},
+            ]},
+            "Brazil Serie A": {"games": [
+                {"id": 2, "home_name": "Grêmio", "away_name": "Santos"},
+            ]},
+        },
+        "17:00": {
+            "Spain Segunda": {"games": [
+                {"id": 3, "home_name": "Racing", "away_name": "Zaragoza"},
+            ]},
+            "Spain La Liga": {"games": [
+                {"id": 4, "home_name": "Getafe", "away_name": "Betis"},
+                {"home_name": "Sem id", "away_name": "Ignorado"},
+            ]},
+        },
+    }
+}
+
+
+class MatchdayIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+        self.index = MatchdayIndex(self.data_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, data, mtime):
+        path = self.data_dir / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_lookups_keep_file_order(self):
+        self.write("01-01-2025.json", MATCHDAY, 1000)
+        self.assertTrue(self.index.refresh())
+
+        self.assertEqual([game.game_id for game in self.index.games], [1, 2, 3, 4])
+        self.assertEqual([game.game_id for game in self.index.games_in_league("spain la liga")], [1, 4])
+        self.assertEqual(
+            [(game.game_id, direct) for game, direct in self.index.games_for_league("Spain La Liga", ["spain"])],
+            [(1, True), (3, False), (4, True)],
+        )
+        self.assertEqual([game.game_id for game in self.index.games_with_teams("GREMIO", "santos")], [2])
+        self.assertEqual(self.index.leagues_with_prefix("bra"), ["brazil serie a"])
+
+    def test_reloads_only_when_the_newest_file_changes(self):
+        self.write("01-01-2025.json", MATCHDAY, 1000)
+        self.index.refresh()
+        games = self.index.games
+
+        self.assertTrue(self.index.refresh())
+        self.assertIs(self.index.games, games)
+
+        newer = {"data": {"20:00": {"Italy Serie A": {"games": [{"id": 9, "home_name": "Roma", "away_name": "Lazio"}]}}}}
+        self.write("02-01-2025.json", newer, 2000)
+        self.index.refresh()
+        self.assertEqual([game.game_id for game in self.index.games], [9])
+
+        path = self.write("02-01-2025.json", MATCHDAY, 3000)
+        os.utime(self.data_dir, (3000, 3000))
+        self.index.refresh()
+        self.assertEqual(self.index.path, path)
+        self.assertEqual(len(self.index), 4)
+
+    def test_unreadable_file_keeps_previous_index(self):
+        self.write("01-01-2025.json", MATCHDAY, 1000)
+        self.index.refresh()
+        (self.data_dir / "02-01-2025.json").write_text("{\"data\": {", encoding="utf-8")
+
+        with self.assertLogs("forwarders.matchday_index", level="WARNING"):
+            self.assertTrue(self.index.refresh())
+        self.assertEqual(len(self.index), 4)
+
+    def test_missing_directory(self):
+        self.assertFalse(MatchdayIndex(self.data_dir / "nada").refresh())
+
+    def test_fuzzy_search_ranks_by_trigram_similarity(self):
+        data = {"data": {"15:00": {"Mix": {"games": [
+            {"id": 1, "home_name": "Flamengo", "away_name": "Fluminense"},
+            {"id": 2, "home_name": "Flamengo U20", "away_name": "Fluminense U20"},
+            {"id": 3, "home_name": "Santos", "away_name": "Palmeiras"},
+            {"id": 4, "home_name": "Flamengo", "away_name": "Vasco"},
+        ]}}}}
+        self.index.load(data)
+
+        results = self.index.search_teams("Flamengo RJ", "Fluminense")
+        self.assertEqual([game.game_id for game, _score in results], [1, 2])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(self.index.search_teams("Santos", "Palmeiras")[0][1], 1.0)
+        self.assertEqual(self.index.search_teams("Barcelona", "Fluminense"), [])
+        self.assertEqual(self.index.search_teams("", "Vasco"), [])
+
+    def test_dice_similarity(self):
+        self.assertEqual(dice_similarity(trigrams("gremio"), trigrams("gremio")), 1.0)
+        self.assertEqual(dice_similarity(trigrams("gremio"), frozenset()), 0.0)
+        self.assertAlmostEqual(dice_similarity(trigrams("abc"), trigrams("abd")), 0.5)
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("  Atlético  "), "atletico")
+        self.assertEqual(normalize_text(None), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.odds_threshold_sweep import (
+    alert_columns_from_export_rows,
+    build_thresholds,
+    load_alert_columns_from_xlsx,
+    sweep_thresholds,
+)
+from analysis.scenario_classifier import SCENARIO_NAMES, AlertData, classify_alert
+from exports.export_scenario_xlsx import ExportRow, build_workbook
+
+
+def build_row(score, odds, goal_scored):
+    alert = AlertData(
+        strategy="mapa-de-calor",
+        home_team="Casa",
+        home_position=1,
+        away_team="Fora",
+        away_position=2,
+        league="Liga",
+        game_time="70",
+        home_goals=score[0],
+        away_goals=score[1],
+        halftime_home_goals=0,
+        halftime_away_goals=0,
+        home_odd=odds[0],
+        draw_odd=3.2,
+        away_odd=odds[1],
+        match_url="https://cornerprobet.com/analysis/x",
+    )
+    return ExportRow(
+        message_datetime=datetime(2026, 5, 1, 12, 0),
+        alert=alert,
+        scenario_id=classify_alert(alert).scenario_id,
+        goal_scored=goal_scored,
+    )
+
+
+ROWS = [
+    build_row((0, 1), (1.5, 2.2), True),
+    build_row((0, 1), (1.9, 2.0), False),
+    build_row((1, 1), (1.8, 2.1), True),
+    build_row((2, 0), (2.6, 1.4), False),
+    build_row((0, 0), (2.0, 2.0), True),
+    build_row((3, 0), (1.2, 9.5), True),
+]
+
+
+class OddsThresholdSweepTest(unittest.TestCase):
+    def test_current_cutoff_reproduces_classify_alert_counts(self):
+        columns = alert_columns_from_export_rows(ROWS)
+        result = sweep_thresholds(columns, build_thresholds(0.0, 1.0, 0.1))
+
+        threshold_index = result.thresholds.tolist().index(0.2)
+        expected_greens = np.zeros(len(SCENARIO_NAMES), dtype=np.int64)
+        expected_reds = np.zeros(len(SCENARIO_NAMES), dtype=np.int64)
+        for row in ROWS:
+            if row.goal_scored:
+                expected_greens[row.scenario_id] += 1
+            else:
+                expected_reds[row.scenario_id] += 1
+
+        self.assertEqual(result.greens[threshold_index].tolist(), expected_greens.tolist())
+        self.assertEqual(result.reds[threshold_index].tolist(), expected_reds.tolist())
+        self.assertEqual(int(result.greens.sum() + result.reds.sum()), len(ROWS) * len(result.thresholds))
+
+    def test_relative_rule_uses_ratio_to_lowest_odd(self):
+        columns = alert_columns_from_export_rows(ROWS[:1])
+
+        result = sweep_thresholds(columns, [0.4, 0.5], rule="relative")
+
+        home_favorite_losing = SCENARIO_NAMES.index("casa favorito perdendo com um gol de diferença")
+        home_even_losing = SCENARIO_NAMES.index("casa parelho perdendo com um gol de diferença")
+        self.assertEqual(result.greens[0, home_favorite_losing], 1)
+        self.assertEqual(result.greens[1, home_even_losing], 1)
+
+    def test_loads_alerts_from_scenario_export(self):
+        rows_by_scenario = {scenario_id: [] for scenario_id in range(len(SCENARIO_NAMES))}
+        for row in ROWS:
+            rows_by_scenario[row.scenario_id].append(row)
+
+        with TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "export.xlsx"
+            build_workbook(rows_by_scenario).save(path)
+            from_xlsx = load_alert_columns_from_xlsx(str(path))
+
+        from_rows = alert_columns_from_export_rows(rows_by_scenario)
+        self.assertEqual(len(from_xlsx), len(ROWS))
+        thresholds = build_thresholds(0.0, 1.0, 0.05)
+        self.assertEqual(
+            sweep_thresholds(from_xlsx, thresholds).greens.tolist(),
+            sweep_thresholds(from_rows, thresholds).greens.tolist(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
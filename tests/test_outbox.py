@@ -0,0 +1,103 @@
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.outbox import Outbox
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class OutboxTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "outbox.sqlite3"
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open_outbox(self, **kwargs):
+        return Outbox(self.path, clock=self.clock, **kwargs)
+
+    async def test_unsent_entries_survive_a_restart(self):
+        outbox = self.open_outbox()
+        sent_id = outbox.add(-100, 1, -1001, "enviado", message_thread_id=7, top_msg_id=7, scenario="x")
+        pending_id = outbox.add(-100, 2, -1001, "pendente", message_thread_id=8, top_msg_id=9, scenario="y")
+        outbox.mark_sent(sent_id)
+        await outbox.close()
+
+        reopened = self.open_outbox()
+        entries = reopened.pending(max_age=600)
+        await reopened.close()
+
+        self.assertEqual([entry.id for entry in entries], [pending_id])
+        self.assertEqual(
+            (entries[0].source_message_id, entries[0].top_msg_id, entries[0].scenario, entries[0].text),
+            (2, 9, "y", "pendente"),
+        )
+
+    async def test_stale_entries_are_not_replayed_and_old_ones_pruned(self):
+        outbox = self.open_outbox()
+        outbox.add(-100, 1, -1001, "velho")
+        self.clock.now += 700
+        outbox.add(-100, 2, -1001, "novo")
+
+        self.assertEqual([entry.text for entry in outbox.pending(max_age=600)], ["novo"])
+
+        self.clock.now += 86400
+        self.assertEqual(outbox.prune(retention=86400), 1)
+        await outbox.close()
+
+    async def test_background_committer_batches_writes(self):
+        outbox = self.open_outbox(commit_interval=0.02, max_batch=1000)
+        outbox.start()
+        outbox.add(-100, 1, -1001, "a")
+        outbox.add(-100, 2, -1001, "b")
+        self.assertEqual(outbox.uncommitted, 2)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(outbox.uncommitted, 0)
+
+        reader = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 2)
+            self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        finally:
+            reader.close()
+        await outbox.close()
+
+    async def test_background_task_prunes_old_rows(self):
+        outbox = self.open_outbox(commit_interval=0.01, retention=600, prune_interval=60)
+        outbox.start()
+        outbox.add(-100, 1, -1001, "velho")
+        await asyncio.sleep(0.03)
+
+        self.clock.now += 700
+        outbox.add(-100, 2, -1001, "novo")
+        await asyncio.sleep(0.03)
+
+        reader = sqlite3.connect(self.path)
+        try:
+            texts = [row[0] for row in reader.execute("SELECT text FROM outbox")]
+        finally:
+            reader.close()
+        await outbox.close()
+        self.assertEqual(texts, ["novo"])
+
+    def test_disabled_in_config(self):
+        self.assertIsNone(Outbox.from_config({"enabled": False}, str(self.path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from collections import Counter
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyrogram.errors import ChannelInvalid, FloodWait, PeerIdInvalid
+
+from forwarders.peer_cache import PeerCache, is_peer_invalid_error
+
+
+class FakeClient:
+    def __init__(self, name, unknown_chats=()):
+        self.name = name
+        self.unknown_chats = set(unknown_chats)
+        self.resolve_calls = []
+
+    async def resolve_peer(self, chat_id):
+        self.resolve_calls.append(chat_id)
+        if chat_id in self.unknown_chats:
+            raise PeerIdInvalid()
+        return ("peer", self.name, chat_id)
+
+
+class PeerCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_resolves_each_peer_once_per_client(self):
+        user, bot = FakeClient("user"), FakeClient("bot")
+        cache = PeerCache()
+
+        for _ in range(3):
+            self.assertEqual(await cache.resolve(user, -1001), ("peer", "user", -1001))
+            self.assertEqual(await cache.resolve(bot, -1001), ("peer", "bot", -1001))
+
+        self.assertEqual(user.resolve_calls, [-1001])
+        self.assertEqual(bot.resolve_calls, [-1001])
+        self.assertEqual(cache.metrics["peers_em_cache"], 4)
+
+    async def test_warm_skips_chats_a_client_cannot_see(self):
+        user, bot = FakeClient("user"), FakeClient("bot", unknown_chats={-100})
+        metrics = Counter()
+        cache = PeerCache(metrics)
+
+        resolved = await cache.warm((user, bot), [-1001, -100, -1001])
+
+        self.assertEqual(resolved, 3)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(metrics["peers_resolvidos"], 4)
+
+    async def test_invalidate_forces_a_new_resolve(self):
+        client = FakeClient("bot")
+        cache = PeerCache()
+        await cache.resolve(client, -1001)
+
+        with self.assertLogs("forwarders.peer_cache", level="WARNING"):
+            cache.invalidate(client, -1001)
+        await cache.resolve(client, -1001)
+
+        self.assertEqual(client.resolve_calls, [-1001, -1001])
+
+    def test_detects_peer_invalid_errors(self):
+        self.assertTrue(is_peer_invalid_error(PeerIdInvalid()))
+        self.assertTrue(is_peer_invalid_error(ChannelInvalid()))
+        self.assertFalse(is_peer_invalid_error(FloodWait(value=3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis.scenario_classifier import SCENARIO_IDS
+from forwarders.routing import TopicRef, build_routing_plan, resolve_topic_reference
+
+
+def build_forwarder(source_chat_id, forum_chat_id, scenario_topics=None, strategies=None):
+    return {
+        "source_chat_id": source_chat_id,
+        "forum_chat_id": forum_chat_id,
+        "strategy_filters": {
+            "enabled": strategies is not None,
+            "mode": "whitelist",
+            "strategies": strategies or [],
+        },
+        "scenario_topics": scenario_topics or {},
+    }
+
+
+class RoutingPlanTest(unittest.TestCase):
+    def test_groups_targets_by_source_in_config_order(self):
+        plan = build_routing_plan([
+            build_forwarder(-100, -1001),
+            build_forwarder(-200, -2001),
+            build_forwarder(-100, -1002),
+        ])
+
+        self.assertEqual([target.forum_chat_id for target in plan[-100]], [-1001, -1002])
+        self.assertEqual([target.forum_chat_id for target in plan[-200]], [-2001])
+        self.assertIsInstance(plan[-100], tuple)
+
+    def test_topic_table_is_resolved_by_scenario_id(self):
+        scenario = "parelho empatando sem gols"
+        plan = build_routing_plan([
+            build_forwarder(-100, -1001, {
+                scenario.upper(): "11",
+                "casa favorito empatando sem gols": {"message_thread_id": 12, "top_msg_id": 13},
+            }),
+        ])
+
+        target = plan[-100][0]
+        self.assertEqual(target.topic_for(SCENARIO_IDS[scenario]), TopicRef(11, 11))
+        self.assertEqual(target.topic_for(SCENARIO_IDS["casa favorito empatando sem gols"]), TopicRef(12, 13))
+        self.assertIsNone(target.topic_for(SCENARIO_IDS["fora favorito empatando sem gols"]))
+
+    def test_strategy_filter_is_compiled_per_target(self):
+        plan = build_routing_plan([build_forwarder(-100, -1001, strategies=["mapa-de-calor"])])
+
+        strategy_filter = plan[-100][0].strategy_filter
+        self.assertTrue(strategy_filter.allows("mapa-de-calor"))
+        self.assertFalse(strategy_filter.allows("BTTS"))
+
+    def test_unconfigured_topic_values_resolve_to_none(self):
+        self.assertIsNone(resolve_topic_reference({"x": 0}, "x"))
+        self.assertIsNone(resolve_topic_reference({"x": {"message_thread_id": None}}, "x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,25 @@
 from pathlib import Path
+import random
 import sys
 import unittest
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from analysis.scenario_classifier import (
+    GENERAL_SCENARIOS,
+    AlertData,
     SCENARIO_NAMES,
+    SCENARIO_RESULTS,
+    StrategyMatcher,
+    alerts_to_arrays,
     classify_alert,
+    classify_batch,
+    compile_strategy_filter,
+    is_cornerpro_alert,
     parse_alert_message,
+    parse_alert_message_reference,
     parse_and_classify,
     should_forward_strategy,
 )
@@ -68,6 +80,15 @@ class ScenarioClassifierTest(unittest.TestCase):
         self.assertEqual(result.favorite_side, "fora")
         self.assertFalse(result.is_even_match)
 
+    def test_alert_data_is_slotted_and_shares_repeated_strings(self):
+        first = parse_alert_message(build_message(league="Austria " + "Regionalliga: West"))
+        second = parse_alert_message(build_message(league="Austria Regionalliga" + ": West"))
+
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.league, second.league)
+        self.assertIs(first.home_team, second.home_team)
+        self.assertEqual(AlertData.from_tuple(first.as_tuple()), first)
+
     def test_url_can_be_after_blank_lines(self):
         alert = parse_alert_message(build_message(blank_lines_before_url=4))
 
@@ -100,6 +121,43 @@ class ScenarioClassifierTest(unittest.TestCase):
             {"enabled": False, "mode": "whitelist", "strategies": []},
         ))
 
+    def test_identical_strategy_configs_share_one_compiled_filter(self):
+        strategy_config = {"enabled": True, "mode": "whitelist", "strategies": ["mapa", "lay"]}
+
+        self.assertIs(compile_strategy_filter(strategy_config), compile_strategy_filter(dict(strategy_config)))
+        self.assertIsNot(
+            compile_strategy_filter(strategy_config),
+            compile_strategy_filter({**strategy_config, "mode": "blacklist"}),
+        )
+        self.assertFalse(compile_strategy_filter({"enabled": True, "strategies": None}).allows("lay 0x1"))
+
+    def test_compiled_strategy_filter_matches_per_strategy_substring_tests(self):
+        strategies = ["Mapa", " lay 0x1 ", "OVER 1.5", "btts", "over"]
+        alert_strategies = ["mapa-de-calor", "Lay 0x1 HT", "over 1.5 ht", "Escanteios", "BTTS sim"]
+
+        for mode in ["whitelist", "blacklist"]:
+            strategy_config = {"enabled": True, "mode": mode, "strategies": strategies}
+            strategy_filter = compile_strategy_filter(strategy_config)
+            for alert_strategy in alert_strategies:
+                with self.subTest(mode=mode, alert_strategy=alert_strategy):
+                    found = any(
+                        configured.lower().strip() in alert_strategy.lower().strip()
+                        for configured in strategies
+                    )
+                    expected = not found if mode == "blacklist" else found
+                    self.assertEqual(strategy_filter.allows(alert_strategy), expected)
+                    self.assertEqual(should_forward_strategy(alert_strategy, strategy_filter), expected)
+
+    def test_strategy_matcher_returns_configured_name_and_keeps_empty_entry_semantics(self):
+        matcher = StrategyMatcher(["Lay", "Lay 0x1"])
+        self.assertEqual(matcher.find("alerta lay 0x1"), "Lay 0x1")
+        self.assertIsNone(matcher.find("mapa-de-calor"))
+
+        self.assertIsNone(StrategyMatcher(["", "lay"]).find("mapa-de-calor"))
+        self.assertEqual(StrategyMatcher(["  ", "lay"]).find("mapa-de-calor"), "  ")
+        self.assertEqual(StrategyMatcher([" lay"], strip=False).find("lay 0x1"), None)
+        self.assertEqual(StrategyMatcher([""], strip=False).find("mapa-de-calor"), "")
+
     def test_invalid_or_incomplete_messages_do_not_parse(self):
         self.assertIsNone(parse_alert_message(""))
         self.assertIsNone(parse_and_classify("📣 Alerta Estratégia: mapa-de-calor 📣"))
@@ -150,6 +208,111 @@ class ScenarioClassifierTest(unittest.TestCase):
                 alert = parse_alert_message(build_message(score=score, odds=odds))
                 result = classify_alert(alert)
                 self.assertEqual(result.scenario, expected_scenario)
+                self.assertEqual(SCENARIO_NAMES[result.scenario_id], expected_scenario)
+                self.assertEqual(GENERAL_SCENARIOS[result.general_scenario_id], result.general_scenario)
+
+    def test_classification_returns_interned_results(self):
+        self.assertEqual([result.scenario for result in SCENARIO_RESULTS], SCENARIO_NAMES)
+
+        first = classify_alert(parse_alert_message(build_message(score=(0, 1))))
+        second = classify_alert(parse_alert_message(build_message(score=(0, 1), home_team="Outro")))
+        self.assertIs(first, second)
+
+    def test_wide_margins_keep_real_goal_difference(self):
+        result = classify_alert(parse_alert_message(build_message(score=(0, 5))))
+
+        self.assertEqual(result.scenario, "fora favorito ganhando com mais de dois gols de diferença")
+        self.assertEqual(result.goal_difference, 5)
+        self.assertIs(result, classify_alert(parse_alert_message(build_message(score=(0, 5)))))
+
+    def test_single_pass_parser_matches_reference_parser(self):
+        messages = [
+            build_message(),
+            build_message(blank_lines_before_url=0),
+            build_message(odds=("1,80", "3,20", "2,10")),
+            build_message(home_team="São Paulo", away_team="Grêmio", league="Brazil Série A"),
+            build_message(strategy="Lay 0x1", score=(3, 1), halftime_score=(1, 1)),
+            "\n" + build_message() + "\n\n⚽: ❌\n\nhttps://cornerprobet.com\n",
+            build_message().replace("\n", "\r\n"),
+            build_message().replace("📣 Alerta", "  📣 alerta"),
+            "⚽: ❌\n" + build_message(),
+            build_message(url="sem link"),
+            build_message(game_time="70"),
+            build_message().replace("🕛 Tempo: 70 '", "🕛 Tempo: 70"),
+            "📣 Alerta Estratégia: mapa-de-calor 📣",
+            "Bom dia a todos!\nhttps://cornerprobet.com",
+            "",
+            # Fields split across line breaks, which the reference's \s still matches
+            build_message().replace("6.5 / 6.5 / 1.22", "6.5\n / 6.5 / 1.22"),
+            build_message().replace("📣 Alerta", "📣\r\n Alerta"),
+            build_message().replace("Competição: ", "Competição: \n\n"),
+            build_message().replace("(2º) Kuchl", "(2º) \r\nKuchl"),
+            build_message().replace("70 '", "70\n '"),
+            build_message().replace("(0 x 0 Intervalo)", "(0 x 0\nIntervalo)"),
+            build_message().replace("mapa-de-calor 📣", "mapa-de-calor\n📣"),
+            "⚽: ❌\n" + build_message().replace("Resultado: ", "Resultado:\n"),
+            build_message().replace("Competição: Austria Regionalliga: West", "Competição:").replace("Tempo", "Tempo:\n"),
+        ]
+
+        rng = random.Random(1)
+        pieces = ["\n", "\r\n", " \n ", "\n\n", "\r", "\t", " ", "'", "📣", "⚽: ❌\n"]
+        for _ in range(2000):
+            message = build_message()
+            for _ in range(rng.randint(1, 3)):
+                position = rng.randrange(len(message) + 1)
+                message = message[:position] + rng.choice(pieces) + message[position:]
+            messages.append(message)
+
+        for message in messages:
+            with self.subTest(message=message[:40]):
+                self.assertEqual(parse_alert_message(message), parse_alert_message_reference(message))
+
+    def test_prefilter_accepts_alerts_and_rejects_chatter(self):
+        self.assertTrue(is_cornerpro_alert(build_message()))
+        self.assertTrue(is_cornerpro_alert("\n  📣 alerta estratégia: lay 0x1 📣"))
+        self.assertFalse(is_cornerpro_alert(None))
+        self.assertFalse(is_cornerpro_alert(""))
+        self.assertFalse(is_cornerpro_alert("Bom dia! 📣 Alerta Estratégia: mapa-de-calor 📣"))
+        self.assertFalse(is_cornerpro_alert("⚽: ❌\n\nhttps://cornerprobet.com"))
+
+
+class ClassifyBatchTest(unittest.TestCase):
+    def test_batch_matches_classify_alert(self):
+        rng = random.Random(7)
+        alerts = []
+        for _ in range(5000):
+            home_odd = round(rng.uniform(1.05, 6.0), 2)
+            if rng.random() < 0.4:
+                away_odd = round(home_odd + rng.choice([-0.21, -0.2, 0.0, 0.2, 0.21]), 2)
+            else:
+                away_odd = round(rng.uniform(1.05, 6.0), 2)
+            alerts.append(parse_alert_message(build_message(
+                score=(rng.randint(0, 6), rng.randint(0, 6)),
+                odds=(home_odd, 3.2, away_odd),
+            )))
+
+        batch = classify_batch(*alerts_to_arrays(alerts))
+
+        for index, alert in enumerate(alerts):
+            result = classify_alert(alert)
+            self.assertEqual(batch.scenario_ids[index], result.scenario_id)
+            self.assertEqual(batch.general_scenario_ids[index], result.general_scenario_id)
+            self.assertEqual(batch.goal_differences[index], result.goal_difference)
+
+    def test_batch_covers_all_24_scenarios(self):
+        home_goals, away_goals = np.meshgrid(np.arange(5), np.arange(5))
+        home_goals, away_goals = home_goals.ravel(), away_goals.ravel()
+        scenario_ids = set()
+        for home_odd, away_odd in [(1.5, 2.2), (2.2, 1.5), (1.9, 2.0)]:
+            batch = classify_batch(
+                np.full(home_goals.shape, home_odd),
+                np.full(home_goals.shape, away_odd),
+                home_goals,
+                away_goals,
+            )
+            scenario_ids.update(batch.scenario_ids.tolist())
+
+        self.assertEqual(scenario_ids, set(range(len(SCENARIO_NAMES))))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyrogram.errors import RandomIdDuplicate
+
+from forwarders.circuit_breaker import OPEN
+from forwarders.delivery import DeliveryJob, coalesce_jobs
+from forwarders.routing import TopicRef
+from forwarders.scenario_forwarder import ScenarioMessageForwarder
+
+
+class FakeBotApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    fail = False
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(type(self).delay)
+        if type(self).fail:
+            status, payload = 400, {"ok": False, "error_code": 400, "description": "Bad Request: TOPIC_CLOSED"}
+        else:
+            status, payload = 200, {"ok": True, "result": {"message_id": 1}}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePyrogramClient:
+    """Stands in for a connected Pyrogram client; Telegram rejects reused random_ids."""
+
+    def __init__(self, name="fake", delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.delivered = {}
+
+    async def resolve_peer(self, chat_id):
+        return chat_id
+
+    async def invoke(self, request):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if request.random_id in self.delivered:
+            raise RandomIdDuplicate()
+        self.delivered[request.random_id] = request.message
+
+
+def build_forwarder(config_dir, **config):
+    config_path = Path(config_dir) / "client_config.json"
+    config_path.write_text(json.dumps({
+        "api_id": 1,
+        "api_hash": "hash",
+        "phone_number": "+5500000000000",
+        "outbox": {"enabled": False},
+        "scenario_forwarders": [{"source_chat_id": -100, "forum_chat_id": -1001}],
+        **config,
+    }), encoding="utf-8")
+    forwarder = ScenarioMessageForwarder(str(config_path))
+    forwarder.send_app = FakePyrogramClient()
+    return forwarder
+
+
+def build_job(source_message_id, text):
+    return DeliveryJob(
+        source_chat_id=-100,
+        forum_chat_id=-1001,
+        topic_ref=TopicRef(7, 7),
+        text=text,
+        scenario="parelho empatando sem gols",
+        source_message_id=source_message_id,
+    )
+
+
+class DeliverJobTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with self.assertLogs(level="INFO"):
+            self.forwarder = build_forwarder(self.temp_dir.name)
+
+    async def asyncTearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_replayed_alert_merged_with_a_new_one_is_not_dropped(self):
+        first, second = build_job(1, "alerta 1"), build_job(2, "alerta 2")
+
+        with self.assertLogs(level="INFO"):
+            await self.forwarder.deliver_job(first)
+            # After a restart the replay merges the already-sent alert with a new one.
+            await self.forwarder.deliver_job(coalesce_jobs([first, second]))
+
+        self.assertEqual(
+            list(self.forwarder.send_app.delivered.values()),
+            ["alerta 1", coalesce_jobs([first, second]).text],
+        )
+
+    async def test_repeated_delivery_of_the_same_batch_is_deduplicated(self):
+        batch = coalesce_jobs([build_job(1, "alerta 1"), build_job(2, "alerta 2")])
+
+        with self.assertLogs(level="INFO") as logs:
+            await self.forwarder.deliver_job(batch)
+            await self.forwarder.deliver_job(batch)
+
+        self.assertEqual(len(self.forwarder.send_app.delivered), 1)
+        self.assertTrue(any("random_id repetido" in line for line in logs.output))
+
+
+class HedgedSendTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBotApiHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    async def asyncSetUp(self):
+        FakeBotApiHandler.delay = 0.0
+        FakeBotApiHandler.fail = False
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with self.assertLogs(level="INFO"):
+            # Híbrido: caminhos "bot api", "bot" (MTProto do bot) e "usuário"
+            self.forwarder = build_forwarder(
+                self.temp_dir.name,
+                bot_token="1:token",
+                bot_api={"base_url": f"http://127.0.0.1:{self.server.server_address[1]}"},
+                hedging={"enabled": True, "min_delay": 0.05},
+            )
+        self.bot = self.forwarder.send_app = FakePyrogramClient("bot")
+        self.user = self.forwarder.user_app = FakePyrogramClient("usuario")
+        self.topic = TopicRef(7, 7)
+
+    async def asyncTearDown(self):
+        await self.forwarder.bot_api.aclose()
+        self.temp_dir.cleanup()
+
+    def record_bot_api_history(self, latency=0.01, samples=20):
+        for _ in range(samples):
+            self.forwarder.send_latencies.record("bot api", latency)
+
+    def open_breaker(self, path):
+        with self.assertLogs(level="WARNING"):
+            while self.forwarder.send_paths.breaker(-1001, path).state != OPEN:
+                self.forwarder.send_paths.record_failure(-1001, path)
+
+    def hedge_metrics(self):
+        return {key: value for key, value in self.forwarder.metrics.items() if key.startswith("hedge_vencedor_")}
+
+    def test_hedge_path_follows_config_and_breakers(self):
+        paths = self.forwarder.send_paths.order(-1001)
+        self.assertEqual(paths, ["bot api", "bot", "usuário"])
+        self.assertEqual(self.forwarder.get_hedge_path(-1001, paths), "bot")
+
+        self.open_breaker("bot")
+        self.assertEqual(self.forwarder.get_hedge_path(-1001, ["bot api", "bot", "usuário"]), "usuário")
+        self.open_breaker("usuário")
+        self.assertIsNone(self.forwarder.get_hedge_path(-1001, ["bot api", "bot", "usuário"]))
+
+        self.assertIsNone(self.forwarder.get_hedge_path(-1001, ["bot", "usuário"]))
+        self.forwarder.hedging_config = {"enabled": False}
+        self.assertIsNone(self.forwarder.get_hedge_path(-1001, paths))
+
+    def test_hedge_delay_needs_history_and_has_a_floor(self):
+        self.assertIsNone(self.forwarder.get_hedge_delay("bot api"))
+
+        self.record_bot_api_history(latency=0.01)
+        self.assertEqual(self.forwarder.get_hedge_delay("bot api"), 0.05)
+
+        self.record_bot_api_history(latency=0.2, samples=200)
+        self.assertEqual(self.forwarder.get_hedge_delay("bot api"), 0.2)
+
+    async def test_slow_bot_api_is_hedged_and_mtproto_wins(self):
+        FakeBotApiHandler.delay = 0.5
+        self.record_bot_api_history()
+
+        winner = await self.forwarder.send_text_to_topic(-1001, self.topic, "alerta", random_id=123)
+
+        self.assertEqual(winner, "bot")
+        self.assertEqual(self.hedge_metrics(), {"hedge_vencedor_bot": 1})
+        self.assertEqual(self.bot.delivered, {123: "alerta"})
+        self.assertEqual(self.user.delivered, {})
+
+    async def test_fast_bot_api_is_not_hedged(self):
+        self.record_bot_api_history(latency=1.0)
+
+        winner = await self.forwarder.send_text_to_topic(-1001, self.topic, "alerta", random_id=123)
+
+        self.assertEqual(winner, "bot api")
+        self.assertEqual(self.hedge_metrics(), {})
+        self.assertEqual(self.bot.delivered, {})
+
+    async def test_without_history_bot_api_is_awaited_without_hedge(self):
+        FakeBotApiHandler.delay = 0.2
+
+        winner = await self.forwarder.send_text_to_topic(-1001, self.topic, "alerta", random_id=123)
+
+        self.assertEqual(winner, "bot api")
+        self.assertEqual(self.bot.delivered, {})
+
+    async def test_when_both_hedged_paths_fail_the_next_path_is_tried(self):
+        FakeBotApiHandler.delay = 0.2
+        FakeBotApiHandler.fail = True
+        self.bot.error = RuntimeError("CHAT_WRITE_FORBIDDEN")
+        self.record_bot_api_history()
+
+        with self.assertLogs(level="WARNING") as logs:
+            winner = await self.forwarder.send_text_to_topic(-1001, self.topic, "alerta", random_id=123)
+
+        self.assertEqual(winner, "usuário")
+        self.assertEqual(self.user.delivered, {123: "alerta"})
+        self.assertEqual(self.hedge_metrics(), {})
+        self.assertEqual(sum("falhou" in line for line in logs.output), 2)
+
+    async def test_error_is_raised_when_every_path_fails(self):
+        FakeBotApiHandler.fail = True
+        self.bot.error = RuntimeError("CHAT_WRITE_FORBIDDEN")
+        self.user.error = RuntimeError("USER_BANNED_IN_CHANNEL")
+
+        with self.assertLogs(level="WARNING"):
+            with self.assertRaisesRegex(RuntimeError, "USER_BANNED_IN_CHANNEL"):
+                await self.forwarder.send_text_to_topic(-1001, self.topic, "alerta", random_id=123)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+import sys
+import unittest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forwarders.startup import StartupTimer, peers_in_storage
+
+
+class FakeStorage:
+    def __init__(self, known):
+        self.known = set(known)
+        self.lookups = []
+
+    async def get_peer_by_id(self, chat_id):
+        self.lookups.append(chat_id)
+        if chat_id not in self.known:
+            raise KeyError(f"ID not found: {chat_id}")
+        return object()
+
+
+class FakeClient:
+    def __init__(self, known):
+        self.storage = FakeStorage(known)
+
+
+class PeersInStorageTest(unittest.IsolatedAsyncioTestCase):
+    async def test_all_known_peers_skip_the_crawl(self):
+        client = FakeClient({-1001, -1002})
+        self.assertTrue(await peers_in_storage(client, [-1001, -1002]))
+
+    async def test_missing_peer_stops_at_first_miss(self):
+        client = FakeClient({-1001})
+        self.assertFalse(await peers_in_storage(client, [-1003, -1001]))
+        self.assertEqual(client.storage.lookups, [-1003])
+
+    async def test_client_without_storage(self):
+        self.assertFalse(await peers_in_storage(object(), [-1001]))
+
+
+class StartupTimerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_records_phases_even_on_error(self):
+        timer = StartupTimer()
+        async with timer.phase("contas"):
+            await asyncio.sleep(0.01)
+        with self.assertRaises(RuntimeError):
+            async with timer.phase("verificação"):
+                raise RuntimeError("falhou")
+        timer.mark("conexão")
+
+        self.assertEqual(set(timer.phases), {"contas", "verificação", "conexão"})
+        self.assertGreaterEqual(timer.phases["contas"], 0.01)
+        self.assertGreaterEqual(timer.elapsed(), timer.phases["contas"])
+
+
+if __name__ == "__main__":
+    unittest.main()